@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Checksum throughput benchmark.
+
+Measures SHA-256 throughput (MB/s) of utils.checksum at different read
+buffer sizes, and serial versus concurrent hashing of several files.
+Uses a temporary file of random data unless files are given.
+
+Usage:
+    python scripts/bench_checksum.py
+    python scripts/bench_checksum.py --size-mb 2048 --buffers 64K,1M,8M
+    python scripts/bench_checksum.py backups/daily/*.dump --keep-cache
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from backup_postgres.utils.checksum import calculate_sha256, calculate_sha256_many
+
+UNITS = {"K": 1024, "M": 1024 * 1024}
+
+
+def parse_size(value: str) -> int:
+    """Parse a buffer size such as 65536, 64K or 4M."""
+    value = value.strip().upper()
+    if value[-1:] in UNITS:
+        return int(value[:-1]) * UNITS[value[-1]]
+    return int(value)
+
+
+def make_file(directory: Path, name: str, size_mb: int) -> Path:
+    """Write size_mb of random data to a new file."""
+    path = directory / name
+    block = os.urandom(1024 * 1024)
+    with open(path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(block)
+    return path
+
+
+def throughput(total_bytes: int, seconds: float) -> str:
+    """Format MB/s."""
+    return f"{total_bytes / (1024 * 1024) / max(seconds, 1e-9):10.1f} MB/s"
+
+
+def run(files: list[Path], buffers: list[int], repeat: int, drop_cache: bool) -> None:
+    """Run the benchmark and print one line per measurement."""
+    total = sum(f.stat().st_size for f in files)
+    print(f"{len(files)} file(s), {total / (1024 * 1024):.0f} MB, best of {repeat}")
+
+    for buffer_size in buffers:
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for path in files:
+                calculate_sha256(path, buffer_size=buffer_size, drop_cache=drop_cache)
+            best = min(best, time.perf_counter() - started)
+        print(f"  buffer {buffer_size // 1024:>6} KB  serial    {throughput(total, best)}")
+
+    if len(files) > 1:
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            calculate_sha256_many(files, buffer_size=max(buffers), drop_cache=drop_cache)
+            best = min(best, time.perf_counter() - started)
+        print(f"  buffer {max(buffers) // 1024:>6} KB  parallel  {throughput(total, best)}")
+
+
+def main() -> int:
+    """
+    Main entry point for the checksum benchmark.
+
+    Returns:
+        Exit code (0 for success)
+    """
+    parser = argparse.ArgumentParser(
+        description="SHA-256 checksum throughput benchmark",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("files", nargs="*", type=Path, help="Files to hash (default: temporary data)")
+    parser.add_argument("--size-mb", type=int, default=256, help="Size of each temporary file (default: 256)")
+    parser.add_argument("--count", type=int, default=4, help="Number of temporary files (default: 4)")
+    parser.add_argument(
+        "--buffers",
+        default="64K,256K,1M,4M,16M",
+        help="Comma-separated buffer sizes (default: 64K,256K,1M,4M,16M)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (default: 3)")
+    parser.add_argument(
+        "--keep-cache",
+        action="store_true",
+        help="Do not drop file pages from the page cache after hashing",
+    )
+    args = parser.parse_args()
+
+    buffers = [parse_size(b) for b in args.buffers.split(",") if b.strip()]
+    drop_cache = not args.keep_cache
+
+    if args.files:
+        run(args.files, buffers, args.repeat, drop_cache)
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="bench_checksum_") as tmp:
+        files = [make_file(Path(tmp), f"data_{i}.bin", args.size_mb) for i in range(args.count)]
+        run(files, buffers, args.repeat, drop_cache)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,10 +17,23 @@ sys.path.insert(0, "/app/src")
 from backup_postgres.config.settings import load_settings
 from backup_postgres.utils.logging import setup_logging, get_logger
 from backup_postgres.core.backup import BackupManager
+from backup_postgres.core.physical import PhysicalBackupManager
 from backup_postgres.core.restore import RestoreManager
-from backup_postgres.core.metadata import load_metadata
+from backup_postgres.core.tuning import PROFILES
+from backup_postgres.core.metadata import calculate_file_size, load_metadata, metadata_key_for
 from backup_postgres.cloud.gcs_storage import CloudStorageManager
 from backup_postgres.cloud.registry import UploadRegistry
+from backup_postgres.core.sharding import SCHEMA_FILE, build_shard_toc_index, is_sharded_backup
+from backup_postgres.utils.exceptions import ArchiveFormatError, ChunkStoreError
+from backup_postgres.utils.toc import (
+    build_toc_index,
+    format_toc_listing,
+    index_entries,
+    load_toc_index,
+    read_archive_header,
+    save_toc_index,
+    toc_index_path,
+)
 
 logger = get_logger(__name__)
 
@@ -31,6 +44,28 @@ def cmd_backup(args) -> int:
         settings = load_settings()
         setup_logging(settings, use_json=False)
 
+        if args.type == "physical":
+            physical_manager = PhysicalBackupManager(
+                postgres_config=settings.postgres,
+                backup_config=settings.backup,
+            )
+            result = physical_manager.create_backup()
+            if result.success:
+                print(f"Backup created: {result.backup_path}")
+                print(f"Metadata: {result.metadata_path}")
+                print(f"Size: {result.backup_info.size_bytes} bytes")
+                print(f"Checksum: {result.checksum}")
+                return 0
+            print(f"Backup failed: {result.error}", file=sys.stderr)
+            return 1
+
+        # Stream the dump to GCS while it is written, if enabled
+        cloud_manager = None
+        registry = None
+        if settings.gcs.enabled and settings.gcs.gcs_stream_upload:
+            cloud_manager = CloudStorageManager(settings.gcs)
+            registry = UploadRegistry()
+
         backup_manager = BackupManager(
             postgres_config=settings.postgres,
             backup_dir=settings.backup.backup_dir,
@@ -38,6 +73,17 @@ def cmd_backup(args) -> int:
             retention_weekly=settings.backup.retention_weekly,
             compression_level=settings.backup.compression_level,
             backup_base_name=settings.backup.backup_base_name,
+            backup_format=settings.backup.backup_format,
+            dump_jobs=settings.backup.dump_jobs,
+            shard_min_bytes=settings.backup.shard_min_bytes,
+            table_count_mode=settings.backup.table_count_mode,
+            compression_method=settings.backup.compression_method,
+            compression_threads=settings.backup.compression_threads,
+            nice=settings.backup.process_nice,
+            ionice_class=settings.backup.ionice_class,
+            rate_limits=settings.backup.rate_limits,
+            cloud_manager=cloud_manager,
+            registry=registry,
         )
 
         result = backup_manager.create_backup(args.type)
@@ -47,6 +93,8 @@ def cmd_backup(args) -> int:
             print(f"Metadata: {result.metadata_path}")
             print(f"Size: {result.backup_info.size_bytes} bytes")
             print(f"Checksum: {result.checksum}")
+            if result.uploaded_key:
+                print(f"Uploaded: {result.uploaded_key}")
             return 0
         else:
             print(f"Backup failed: {result.error}", file=sys.stderr)
@@ -64,23 +112,82 @@ def cmd_restore(args) -> int:
         settings = load_settings()
         setup_logging(settings, use_json=False)
 
-        restore_manager = RestoreManager(settings.postgres)
+        restore_manager = RestoreManager(
+            settings.postgres,
+            validation_workers=args.validation_workers,
+            check_timeout=args.check_timeout,
+            parallel_query_workers=args.parallel_query,
+            profile=args.profile,
+        )
 
         backup_path = Path(args.backup_file)
         metadata_path = None
 
         # Try to find metadata file
-        if backup_path.with_suffix(".json").exists():
+        if not args.cloud and backup_path.with_suffix(".json").exists():
             metadata_path = backup_path.with_suffix(".json")
 
-        result = restore_manager.restore_backup(
-            backup_path=backup_path,
-            metadata_path=metadata_path,
-            drop_schema=not args.no_drop_schema,
-        )
+        selective = args.table or args.schema or args.section
+        if selective and args.cloud:
+            print("--table/--schema/--section need a local backup", file=sys.stderr)
+            return 1
+
+        if selective:
+            # Restore only the selected objects; nothing else is dropped
+            result = restore_manager.restore_selected(
+                backup_path=backup_path,
+                tables=args.table,
+                schemas=args.schema,
+                sections=args.section,
+                metadata_path=metadata_path,
+                clean=args.clean,
+                jobs=args.jobs,
+            )
+        elif args.cloud:
+            # Stream the backup from GCS instead of downloading it first
+            if not settings.gcs.enabled:
+                print("Cloud storage not configured", file=sys.stderr)
+                return 1
+            result = restore_manager.restore_from_cloud(
+                CloudStorageManager(settings.gcs),
+                args.backup_file,
+                drop_schema=not args.no_drop_schema,
+                spool_dir=Path(args.spool_dir) if args.spool_dir else None,
+                jobs=args.jobs,
+                keep_spool=args.keep_spool,
+            )
+        elif RestoreManager.is_physical_backup(backup_path):
+            if not args.data_dir:
+                print("Physical backups need --data-dir for the restored cluster", file=sys.stderr)
+                return 1
+            result = restore_manager.restore_physical_backup(
+                backup_path=backup_path,
+                data_dir=Path(args.data_dir),
+                metadata_path=metadata_path,
+                port=args.port,
+                pg_bin_dir=Path(args.pg_bin_dir) if args.pg_bin_dir else None,
+                keep_running=args.keep_running,
+            )
+        else:
+            result = restore_manager.restore_backup(
+                backup_path=backup_path,
+                metadata_path=metadata_path,
+                drop_schema=not args.no_drop_schema,
+                jobs=args.jobs,
+                verify_checksum=args.verify_checksum,
+            )
 
         if result.success:
-            print(f"Restore completed in {result.duration_seconds:.2f}s")
+            print(
+                f"Restore completed in {result.duration_seconds:.2f}s "
+                f"({result.wait_seconds:.2f}s waiting for the database)"
+            )
+            if result.phase_seconds:
+                print(f"Parallel jobs: {result.jobs}")
+                if result.profile:
+                    print(f"Restore profile: {result.profile}")
+                for phase, seconds in result.phase_seconds.items():
+                    print(f"  {phase}: {seconds:.2f}s")
 
             if result.validation_passed:
                 print("Validation: PASSED")
@@ -101,6 +208,30 @@ def cmd_restore(args) -> int:
         return 1
 
 
+def _archive_summary(backup_path: Path) -> str:
+    """
+    Describe a local backup's archive from its header (or TOC index).
+
+    Returns:
+        One-line summary, or "" for physical backups and unreadable archives
+    """
+    index = load_toc_index(backup_path)
+    if index and "archive" in index:
+        archive = index["archive"]
+        entries = f", {len(index['entries'])} TOC entries"
+    else:
+        archive_path = backup_path / SCHEMA_FILE if is_sharded_backup(backup_path) else backup_path
+        try:
+            archive = read_archive_header(archive_path).to_dict()
+        except (ArchiveFormatError, ChunkStoreError, OSError):
+            return ""
+        entries = ""
+    return (
+        f"{archive['format']} {archive['version']}, {archive['compression']}, "
+        f"dumped {archive.get('created') or '?'} from PostgreSQL {archive['server_version']}{entries}"
+    )
+
+
 def cmd_list(args) -> int:
     """List backups."""
     try:
@@ -145,8 +276,11 @@ def cmd_list(args) -> int:
                 backup_type_str = args.type or "daily"
                 print(f"Local {backup_type_str} backups ({len(backups)}):")
                 for backup in backups:
-                    size_mb = backup.stat().st_size / (1024 * 1024)
+                    size_mb = calculate_file_size(backup) / (1024 * 1024)
                     print(f"  {backup.name} - {size_mb:.2f} MB")
+                    summary = _archive_summary(backup)
+                    if summary:
+                        print(f"    {summary}")
 
         return 0
 
@@ -156,6 +290,45 @@ def cmd_list(args) -> int:
         return 1
 
 
+def cmd_toc(args) -> int:
+    """List the table of contents of a backup from its TOC index."""
+    try:
+        settings = load_settings()
+        setup_logging(settings, use_json=False)
+
+        backup_path = Path(args.backup_file)
+        if not backup_path.exists():
+            print(f"Backup file not found: {backup_path}", file=sys.stderr)
+            return 1
+
+        # Older backups have no index yet: build it once and keep it
+        index = load_toc_index(backup_path)
+        if index is None:
+            print(f"Building TOC index: {toc_index_path(backup_path)}", file=sys.stderr)
+            if is_sharded_backup(backup_path):
+                index = build_shard_toc_index(backup_path)
+            else:
+                index = build_toc_index(backup_path)
+            save_toc_index(toc_index_path(backup_path), index)
+
+        if args.json:
+            print(json.dumps(index_entries(index), indent=2))
+        elif "shards" in index:
+            for filename, shard_index in index["shards"].items():
+                print(f";; {filename}")
+                for line in format_toc_listing(shard_index):
+                    print(line)
+        else:
+            for line in format_toc_listing(index):
+                print(line)
+        return 0
+
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        logger.error(f"TOC listing failed: {e}", exc_info=True)
+        return 1
+
+
 def cmd_upload(args) -> int:
     """Upload backups to cloud storage."""
     try:
@@ -190,10 +363,12 @@ def cmd_upload(args) -> int:
                 backup_type = "daily"
             elif "weekly" in str(backup_path):
                 backup_type = "weekly"
+            elif "physical" in str(backup_path):
+                backup_type = "physical"
 
             # Upload
-            gcs_key = f"{settings.gcs.gcs_backup_prefix}/{backup_type}/{backup_path.name}"
-            result = cloud_manager.upload_file(backup_path, gcs_key)
+            gcs_key = cloud_manager.backup_key(backup_type, backup_path.name)
+            result = cloud_manager.upload_backup(backup_path, gcs_key)
 
             if result.success:
                 print(f"Uploaded: {backup_path.name}")
@@ -206,7 +381,7 @@ def cmd_upload(args) -> int:
             print("Syncing pending uploads...")
             sync_count = 0
 
-            for backup_type in ["daily", "weekly", "manual"]:
+            for backup_type in ["daily", "weekly", "manual", "physical"]:
                 backups = backup_manager.list_backups(backup_type)
 
                 for backup_path in backups:
@@ -225,11 +400,11 @@ def cmd_upload(args) -> int:
                         if registry.is_uploaded(backup_type, filename, checksum):
                             continue
 
-                        gcs_key = f"{settings.gcs.gcs_backup_prefix}/{backup_type}/{filename}"
-                        result = cloud_manager.upload_file(backup_path, gcs_key)
+                        gcs_key = cloud_manager.backup_key(backup_type, filename)
+                        result = cloud_manager.upload_backup(backup_path, gcs_key)
 
                         if result.success:
-                            metadata_key = f"{settings.gcs.gcs_backup_prefix}/{backup_type}/{metadata_path.name}"
+                            metadata_key = cloud_manager.backup_key(backup_type, metadata_path.name)
                             cloud_manager.upload_file(metadata_path, metadata_key)
                             registry.mark_uploaded(backup_type, filename, checksum, gcs_key)
                             sync_count += 1
@@ -270,22 +445,22 @@ def cmd_download(args) -> int:
                 output_path = output_path / gcs_key.split("/")[-1]
         else:
             # Default to /backups/{type}/ directory
-            # Parse GCS key format: backups/postgres/{type}/{filename}
+            # Parse GCS key format: {prefix}/{type}/{filename}
             key_parts = gcs_key.split("/")
             if len(key_parts) >= 3:
-                backup_type = key_parts[2]  # "daily", "weekly", or "manual"
+                backup_type = key_parts[-2]  # "daily", "weekly", "manual" or "physical"
                 output_path = Path(settings.backup.backup_dir) / backup_type / gcs_key.split("/")[-1]
             else:
                 # Fallback to root backup dir if parsing fails
                 output_path = Path(settings.backup.backup_dir) / gcs_key.split("/")[-1]
 
-        result = cloud_manager.download_file(gcs_key, output_path)
+        result = cloud_manager.download_backup(gcs_key, output_path)
 
         if result.success:
             print(f"Downloaded to: {output_path}")
 
             # Also download the .json metadata file
-            json_key = gcs_key.replace(".dump", ".json")
+            json_key = metadata_key_for(gcs_key)
             json_output_path = output_path.with_suffix(".json")
 
             json_result = cloud_manager.download_file(json_key, json_output_path)
@@ -348,12 +523,12 @@ def cmd_status(args) -> int:
         if not settings.gcs.enabled:
             print("Cloud storage not configured - upload status unavailable", file=sys.stderr)
             print("\nLocal backups:")
-            for backup_type in ["daily", "weekly", "manual"]:
+            for backup_type in ["daily", "weekly", "manual", "physical"]:
                 backups = backup_manager.list_backups(backup_type)
                 if backups:
                     print(f"\n{backup_type.upper()}:")
                     for backup in backups:
-                        size_mb = backup.stat().st_size / (1024 * 1024)
+                        size_mb = calculate_file_size(backup) / (1024 * 1024)
                         print(f"  - {backup.name} ({size_mb:.2f} MB)")
             return 0
 
@@ -370,7 +545,7 @@ def cmd_status(args) -> int:
         total_uploaded = 0
         total_pending = 0
 
-        for backup_type in ["daily", "weekly", "manual"]:
+        for backup_type in ["daily", "weekly", "manual", "physical"]:
             backups = backup_manager.list_backups(backup_type)
 
             if not backups:
@@ -382,7 +557,7 @@ def cmd_status(args) -> int:
             for backup_path in backups:
                 total_local += 1
                 metadata_path = backup_path.with_suffix(".json")
-                size_mb = backup_path.stat().st_size / (1024 * 1024)
+                size_mb = calculate_file_size(backup_path) / (1024 * 1024)
 
                 # Check if uploaded
                 try:
@@ -452,15 +627,18 @@ def cmd_cleanup_cloud(args) -> int:
         print("=" * 60)
         print(f"Daily retention: {settings.gcs.cloud_retention_daily}")
         print(f"Weekly retention: {settings.gcs.cloud_retention_weekly}")
+        print(f"Physical retention: {settings.gcs.cloud_retention_physical}")
         print("")
 
         total_deleted = 0
 
-        for backup_type in ["daily", "weekly"]:
+        for backup_type in ["daily", "weekly", "physical"]:
             if backup_type == "daily":
                 retention = settings.gcs.cloud_retention_daily
-            else:
+            elif backup_type == "weekly":
                 retention = settings.gcs.cloud_retention_weekly
+            else:
+                retention = settings.gcs.cloud_retention_physical
 
             deleted = cloud_manager.enforce_retention(backup_type, retention)
             total_deleted += len(deleted)
@@ -493,27 +671,116 @@ def main() -> int:
     backup_parser = subparsers.add_parser("backup", help="Create a backup")
     backup_parser.add_argument(
         "--type",
-        choices=["daily", "weekly", "manual"],
+        choices=["daily", "weekly", "manual", "physical"],
         default="manual",
-        help="Type of backup",
+        help="Type of backup (physical = pg_basebackup of the whole cluster)",
     )
     backup_parser.set_defaults(func=cmd_backup)
 
     # Restore command
     restore_parser = subparsers.add_parser("restore", help="Restore from backup")
-    restore_parser.add_argument("backup_file", help="Path to backup .dump file")
+    restore_parser.add_argument(
+        "backup_file",
+        help="Path to backup .dump file or .dir directory (GCS key with --cloud)",
+    )
     restore_parser.add_argument(
         "--no-drop-schema",
         action="store_true",
         help="Don't drop schema before restore",
     )
+    restore_parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="Parallel pg_restore jobs (default: CPUs available to the container)",
+    )
+    restore_parser.add_argument(
+        "--table",
+        action="append",
+        help="Restore only this table (schema.name or name) with its dependent objects; repeatable",
+    )
+    restore_parser.add_argument(
+        "--schema",
+        action="append",
+        help="Restore only the objects of this schema; repeatable",
+    )
+    restore_parser.add_argument(
+        "--section",
+        action="append",
+        choices=["pre-data", "data", "post-data"],
+        help="Restore only this section (e.g. data to reload a truncated table); repeatable",
+    )
+    restore_parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="With --table/--schema/--section: drop the selected objects first (not their referencing foreign keys)",
+    )
+    restore_parser.add_argument(
+        "--verify-checksum",
+        action="store_true",
+        help="Check a local .dump against its metadata's tree hash before restoring",
+    )
+    restore_parser.add_argument(
+        "--cloud",
+        action="store_true",
+        help="Stream the backup from GCS into pg_restore while it downloads",
+    )
+    restore_parser.add_argument(
+        "--spool-dir",
+        help="With --cloud: spool the download here and restore data with parallel jobs",
+    )
+    restore_parser.add_argument(
+        "--keep-spool",
+        action="store_true",
+        help="With --cloud --spool-dir: keep the spooled backup after the restore",
+    )
+    restore_parser.add_argument(
+        "--validation-workers",
+        type=int,
+        help="Connections running the row count and orphan checks concurrently (default: 4)",
+    )
+    restore_parser.add_argument(
+        "--check-timeout",
+        type=float,
+        help="Seconds each validation query may run before it is cancelled (default: 1800)",
+    )
+    restore_parser.add_argument(
+        "--parallel-query",
+        type=int,
+        default=0,
+        help="max_parallel_workers_per_gather of the validation connections (default: server setting)",
+    )
+    restore_parser.add_argument(
+        "--profile",
+        choices=sorted(PROFILES),
+        help="Tune the server for the load while pg_restore runs (reverted afterwards)",
+    )
+    restore_parser.add_argument(
+        "--data-dir",
+        help="Physical backups: new data directory to unpack into (must be empty)",
+    )
+    restore_parser.add_argument(
+        "--port",
+        type=int,
+        default=5433,
+        help="Physical backups: port for the restored server (default: 5433)",
+    )
+    restore_parser.add_argument(
+        "--pg-bin-dir",
+        help="Physical backups: directory with pg_ctl of the backup's major version",
+    )
+    restore_parser.add_argument(
+        "--keep-running",
+        action="store_true",
+        help="Physical backups: leave the restored server running after validation",
+    )
     restore_parser.set_defaults(func=cmd_restore)
 
     # List command
     list_parser = subparsers.add_parser("list", help="List backups")
     list_parser.add_argument(
         "--type",
-        choices=["daily", "weekly", "manual"],
+        choices=["daily", "weekly", "manual", "physical"],
         help="Filter by backup type",
     )
     list_parser.add_argument("--cloud", action="store_true", help="List cloud backups")
@@ -521,6 +788,12 @@ def main() -> int:
     list_parser.add_argument("--limit", type=int, default=20, help="Limit results")
     list_parser.set_defaults(func=cmd_list)
 
+    # TOC command
+    toc_parser = subparsers.add_parser("toc", help="List a backup's table of contents (from its TOC index)")
+    toc_parser.add_argument("backup_file", help="Path to backup .dump file, .dir directory or .manifest")
+    toc_parser.add_argument("--json", action="store_true", help="JSON output with data offsets and sizes")
+    toc_parser.set_defaults(func=cmd_toc)
+
     # Upload command
     upload_parser = subparsers.add_parser("upload", help="Upload backups to cloud")
     upload_parser.add_argument("--file", help="Specific file to upload (default: sync all)")
@@ -16,6 +16,7 @@ from backup_postgres.utils.logging import setup_logging, get_logger
 sys.path.insert(0, "/app/src")
 
 from backup_postgres.core.backup import BackupManager
+from backup_postgres.core.physical import PhysicalBackupManager
 from backup_postgres.cloud.gcs_storage import CloudStorageManager
 from backup_postgres.cloud.registry import UploadRegistry
 from backup_postgres.scheduler.jobs import JobScheduler
@@ -40,16 +41,6 @@ class BackupService:
         setup_logging(self.settings, use_json=True)
         logger.info(f"Log level: {self.settings.logging.log_level}")
 
-        # Initialize components
-        self.backup_manager = BackupManager(
-            postgres_config=self.settings.postgres,
-            backup_dir=self.settings.backup.backup_dir,
-            retention_daily=self.settings.backup.retention_daily,
-            retention_weekly=self.settings.backup.retention_weekly,
-            compression_level=self.settings.backup.compression_level,
-            backup_base_name=self.settings.backup.backup_base_name,
-        )
-
         # Initialize cloud components if configured
         self.cloud_manager = None
         self.registry = None
@@ -71,12 +62,47 @@ class BackupService:
         else:
             logger.info("Cloud storage not configured, local backups only")
 
+        # Stream dumps to GCS while they are written, if enabled
+        stream_to_cloud = self.settings.gcs.gcs_stream_upload and self.cloud_manager is not None
+        if stream_to_cloud:
+            logger.info("Streaming upload enabled: dumps are written to disk and GCS in one pass")
+
+        # Initialize components
+        self.backup_manager = BackupManager(
+            postgres_config=self.settings.postgres,
+            backup_dir=self.settings.backup.backup_dir,
+            retention_daily=self.settings.backup.retention_daily,
+            retention_weekly=self.settings.backup.retention_weekly,
+            compression_level=self.settings.backup.compression_level,
+            backup_base_name=self.settings.backup.backup_base_name,
+            backup_format=self.settings.backup.backup_format,
+            dump_jobs=self.settings.backup.dump_jobs,
+            shard_min_bytes=self.settings.backup.shard_min_bytes,
+            table_count_mode=self.settings.backup.table_count_mode,
+            compression_method=self.settings.backup.compression_method,
+            compression_threads=self.settings.backup.compression_threads,
+            nice=self.settings.backup.process_nice,
+            ionice_class=self.settings.backup.ionice_class,
+            rate_limits=self.settings.backup.rate_limits,
+            cloud_manager=self.cloud_manager if stream_to_cloud else None,
+            registry=self.registry if stream_to_cloud else None,
+        )
+
+        # Physical base backups run on their own weekly schedule, if enabled
+        self.physical_manager = None
+        if self.settings.scheduler.physical_backup_enabled:
+            self.physical_manager = PhysicalBackupManager(
+                postgres_config=self.settings.postgres,
+                backup_config=self.settings.backup,
+            )
+
         # Initialize scheduler
         self.scheduler = JobScheduler(
             settings=self.settings,
             backup_manager=self.backup_manager,
             cloud_manager=self.cloud_manager,
             registry=self.registry,
+            physical_manager=self.physical_manager,
         )
 
         # Setup signal handlers for graceful shutdown
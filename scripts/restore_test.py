@@ -18,12 +18,38 @@ sys.path.insert(0, "/app/src")
 
 from backup_postgres.config.settings import load_settings
 from backup_postgres.utils.logging import setup_logging, get_logger
+from backup_postgres.core.models import RestoreResult
 from backup_postgres.core.restore import RestoreManager
+from backup_postgres.core.tuning import PROFILES
 from backup_postgres.core.metadata import load_metadata
 
 logger = get_logger(__name__)
 
 
+def compare_timings(baseline: RestoreResult, tuned: RestoreResult) -> dict:
+    """
+    Compare a restore without a profile against one with it.
+
+    Args:
+        baseline: Result of the restore with the server settings as is
+        tuned: Result of the restore with the profile applied
+
+    Returns:
+        Total and pg_restore durations of both runs and the speedup
+    """
+    before = baseline.phase_seconds.get("pg_restore", 0.0)
+    after = tuned.phase_seconds.get("pg_restore", 0.0)
+    return {
+        "profile": tuned.profile,
+        "baseline_duration_seconds": round(baseline.duration_seconds, 3),
+        "profile_duration_seconds": round(tuned.duration_seconds, 3),
+        "baseline_pg_restore_seconds": before,
+        "profile_pg_restore_seconds": after,
+        "pg_restore_saved_seconds": round(before - after, 3),
+        "pg_restore_speedup": round(before / after, 2) if after > 0 else None,
+    }
+
+
 def main() -> int:
     """
     Main entry point for restore test.
@@ -39,7 +65,7 @@ def main() -> int:
     parser.add_argument(
         "--backup-file",
         required=True,
-        help="Path to backup .dump file",
+        help="Path to backup .dump file or .dir directory",
     )
 
     parser.add_argument(
@@ -55,6 +81,50 @@ def main() -> int:
         help="Don't drop schema before restore",
     )
 
+    parser.add_argument(
+        "--verify-checksum",
+        action="store_true",
+        help="Check a .dump against its metadata's tree hash before restoring",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="Parallel pg_restore jobs (default: CPUs available to the container)",
+    )
+
+    parser.add_argument(
+        "--validation-workers",
+        type=int,
+        help="Connections running the row count and orphan checks concurrently (default: 4)",
+    )
+
+    parser.add_argument(
+        "--check-timeout",
+        type=float,
+        help="Seconds each validation query may run before it is cancelled (default: 1800)",
+    )
+
+    parser.add_argument(
+        "--parallel-query",
+        type=int,
+        default=0,
+        help="max_parallel_workers_per_gather of the validation connections (default: server setting)",
+    )
+
+    parser.add_argument(
+        "--profile",
+        choices=sorted(PROFILES),
+        help="Tune the server for the load while pg_restore runs (reverted afterwards)",
+    )
+
+    parser.add_argument(
+        "--compare-profile",
+        action="store_true",
+        help="With --profile: restore once without it first and report the timing difference",
+    )
+
     args = parser.parse_args()
 
     # Setup logging
@@ -80,19 +150,40 @@ def main() -> int:
     logger.info(f"Host: {settings.postgres.pg_host}")
     logger.info("")
 
-    # Initialize restore manager
-    restore_manager = RestoreManager(settings.postgres)
+    if args.compare_profile and not args.profile:
+        logger.error("--compare-profile needs --profile")
+        return 1
 
     # Find metadata file
     metadata_path = backup_path.with_suffix(".json")
 
-    # Execute restore
-    logger.info("Starting restore...")
-    result = restore_manager.restore_backup(
-        backup_path=backup_path,
-        metadata_path=metadata_path if metadata_path.exists() else None,
-        drop_schema=not args.no_drop_schema,
-    )
+    def restore(profile: str | None) -> RestoreResult:
+        restore_manager = RestoreManager(
+            settings.postgres,
+            validation_workers=args.validation_workers,
+            check_timeout=args.check_timeout,
+            parallel_query_workers=args.parallel_query,
+            profile=profile,
+        )
+        return restore_manager.restore_backup(
+            backup_path=backup_path,
+            metadata_path=metadata_path if metadata_path.exists() else None,
+            drop_schema=not args.no_drop_schema,
+            jobs=args.jobs,
+            verify_checksum=args.verify_checksum,
+        )
+
+    # Execute restore (first without the profile when comparing)
+    baseline = None
+    if args.compare_profile:
+        logger.info("Starting baseline restore without a profile...")
+        baseline = restore(None)
+        if not baseline.success:
+            logger.warning(f"Baseline restore failed: {baseline.error}")
+            baseline = None
+
+    logger.info("Starting restore" + (f" with profile {args.profile}..." if args.profile else "..."))
+    result = restore(args.profile)
 
     # Generate report
     report = {
@@ -101,13 +192,33 @@ def main() -> int:
         "database": settings.postgres.pg_database,
         "restore_success": result.success,
         "restore_duration_seconds": result.duration_seconds,
+        # Time until the database accepted connections (part of the duration)
+        "ready_wait_seconds": round(result.wait_seconds, 3),
+        "restore_jobs": result.jobs,
+        # Duration of each step: verify, wait_for_database, drop_schema, pg_restore, validate
+        "phase_durations_seconds": result.phase_seconds,
+        # Wall time of each validation check
+        "check_durations_seconds": result.check_seconds,
+        "restore_profile": result.profile,
         "validation_passed": result.validation_passed,
         "validation_errors": result.validation_errors,
         "error": result.error,
     }
+    if baseline is not None and result.success:
+        comparison = compare_timings(baseline, result)
+        report["profile_comparison"] = comparison
+        logger.info(
+            f"pg_restore took {comparison['baseline_pg_restore_seconds']:.2f}s without and "
+            f"{comparison['profile_pg_restore_seconds']:.2f}s with profile {args.profile}"
+        )
 
     if result.success:
-        logger.info(f"Restore completed in {result.duration_seconds:.2f}s")
+        logger.info(
+            f"Restore completed in {result.duration_seconds:.2f}s "
+            f"({result.wait_seconds:.2f}s waiting for the database, {result.jobs} parallel jobs)"
+        )
+        for phase, seconds in result.phase_seconds.items():
+            logger.info(f"  {phase}: {seconds:.2f}s")
 
         if result.validation_passed:
             logger.info("Validation: PASSED")
@@ -5,8 +5,11 @@ Handles upload, download, and listing operations with GCS.
 """
 
 import logging
+import os
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
@@ -15,11 +18,29 @@ from google.cloud import storage
 from google.cloud.exceptions import GoogleCloudError
 
 from backup_postgres.config.settings import GCSConfig
+from backup_postgres.core.metadata import (
+    DIRECTORY_SUFFIX,
+    DUMP_SUFFIX,
+    metadata_key_for,
+    toc_index_key_for,
+)
+from backup_postgres.utils.checksum import HashingWriter, TreeHash, hash_range
+from backup_postgres.utils.chunking import (
+    CHUNK_DIR_NAME,
+    GC_GRACE_SECONDS,
+    MANIFEST_SUFFIX,
+    chunk_store_for,
+    manifest_chunk_hashes,
+    parse_manifest,
+    read_manifest,
+)
 from backup_postgres.utils.exceptions import (
+    ChunkStoreError,
     CloudDownloadError,
     CloudStorageError,
     CloudUploadError,
 )
+from backup_postgres.utils.toc import toc_index_path
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +79,86 @@ class UploadResult:
     error: str | None = None
 
 
+class StreamingUpload:
+    """
+    Write sink that uploads to a GCS blob through a resumable upload session.
+
+    Bytes are buffered up to one chunk and sent as they arrive, so the
+    cloud copy is complete as soon as the producer finishes. write()
+    blocks while a chunk is in flight, which backpressures the producer.
+
+    Upload errors never propagate to the producer: the first error is
+    recorded, further writes are dropped, and close() reports failure,
+    so a broken network only costs the cloud copy, never the local one.
+    """
+
+    def __init__(self, blob: storage.Blob, writer: Any) -> None:
+        """
+        Initialize streaming upload.
+
+        Args:
+            blob: Destination blob
+            writer: Writable file object returned by blob.open("wb")
+        """
+        self.blob = blob
+        self._writer = writer
+        self.bytes_written = 0
+        self.error: str | None = None
+
+    @property
+    def failed(self) -> bool:
+        """Whether the upload has failed."""
+        return self.error is not None
+
+    def write(self, data: bytes) -> int:
+        """Send data to the upload session (no-op once failed)."""
+        if self.failed:
+            return len(data)
+        try:
+            self._writer.write(data)
+            self.bytes_written += len(data)
+        except Exception as e:
+            self.error = f"Streaming upload failed: {e}"
+            logger.error(f"{self.error} (gs://{self.blob.bucket.name}/{self.blob.name})")
+        return len(data)
+
+    def close(self) -> UploadResult:
+        """
+        Finalize the upload so the object becomes visible.
+
+        Returns:
+            UploadResult with operation details
+        """
+        if not self.failed:
+            try:
+                self._writer.close()
+                logger.info(
+                    f"Streaming upload completed: gs://{self.blob.bucket.name}/{self.blob.name} "
+                    f"({self.bytes_written} bytes)"
+                )
+            except Exception as e:
+                self.error = f"Streaming upload failed: {e}"
+                logger.error(self.error)
+
+        return UploadResult(
+            success=not self.failed,
+            key=self.blob.name,
+            size_bytes=self.bytes_written if not self.failed else 0,
+            error=self.error,
+        )
+
+    def abort(self) -> None:
+        """
+        Abandon the upload without finalizing it.
+
+        The unfinished resumable session is never committed, so no
+        partial object appears in the bucket.
+        """
+        if not self.failed:
+            self.error = "Streaming upload aborted"
+        logger.warning(f"Streaming upload aborted: gs://{self.blob.bucket.name}/{self.blob.name}")
+
+
 @dataclass
 class DownloadResult:
     """Result of a download operation."""
@@ -84,6 +185,15 @@ class CloudStorageManager:
     DEFAULT_RETRY_MAX = 3
     DEFAULT_TIMEOUT = 300  # 5 minutes
 
+    # Resumable upload chunk size for streaming uploads (must be a multiple of 256KB)
+    STREAM_CHUNK_SIZE = 16 * 1024 * 1024
+
+    # Parallel transfers of chunk-store objects (chunked backups)
+    CHUNK_TRANSFER_WORKERS = 8
+
+    # Attempts per tree hash chunk before a verified download gives up
+    RANGE_ATTEMPTS = 3
+
     def __init__(self, config: GCSConfig) -> None:
         """
         Initialize GCS storage manager.
@@ -97,6 +207,7 @@ class CloudStorageManager:
         self.config = config
         self.bucket_name = config.gcs_bucket_name
         self.backup_prefix = config.gcs_backup_prefix
+        self.physical_prefix = config.gcs_physical_prefix
 
         try:
             # Initialize GCS client from service account JSON
@@ -114,6 +225,23 @@ class CloudStorageManager:
             logger.error(error_msg)
             raise CloudStorageError(error_msg) from e
 
+    def _root_prefix(self, backup_type: str | None) -> str:
+        """Get the root prefix for a backup type (physical backups have their own)."""
+        return self.physical_prefix if backup_type == "physical" else self.backup_prefix
+
+    def backup_key(self, backup_type: str, filename: str) -> str:
+        """
+        Get the GCS key of a backup or metadata file.
+
+        Args:
+            backup_type: Type of backup ("daily", "weekly", "manual", "physical")
+            filename: Backup or metadata filename
+
+        Returns:
+            GCS key ({prefix}/{type}/{filename})
+        """
+        return f"{self._root_prefix(backup_type)}/{backup_type}/{filename}"
+
     def _get_retry(self) -> retry.Retry:
         """
         Get retry configuration for GCS operations.
@@ -200,6 +328,185 @@ class CloudStorageManager:
                 error=error_msg,
             )
 
+    def open_stream_upload(self, gcs_key: str) -> StreamingUpload:
+        """
+        Open a resumable upload session that is fed by write() calls.
+
+        Args:
+            gcs_key: Destination key in GCS
+
+        Returns:
+            StreamingUpload sink; call close() to finalize or abort() to discard
+
+        Raises:
+            CloudUploadError: If the upload session cannot be opened
+        """
+        logger.info(f"Opening streaming upload to gs://{self.bucket_name}/{gcs_key}")
+
+        try:
+            blob = self._bucket.blob(gcs_key)
+            writer = blob.open(
+                "wb",
+                chunk_size=self.STREAM_CHUNK_SIZE,
+                ignore_flush=True,
+                retry=self._get_retry(),
+                timeout=self.DEFAULT_TIMEOUT,
+            )
+            return StreamingUpload(blob, writer)
+
+        except Exception as e:
+            error_msg = f"Failed to open streaming upload: {e}"
+            logger.error(error_msg)
+            raise CloudUploadError(error_msg) from e
+
+    def upload_directory(
+        self,
+        local_dir: Path,
+        gcs_key: str,
+    ) -> UploadResult:
+        """
+        Upload a directory-format backup as one unit.
+
+        Every file is uploaded under the backup's key as a prefix
+        (e.g., "backups/postgres/daily/backup.dir/toc.dat"). The upload
+        only succeeds if all files succeed.
+
+        Args:
+            local_dir: Path to local .dir backup
+            gcs_key: Destination key of the backup (ending in .dir)
+
+        Returns:
+            UploadResult with the total size of all files
+        """
+        logger.info(f"Uploading directory {local_dir} to gs://{self.bucket_name}/{gcs_key}/")
+
+        total_size = 0
+        files = sorted(p for p in local_dir.rglob("*") if p.is_file())
+
+        for path in files:
+            file_key = f"{gcs_key}/{path.relative_to(local_dir).as_posix()}"
+            result = self.upload_file(path, file_key)
+            if not result.success:
+                return UploadResult(
+                    success=False,
+                    key=gcs_key,
+                    size_bytes=total_size,
+                    error=result.error,
+                )
+            total_size += result.size_bytes
+
+        logger.info(f"Directory upload completed: {len(files)} files ({total_size} bytes)")
+
+        return UploadResult(success=True, key=gcs_key, size_bytes=total_size)
+
+    @staticmethod
+    def _chunk_prefix(gcs_key: str) -> str:
+        """Get the chunk store prefix for a backup key ({root}/{type}/{file})."""
+        return f"{gcs_key.rsplit('/', 2)[0]}/{CHUNK_DIR_NAME}"
+
+    def _list_chunk_hashes(self, chunk_prefix: str) -> set[str]:
+        """List the hashes of all chunks stored under a chunk prefix."""
+        blobs = self._bucket.list_blobs(prefix=f"{chunk_prefix}/", fields="items(name),nextPageToken")
+        return {blob.name.rsplit("/", 1)[-1] for blob in blobs}
+
+    def upload_chunked(self, manifest_path: Path, gcs_key: str) -> UploadResult:
+        """
+        Upload a chunked backup: its missing chunks, then its manifest.
+
+        Chunks already in the bucket (from earlier backups) are not
+        uploaded again. The manifest is uploaded last, so a manifest in
+        the bucket never references a missing chunk.
+
+        Args:
+            manifest_path: Path to local .manifest backup
+            gcs_key: Destination key of the manifest
+
+        Returns:
+            UploadResult with the bytes uploaded (new chunks + manifest)
+        """
+        chunk_prefix = self._chunk_prefix(gcs_key)
+        store = chunk_store_for(manifest_path)
+
+        try:
+            wanted = manifest_chunk_hashes(read_manifest(manifest_path))
+            missing = sorted(wanted - self._list_chunk_hashes(chunk_prefix))
+        except (ChunkStoreError, GoogleCloudError) as e:
+            error_msg = f"Chunked upload failed: {e}"
+            logger.error(error_msg)
+            return UploadResult(success=False, key=gcs_key, size_bytes=0, error=error_msg)
+
+        logger.info(
+            f"Uploading {len(missing)} of {len(wanted)} chunks to "
+            f"gs://{self.bucket_name}/{chunk_prefix}/"
+        )
+
+        def upload_chunk(chunk_hash: str) -> int:
+            path = store.path_for(chunk_hash)
+            blob = self._bucket.blob(f"{chunk_prefix}/{chunk_hash[:2]}/{chunk_hash}")
+            blob.upload_from_filename(
+                str(path), retry=self._get_retry(), timeout=self.DEFAULT_TIMEOUT
+            )
+            return path.stat().st_size
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.CHUNK_TRANSFER_WORKERS) as pool:
+                chunk_bytes = sum(pool.map(upload_chunk, missing))
+        except Exception as e:
+            error_msg = f"Chunk upload failed: {e}"
+            logger.error(error_msg)
+            return UploadResult(success=False, key=gcs_key, size_bytes=0, error=error_msg)
+
+        result = self.upload_file(manifest_path, gcs_key)
+        if result.success:
+            result.size_bytes += chunk_bytes
+        return result
+
+    def upload_backup(self, local_path: Path, gcs_key: str) -> UploadResult:
+        """
+        Upload a backup: a single .dump file, a .dir directory or a chunked .manifest.
+
+        The backup's TOC index sidecar is uploaded along with it, if present.
+
+        Args:
+            local_path: Path to local backup
+            gcs_key: Destination key in GCS
+
+        Returns:
+            UploadResult with operation details
+        """
+        if local_path.is_dir():
+            result = self.upload_directory(local_path, gcs_key)
+        elif local_path.suffix == MANIFEST_SUFFIX:
+            result = self.upload_chunked(local_path, gcs_key)
+        else:
+            result = self.upload_file(local_path, gcs_key)
+
+        if result.success:
+            self.upload_toc_index(local_path, gcs_key)
+        return result
+
+    def upload_toc_index(self, local_path: Path, gcs_key: str) -> bool:
+        """
+        Upload a backup's TOC index sidecar, if it has one.
+
+        The index only speeds up verification and listing, so a failure is
+        logged, not reported as a failed backup upload.
+
+        Args:
+            local_path: Path to local backup
+            gcs_key: Key of the backup in GCS
+
+        Returns:
+            True if an index was uploaded
+        """
+        index_path = toc_index_path(local_path)
+        if not index_path.is_file():
+            return False
+        result = self.upload_file(index_path, toc_index_key_for(gcs_key))
+        if not result.success:
+            logger.warning(f"TOC index upload failed: {result.error}")
+        return result.success
+
     def download_file(
         self,
         gcs_key: str,
@@ -280,6 +587,305 @@ class CloudStorageManager:
                 error=error_msg,
             )
 
+    def download_verified(self, gcs_key: str, local_path: Path, tree: TreeHash) -> DownloadResult:
+        """
+        Download a single-file backup range by range, verifying each range as it lands.
+
+        Each tree hash chunk is fetched with a ranged read into
+        <local_path>.part and checked against its digest; a corrupted
+        chunk is fetched again (up to RANGE_ATTEMPTS times). A failed or
+        interrupted download keeps the .part file, and the next attempt
+        resumes after its last verified chunk.
+
+        Args:
+            gcs_key: Key of the backup in GCS
+            local_path: Destination path
+            tree: Tree hash of the backup (from its metadata)
+
+        Returns:
+            DownloadResult with operation details
+        """
+        logger.info(
+            f"Downloading gs://{self.bucket_name}/{gcs_key} to {local_path} "
+            f"({len(tree.chunks)} verified ranges)"
+        )
+        part_path = local_path.with_name(f"{local_path.name}.part")
+
+        try:
+            local_path.parent.mkdir(parents=True, exist_ok=True)
+            blob = self._bucket.get_blob(gcs_key, retry=self._get_retry())
+            if blob is None:
+                error_msg = f"Blob not found: gs://{self.bucket_name}/{gcs_key}"
+                logger.error(error_msg)
+                return DownloadResult(
+                    success=False, key=gcs_key, local_path=local_path, size_bytes=0, error=error_msg
+                )
+            if blob.size != tree.size:
+                logger.warning(
+                    f"Size of {gcs_key} ({blob.size}) does not match its checksum tree "
+                    f"({tree.size}), downloading without range verification"
+                )
+                return self.download_file(gcs_key, local_path)
+
+            done = self._verified_chunks(part_path, tree)
+            if done:
+                logger.info(f"Resuming download after {done} verified ranges")
+
+            with open(part_path, "r+b" if part_path.exists() else "wb") as f:
+                for index in range(done, len(tree.chunks)):
+                    self._download_range(blob, f, tree, index)
+                f.truncate(tree.size)
+
+            os.replace(part_path, local_path)
+            logger.info(f"Download completed: {local_path} ({tree.size} bytes)")
+            return DownloadResult(success=True, key=gcs_key, local_path=local_path, size_bytes=tree.size)
+
+        except Exception as e:
+            error_msg = f"Download failed: {e}"
+            logger.error(error_msg)
+            return DownloadResult(
+                success=False, key=gcs_key, local_path=local_path, size_bytes=0, error=error_msg
+            )
+
+    @staticmethod
+    def _verified_chunks(part_path: Path, tree: TreeHash) -> int:
+        """Count the leading chunks of a partial download that match the tree hash."""
+        if not part_path.exists():
+            return 0
+        size = part_path.stat().st_size
+        for index, digest in enumerate(tree.chunks):
+            start, end = tree.chunk_range(index)
+            if end > size or hash_range(part_path, start, end) != digest:
+                return index
+        return len(tree.chunks)
+
+    def _download_range(self, blob: storage.Blob, f: Any, tree: TreeHash, index: int) -> None:
+        """
+        Download one tree hash chunk to its offset in f and verify it.
+
+        Raises:
+            CloudDownloadError: If the chunk does not match after RANGE_ATTEMPTS tries
+        """
+        start, end = tree.chunk_range(index)
+        for attempt in range(1, self.RANGE_ATTEMPTS + 1):
+            f.seek(start)
+            f.truncate(start)
+            writer = HashingWriter(f, tree=False)
+            # The object's MD5 covers the whole object, so it cannot check a range
+            blob.download_to_file(
+                writer,
+                start=start,
+                end=end - 1,
+                checksum=None,
+                retry=self._get_retry(),
+                timeout=self.DEFAULT_TIMEOUT,
+            )
+            if writer.bytes_written == end - start and writer.hexdigest() == tree.chunks[index]:
+                return
+            logger.warning(
+                f"Range {start}-{end} of {blob.name} failed verification "
+                f"(attempt {attempt}/{self.RANGE_ATTEMPTS})"
+            )
+        raise CloudDownloadError(f"Range {start}-{end} of {blob.name} is corrupted in storage")
+
+    def iter_blob(self, gcs_key: str) -> Iterator[bytes]:
+        """
+        Stream an object's content in STREAM_CHUNK_SIZE pieces.
+
+        Args:
+            gcs_key: Key of the object
+
+        Yields:
+            Consecutive pieces of the object
+
+        Raises:
+            CloudDownloadError: If the object does not exist or the download fails
+        """
+        blob = self._bucket.get_blob(gcs_key, retry=self._get_retry())
+        if blob is None:
+            raise CloudDownloadError(f"Blob not found: gs://{self.bucket_name}/{gcs_key}")
+
+        logger.info(f"Streaming gs://{self.bucket_name}/{gcs_key} ({blob.size} bytes)")
+        try:
+            # Every ranged read matches the generation looked up above, so an
+            # object replaced mid-stream fails instead of being mixed in
+            with blob.open(
+                "rb",
+                chunk_size=self.STREAM_CHUNK_SIZE,
+                if_generation_match=blob.generation,
+                retry=self._get_retry(),
+            ) as reader:
+                while data := reader.read(self.STREAM_CHUNK_SIZE):
+                    yield data
+        except GoogleCloudError as e:
+            raise CloudDownloadError(f"GCS download failed: {e}") from e
+
+    def download_directory(
+        self,
+        gcs_key: str,
+        local_dir: Path,
+    ) -> DownloadResult:
+        """
+        Download a directory-format backup stored under a key prefix.
+
+        Args:
+            gcs_key: Key of the backup (ending in .dir)
+            local_dir: Destination directory
+
+        Returns:
+            DownloadResult with the total size of all files
+        """
+        logger.info(f"Downloading gs://{self.bucket_name}/{gcs_key}/ to {local_dir}")
+
+        try:
+            prefix = f"{gcs_key}/"
+            blobs = list(self._bucket.list_blobs(prefix=prefix))
+
+            if not blobs:
+                error_msg = f"Backup not found: gs://{self.bucket_name}/{gcs_key}/"
+                logger.error(error_msg)
+                return DownloadResult(
+                    success=False,
+                    key=gcs_key,
+                    local_path=local_dir,
+                    size_bytes=0,
+                    error=error_msg,
+                )
+
+            total_size = 0
+            for blob in blobs:
+                result = self.download_file(blob.name, local_dir / blob.name[len(prefix):])
+                if not result.success:
+                    return DownloadResult(
+                        success=False,
+                        key=gcs_key,
+                        local_path=local_dir,
+                        size_bytes=total_size,
+                        error=result.error,
+                    )
+                total_size += result.size_bytes
+
+            logger.info(f"Directory download completed: {local_dir} ({total_size} bytes)")
+
+            return DownloadResult(
+                success=True,
+                key=gcs_key,
+                local_path=local_dir,
+                size_bytes=total_size,
+            )
+
+        except GoogleCloudError as e:
+            error_msg = f"GCS download failed: {e}"
+            logger.error(error_msg)
+            return DownloadResult(
+                success=False,
+                key=gcs_key,
+                local_path=local_dir,
+                size_bytes=0,
+                error=error_msg,
+            )
+
+    def download_chunked(self, gcs_key: str, local_path: Path) -> DownloadResult:
+        """
+        Download a chunked backup: its manifest and the chunks missing locally.
+
+        Chunks go into the chunk store next to local_path's directory
+        (e.g., /backups/chunks for /backups/daily/backup.manifest), where
+        restore reassembles the dump from.
+
+        Args:
+            gcs_key: Key of the .manifest backup
+            local_path: Destination path of the manifest
+
+        Returns:
+            DownloadResult with the bytes downloaded (manifest + chunks)
+        """
+        result = self.download_file(gcs_key, local_path)
+        if not result.success:
+            return result
+
+        chunk_prefix = self._chunk_prefix(gcs_key)
+        store = chunk_store_for(local_path)
+
+        try:
+            wanted = manifest_chunk_hashes(read_manifest(local_path))
+        except ChunkStoreError as e:
+            local_path.unlink(missing_ok=True)
+            return DownloadResult(
+                success=False, key=gcs_key, local_path=local_path, size_bytes=0, error=str(e)
+            )
+
+        missing = sorted(h for h in wanted if not store.has(h))
+        logger.info(f"Downloading {len(missing)} of {len(wanted)} chunks to {store.root}")
+
+        def download_chunk(chunk_hash: str) -> int:
+            path = store.path_for(chunk_hash)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.tmp.{os.getpid()}")
+            blob = self._bucket.blob(f"{chunk_prefix}/{chunk_hash[:2]}/{chunk_hash}")
+            blob.download_to_filename(
+                str(tmp_path), retry=self._get_retry(), timeout=self.DEFAULT_TIMEOUT
+            )
+            os.replace(tmp_path, path)
+            return path.stat().st_size
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.CHUNK_TRANSFER_WORKERS) as pool:
+                chunk_bytes = sum(pool.map(download_chunk, missing))
+        except Exception as e:
+            error_msg = f"Chunk download failed: {e}"
+            logger.error(error_msg)
+            # Without all chunks the manifest cannot be restored
+            local_path.unlink(missing_ok=True)
+            return DownloadResult(
+                success=False, key=gcs_key, local_path=local_path, size_bytes=0, error=error_msg
+            )
+
+        result.size_bytes += chunk_bytes
+        return result
+
+    def download_backup(self, gcs_key: str, local_path: Path) -> DownloadResult:
+        """
+        Download a backup: a single .dump file, a .dir directory or a chunked .manifest.
+
+        Single-file backups whose metadata has a tree hash are downloaded
+        range by range with verification (see download_verified()). The
+        TOC index sidecar is downloaded next to it, if it exists.
+
+        Args:
+            gcs_key: Key of the backup in GCS
+            local_path: Destination path
+
+        Returns:
+            DownloadResult with operation details
+        """
+        if gcs_key.endswith(DIRECTORY_SUFFIX):
+            result = self.download_directory(gcs_key, local_path)
+        elif gcs_key.endswith(MANIFEST_SUFFIX):
+            result = self.download_chunked(gcs_key, local_path)
+        elif tree := self._checksum_tree(gcs_key):
+            result = self.download_verified(gcs_key, local_path, tree)
+        else:
+            result = self.download_file(gcs_key, local_path)
+
+        # Fetch the TOC index sidecar too; backups taken before it existed have none
+        index_key = toc_index_key_for(gcs_key)
+        if result.success and self._bucket.blob(index_key).exists():
+            self.download_file(index_key, toc_index_path(local_path))
+        return result
+
+    def _checksum_tree(self, gcs_key: str) -> TreeHash | None:
+        """Load a backup's tree hash from its metadata (None if it has none)."""
+        metadata = self.get_metadata(gcs_key)
+        tree = (metadata or {}).get("backup_info", {}).get("checksum_tree")
+        if not tree:
+            return None
+        try:
+            return TreeHash.from_dict(tree)
+        except ValueError as e:
+            logger.warning(f"Ignoring checksum tree of {gcs_key}: {e}")
+            return None
+
     def list_backups(
         self,
         backup_type: str | None = None,
@@ -290,7 +896,8 @@ class CloudStorageManager:
         Equivalent to TOS list_objects_type2().
 
         Args:
-            backup_type: Optional filter by type ("daily", "weekly", "manual")
+            backup_type: Optional filter by type ("daily", "weekly", "manual",
+                "physical"); physical backups are only listed when requested
 
         Returns:
             List of BackupInfo objects, sorted by last_modified descending
@@ -300,9 +907,10 @@ class CloudStorageManager:
         """
         try:
             # Build prefix
-            prefix = f"{self.backup_prefix}/"
+            root = self._root_prefix(backup_type)
+            prefix = f"{root}/"
             if backup_type:
-                prefix = f"{self.backup_prefix}/{backup_type}/"
+                prefix = f"{root}/{backup_type}/"
 
             logger.debug(f"Listing backups with prefix: {prefix}")
 
@@ -310,12 +918,32 @@ class CloudStorageManager:
             blobs = self._bucket.list_blobs(prefix=prefix)
 
             backups = []
+            directories: dict[str, BackupInfo] = {}
 
             for blob in blobs:
-                # Only process .dump files
-                if blob.name.endswith(".dump"):
+                # Files of a directory-format backup are grouped into one entry
+                marker = f"{DIRECTORY_SUFFIX}/"
+                if marker in blob.name:
+                    key = blob.name[: blob.name.index(marker) + len(DIRECTORY_SUFFIX)]
+                    updated = blob.updated or datetime.now()
+                    entry = directories.get(key)
+                    if entry is None:
+                        parts = key.replace(f"{root}/", "").split("/")
+                        directories[key] = BackupInfo(
+                            key=key,
+                            filename=parts[-1],
+                            backup_type=parts[0] if len(parts) > 1 else "unknown",
+                            size_bytes=blob.size or 0,
+                            last_modified=updated,
+                        )
+                    else:
+                        entry.size_bytes += blob.size or 0
+                        entry.last_modified = max(entry.last_modified, updated)
+
+                # Only process .dump files and chunked backup manifests
+                elif blob.name.endswith((DUMP_SUFFIX, MANIFEST_SUFFIX)):
                     # Extract backup type from path
-                    parts = blob.name.replace(f"{self.backup_prefix}/", "").split("/")
+                    parts = blob.name.replace(f"{root}/", "").split("/")
                     backup_type_from_path = parts[0] if len(parts) > 1 else "unknown"
                     filename = parts[-1] if parts else blob.name.split("/")[-1]
 
@@ -330,6 +958,8 @@ class CloudStorageManager:
                         )
                     )
 
+            backups.extend(directories.values())
+
             # Sort by last_modified descending
             backups.sort(key=lambda x: x.last_modified, reverse=True)
 
@@ -346,7 +976,7 @@ class CloudStorageManager:
         Retrieve metadata JSON for a backup.
 
         Args:
-            dump_key: Key of the .dump file
+            dump_key: Key of the .dump file (or .dir backup)
 
         Returns:
             Metadata dictionary, or None if not found
@@ -354,7 +984,7 @@ class CloudStorageManager:
         Raises:
             CloudStorageError: If download fails
         """
-        metadata_key = dump_key.replace(".dump", ".json")
+        metadata_key = metadata_key_for(dump_key)
         blob = self._bucket.blob(metadata_key)
 
         if not blob.exists():
@@ -422,6 +1052,30 @@ class CloudStorageManager:
             logger.error(f"Failed to delete {gcs_key}: {e}")
             return False
 
+    def delete_backup(self, gcs_key: str) -> bool:
+        """
+        Delete a backup, including every file of a .dir backup.
+
+        Args:
+            gcs_key: Key of the backup
+
+        Returns:
+            True if deleted successfully, False otherwise
+        """
+        if not gcs_key.endswith(DIRECTORY_SUFFIX):
+            return self.delete_file(gcs_key)
+
+        try:
+            blobs = list(self._bucket.list_blobs(prefix=f"{gcs_key}/"))
+        except Exception as e:
+            logger.error(f"Failed to list {gcs_key}: {e}")
+            return False
+
+        deleted_all = True
+        for blob in blobs:
+            deleted_all = self.delete_file(blob.name) and deleted_all
+        return deleted_all
+
     def test_connection(self) -> bool:
         """
         Test GCS connectivity.
@@ -464,16 +1118,20 @@ class CloudStorageManager:
 
         for backup in to_delete:
             try:
-                # Delete the dump file
-                if self.delete_file(backup.key):
+                # Delete the dump file (or all files of a .dir backup)
+                if self.delete_backup(backup.key):
                     deleted.append(backup.key)
                     logger.debug(f"Deleted: {backup.key}")
 
                     # Also delete the metadata file
-                    metadata_key = backup.key.replace(".dump", ".json")
+                    metadata_key = metadata_key_for(backup.key)
                     if self.delete_file(metadata_key):
                         logger.debug(f"Deleted: {metadata_key}")
 
+                    index_key = toc_index_key_for(backup.key)
+                    if self._bucket.blob(index_key).exists():
+                        self.delete_file(index_key)
+
             except Exception as e:
                 logger.error(f"Failed to delete {backup.key}: {e}")
 
@@ -481,4 +1139,47 @@ class CloudStorageManager:
             f"Cloud retention: deleted {len(deleted) // 2} {backup_type} backups "
             f"(kept {retention_count}, removed {len(to_delete)})"
         )
+
+        if any(key.endswith(MANIFEST_SUFFIX) for key in deleted):
+            self.collect_chunk_garbage(self._root_prefix(backup_type))
+
+        return deleted
+
+    def collect_chunk_garbage(self, root: str) -> int:
+        """
+        Delete chunks no longer referenced by any manifest under a root prefix.
+
+        Chunks younger than GC_GRACE_SECONDS are kept, so chunks of an
+        upload whose manifest is not in the bucket yet survive. Nothing is
+        deleted if any manifest cannot be read.
+
+        Args:
+            root: Root prefix (e.g., "backups/postgres")
+
+        Returns:
+            Number of chunks deleted
+        """
+        chunk_prefix = f"{root}/{CHUNK_DIR_NAME}/"
+        referenced: set[str] = set()
+
+        try:
+            for blob in self._bucket.list_blobs(prefix=f"{root}/"):
+                if blob.name.endswith(MANIFEST_SUFFIX):
+                    content = blob.download_as_bytes(retry=self._get_retry())
+                    referenced |= manifest_chunk_hashes(parse_manifest(content, blob.name))
+
+            cutoff = datetime.now(UTC) - timedelta(seconds=GC_GRACE_SECONDS)
+            stale = [
+                blob.name
+                for blob in self._bucket.list_blobs(prefix=chunk_prefix)
+                if blob.name.rsplit("/", 1)[-1] not in referenced
+                and blob.time_created is not None
+                and blob.time_created < cutoff
+            ]
+        except (ChunkStoreError, GoogleCloudError) as e:
+            logger.error(f"Skipping cloud chunk garbage collection: {e}")
+            return 0
+
+        deleted = sum(1 for key in stale if self.delete_file(key))
+        logger.info(f"Cloud chunk store: deleted {deleted} unreferenced chunks")
         return deleted
@@ -8,9 +8,41 @@ import os
 from pathlib import Path
 from typing import Literal
 
-from pydantic import Field, field_validator
+from pydantic import Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from backup_postgres.utils.compression import LEVEL_RANGES
+
+
+def _split_host_port(entry: str) -> tuple[str, int | None]:
+    """
+    Split a host[:port] entry; IPv6 addresses are written [addr] or [addr]:port.
+
+    An unbracketed address with several colons is taken as a bare IPv6
+    address without a port.
+
+    Raises:
+        ValueError: If the entry has an empty host or an invalid port
+    """
+    if entry.startswith("["):
+        host, sep, rest = entry[1:].partition("]")
+        if not sep or (rest and not rest.startswith(":")):
+            raise ValueError(f"Invalid replica host {entry!r}: expected [address] or [address]:port")
+        port = rest[1:] if rest else None
+    elif entry.count(":") > 1:
+        host, port = entry, None
+    else:
+        host, sep, port = entry.rpartition(":")
+        if not sep:
+            host, port = port, None
+    if not host:
+        raise ValueError(f"Invalid replica host {entry!r}: empty host name")
+    if port is None:
+        return host, None
+    if not port.isdigit() or not 1 <= int(port) <= 65535:
+        raise ValueError(f"Invalid replica host {entry!r}: port must be a number between 1 and 65535")
+    return host, int(port)
+
 
 class PostgresConfig(BaseSettings):
     """PostgreSQL connection configuration."""
@@ -20,6 +52,11 @@ class PostgresConfig(BaseSettings):
     pg_user: str = Field(alias="POSTGRES_USER")
     pg_password: str = Field(alias="POSTGRES_PASSWORD")
     pg_database: str = Field(alias="POSTGRES_DB")
+    # Streaming replicas to dump from, comma-separated host[:port] (empty = primary only)
+    pg_replica_hosts: str = Field(default="", alias="POSTGRES_REPLICA_HOSTS")
+    replica_max_lag_seconds: int = Field(
+        default=300, ge=0, alias="POSTGRES_REPLICA_MAX_LAG_SECONDS"
+    )
 
     model_config = SettingsConfigDict(
         env_prefix="",
@@ -36,16 +73,62 @@ class PostgresConfig(BaseSettings):
             raise ValueError(f"Invalid port: {v}")
         return v
 
+    @field_validator("pg_replica_hosts")
+    @classmethod
+    def validate_replica_hosts(cls, v: str) -> str:
+        """Validate every replica entry, normalizing the list to "a,b,c"."""
+        entries = [entry.strip() for entry in v.split(",") if entry.strip()]
+        for entry in entries:
+            _split_host_port(entry)
+        return ",".join(entries)
+
+    @property
+    def replica_hosts(self) -> list[tuple[str, int]]:
+        """Candidate replicas as (host, port); the port defaults to POSTGRES_PORT."""
+        hosts = []
+        for entry in self.pg_replica_hosts.split(","):
+            if entry:
+                host, port = _split_host_port(entry)
+                hosts.append((host, port or self.pg_port))
+        return hosts
+
 
 class BackupConfig(BaseSettings):
     """Backup configuration."""
 
     backup_base_name: str = Field(default="postgres_db", alias="BACKUP_BASE_NAME")
+    compression_method: Literal["gzip", "zstd", "lz4", "none"] = Field(
+        default="gzip", alias="BACKUP_COMPRESSION"
+    )
     compression_level: int = Field(
-        default=9, ge=0, le=9, alias="BACKUP_COMPRESSION_LEVEL"
+        default=9, ge=0, le=19, alias="BACKUP_COMPRESSION_LEVEL"
+    )
+    compression_threads: int = Field(
+        default=0, ge=0, alias="BACKUP_COMPRESSION_THREADS"
+    )
+    backup_format: Literal["custom", "directory", "chunked", "sharded"] = Field(
+        default="custom", alias="BACKUP_FORMAT"
+    )
+    dump_jobs: int = Field(default=4, ge=1, alias="BACKUP_DUMP_JOBS")
+    shard_min_bytes: int = Field(default=1024**3, ge=0, alias="BACKUP_SHARD_MIN_BYTES")
+    table_count_mode: Literal["exact", "estimate", "skip"] = Field(
+        default="exact", alias="BACKUP_TABLE_COUNT_MODE"
     )
     retention_daily: int = Field(default=7, ge=1, alias="BACKUP_RETENTION_DAILY")
     retention_weekly: int = Field(default=4, ge=1, alias="BACKUP_RETENTION_WEEKLY")
+    retention_physical: int = Field(default=2, ge=1, alias="BACKUP_RETENTION_PHYSICAL")
+    physical_compression_level: int = Field(
+        default=3, ge=1, le=19, alias="BACKUP_PHYSICAL_COMPRESSION_LEVEL"
+    )
+    process_nice: int = Field(default=0, ge=0, le=19, alias="BACKUP_NICE")
+    ionice_class: Literal["none", "best-effort", "idle"] = Field(
+        default="none", alias="BACKUP_IONICE_CLASS"
+    )
+    # Dump stream rate limits per backup type in MB/s (0 = unlimited)
+    rate_limit_daily: float = Field(default=0, ge=0, alias="BACKUP_RATE_LIMIT_DAILY")
+    rate_limit_weekly: float = Field(default=0, ge=0, alias="BACKUP_RATE_LIMIT_WEEKLY")
+    rate_limit_manual: float = Field(default=0, ge=0, alias="BACKUP_RATE_LIMIT_MANUAL")
+    rate_limit_physical: float = Field(default=0, ge=0, alias="BACKUP_RATE_LIMIT_PHYSICAL")
     backup_dir: Path = Field(default=Path("/backups"), alias="BACKUP_DIR")
 
     model_config = SettingsConfigDict(
@@ -55,6 +138,19 @@ class BackupConfig(BaseSettings):
         extra="ignore",
     )
 
+    @model_validator(mode="after")
+    def validate_compression_level(self) -> "BackupConfig":
+        """Validate compression level is in range for the chosen method."""
+        if self.compression_method == "none":
+            return self
+        low, high = LEVEL_RANGES[self.compression_method]
+        if not low <= self.compression_level <= high:
+            raise ValueError(
+                f"Invalid compression level {self.compression_level} for "
+                f"{self.compression_method} (expected {low}-{high})"
+            )
+        return self
+
     @property
     def daily_dir(self) -> Path:
         """Daily backup directory."""
@@ -70,6 +166,21 @@ class BackupConfig(BaseSettings):
         """Manual backup directory."""
         return self.backup_dir / "manual"
 
+    @property
+    def physical_dir(self) -> Path:
+        """Physical (pg_basebackup) backup directory."""
+        return self.backup_dir / "physical"
+
+    @property
+    def rate_limits(self) -> dict[str, int]:
+        """Dump stream rate limit per backup type in bytes/sec (0 = unlimited)."""
+        return {
+            "daily": int(self.rate_limit_daily * 1024**2),
+            "weekly": int(self.rate_limit_weekly * 1024**2),
+            "manual": int(self.rate_limit_manual * 1024**2),
+            "physical": int(self.rate_limit_physical * 1024**2),
+        }
+
 
 class GCSConfig(BaseSettings):
     """Google Cloud Storage configuration."""
@@ -81,12 +192,17 @@ class GCSConfig(BaseSettings):
     gcs_backup_prefix: str = Field(
         default="backups/postgres", alias="GCS_BACKUP_PREFIX"
     )
+    gcs_physical_prefix: str = Field(
+        default="backups/postgres-physical", alias="GCS_PHYSICAL_PREFIX"
+    )
     gcs_upload_retry_max: int = Field(default=3, ge=1, alias="GCS_UPLOAD_RETRY_MAX")
+    gcs_stream_upload: bool = Field(default=False, alias="GCS_STREAM_UPLOAD")
     cloud_retention_enabled: bool = Field(
         default=False, alias="GCS_RETENTION_ENABLED"
     )
     cloud_retention_daily: int = Field(default=30, ge=1, alias="GCS_RETENTION_DAILY")
     cloud_retention_weekly: int = Field(default=90, ge=1, alias="GCS_RETENTION_WEEKLY")
+    cloud_retention_physical: int = Field(default=4, ge=1, alias="GCS_RETENTION_PHYSICAL")
 
     model_config = SettingsConfigDict(
         env_prefix="",
@@ -107,6 +223,9 @@ class SchedulerConfig(BaseSettings):
     sync_interval_seconds: int = Field(
         default=1800, ge=60, alias="SCHEDULER_SYNC_INTERVAL_SECONDS"
     )
+    physical_backup_enabled: bool = Field(
+        default=False, alias="SCHEDULER_PHYSICAL_BACKUP"
+    )
 
     model_config = SettingsConfigDict(
         env_prefix="",
@@ -165,6 +284,7 @@ class Settings:
         self.backup.daily_dir.mkdir(parents=True, exist_ok=True)
         self.backup.weekly_dir.mkdir(parents=True, exist_ok=True)
         self.backup.manual_dir.mkdir(parents=True, exist_ok=True)
+        self.backup.physical_dir.mkdir(parents=True, exist_ok=True)
 
         # Validate GCS credentials if enabled
         if self.gcs.enabled:
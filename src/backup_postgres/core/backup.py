@@ -5,14 +5,21 @@ Handles backup creation using pg_dump via subprocess.
 """
 
 import logging
+import time
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 
-from backup_postgres.config.settings import PostgresConfig
+from psycopg import sql
+
+from backup_postgres.config.settings import BackupConfig, PostgresConfig
 from backup_postgres.core.metadata import (
+    calculate_file_size,
     generate_backup_filename,
     generate_metadata_dict,
+    list_backup_paths,
     save_metadata,
 )
 from backup_postgres.core.models import (
@@ -23,9 +30,20 @@ from backup_postgres.core.models import (
     TableCounts,
 )
 from backup_postgres.core.retention import RetentionPolicy
-from backup_postgres.utils.exceptions import BackupError
-from backup_postgres.utils.subprocess import run_pg_dump, run_psql
+from backup_postgres.core.routing import BackupSource, select_backup_source
+from backup_postgres.core.sharding import build_shard_toc_index, dump_shards, plan_shards
+from backup_postgres.utils.checksum import calculate_sha256
+from backup_postgres.utils.compression import CompressionSpec
+from backup_postgres.utils.database import DatabaseSession
+from backup_postgres.utils.exceptions import ArchiveFormatError, BackupError, DatabaseError
+from backup_postgres.utils.subprocess import ProgressCallback, run_pg_dump
 from backup_postgres.utils.logging import log_execution_time
+from backup_postgres.utils.throttle import Throttle
+from backup_postgres.utils.toc import build_toc_index, save_toc_index, toc_index_path
+
+if TYPE_CHECKING:
+    from backup_postgres.cloud.gcs_storage import CloudStorageManager, StreamingUpload
+    from backup_postgres.cloud.registry import UploadRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +58,19 @@ class BackupManager:
     - Enforce retention policies
     """
 
+    # Tables whose row counts are recorded in metadata
+    COUNTED_TABLES = [
+        "clients",
+        "users",
+        "ioc",
+        "group_scans",
+        "ioc_scans",
+        "virustotal_scan_results",
+        "scan_results_generic",
+        "firewalls",
+        "action_logs",
+    ]
+
     def __init__(
         self,
         postgres_config: PostgresConfig,
@@ -48,6 +79,18 @@ class BackupManager:
         retention_weekly: int = 4,
         compression_level: int = 9,
         backup_base_name: str = "postgres_db",
+        backup_format: str = "custom",
+        dump_jobs: int = 1,
+        shard_min_bytes: int = 1024**3,
+        table_count_mode: str = "exact",
+        compression_method: str = "gzip",
+        compression_threads: int = 0,
+        nice: int = 0,
+        ionice_class: str = "none",
+        rate_limits: dict[str, int] | None = None,
+        cloud_manager: "CloudStorageManager | None" = None,
+        registry: "UploadRegistry | None" = None,
+        session: DatabaseSession | None = None,
     ) -> None:
         """
         Initialize backup manager.
@@ -57,33 +100,71 @@ class BackupManager:
             backup_dir: Base directory for backups
             retention_daily: Number of daily backups to keep
             retention_weekly: Number of weekly backups to keep
-            compression_level: pg_dump compression level (0-9)
+            compression_level: Compression level for compression_method
             backup_base_name: Base name for backup files (default: "postgres_db")
+            backup_format: "custom" (single .dump file), "directory" (.dir,
+                parallel), "chunked" (.manifest over a deduplicating chunk
+                store) or "sharded" (.dir of per-table custom-format dumps)
+            dump_jobs: Parallel pg_dump jobs for directory and sharded format
+            shard_min_bytes: Tables at least this large get their own shard
+                in sharded format
+            table_count_mode: "exact" (COUNT(*) per table), "estimate"
+                (planner statistics, no table scans) or "skip"
+            compression_method: "gzip", "zstd", "lz4" or "none"
+            compression_threads: zstd compressor threads (0 = all cores)
+            nice: Niceness of pg_dump (0 = unchanged)
+            ionice_class: I/O scheduling class of pg_dump ("none",
+                "best-effort" or "idle")
+            rate_limits: Dump stream rate limit in bytes/sec per backup
+                type (missing or 0 = unlimited)
+            cloud_manager: If set (with registry), custom-format dumps are
+                streamed to GCS while pg_dump writes them to disk
+            registry: Upload registry marked when a streamed upload completes
+            session: Shared database session (default: a session owned by
+                this manager, closed at the end of each backup)
         """
         self.pg_config = postgres_config
         self.backup_dir = backup_dir
         self.compression_level = compression_level
+        self.compression = CompressionSpec(
+            method=compression_method,
+            level=compression_level,
+            threads=compression_threads,
+        )
         self.backup_base_name = backup_base_name
+        self.backup_format = backup_format
+        self.dump_jobs = dump_jobs
+        self.shard_min_bytes = shard_min_bytes
+        self.table_count_mode = table_count_mode
+        self.nice = nice
+        self.ionice_class = None if ionice_class == "none" else ionice_class
+        self.rate_limits = rate_limits or {}
+        self.cloud_manager = cloud_manager
+        self.registry = registry
+        self.session = session or DatabaseSession(postgres_config)
+        self._owns_session = session is None
+        # Built without reading the environment; unset fields keep their defaults
         self.retention = RetentionPolicy(
-            type("obj", (object,), {
-                "daily_dir": backup_dir / "daily",
-                "weekly_dir": backup_dir / "weekly",
-                "manual_dir": backup_dir / "manual",
-                "retention_daily": retention_daily,
-                "retention_weekly": retention_weekly,
-            })
+            BackupConfig.model_construct(
+                backup_dir=backup_dir,
+                retention_daily=retention_daily,
+                retention_weekly=retention_weekly,
+            )
         )
 
     @log_execution_time
     def create_backup(
         self,
         backup_type: Literal["daily", "weekly", "manual"],
+        on_progress: ProgressCallback | None = None,
     ) -> BackupResult:
         """
         Create a complete backup (dump + metadata).
 
         Args:
             backup_type: Type of backup to create
+            on_progress: Optional callable receiving a ProgressEvent for
+                every table pg_dump finishes
 
         Returns:
             BackupResult with paths and metadata
@@ -93,62 +174,146 @@ class BackupManager:
         """
         logger.info(f"Creating {backup_type} backup for database: {self.pg_config.pg_database}")
 
+        stream_upload: "StreamingUpload | None" = None
+        stream_finalized = False
         try:
-            # 1. Get migration version from database
-            migration_info = self._get_migration_info()
-            logger.info(f"Migration version: {migration_info.version}")
-
-            # 2. Generate filename
-            dump_name, json_name = generate_backup_filename(
-                self.backup_base_name, backup_type, migration_info.version
-            )
-
-            # Determine output directory
-            if backup_type == "daily":
-                output_dir = self.backup_dir / "daily"
-            elif backup_type == "weekly":
-                output_dir = self.backup_dir / "weekly"
-            else:
-                output_dir = self.backup_dir / "manual"
-
-            output_dir.mkdir(parents=True, exist_ok=True)
-            backup_path = output_dir / dump_name
-            metadata_path = output_dir / json_name
-
-            # 3. Get table counts before backup
-            table_counts = self._get_table_counts()
-
-            # 4. Run pg_dump
-            logger.info(f"Running pg_dump to: {backup_path}")
-            run_pg_dump(
-                self.pg_config,
-                backup_path,
-                compression_level=self.compression_level,
-                verbose=True,
-            )
+            # Dump from a streaming replica if one is configured and healthy
+            source = select_backup_source(self.pg_config)
+
+            # Migration info, counts, fingerprint and dump all describe one
+            # point in time; without a snapshot they are taken back to back
+            with self._source_session(source), self._dump_snapshot() as snapshot_id:
+                # 1. Get migration version from database
+                migration_info = self._get_migration_info()
+                logger.info(f"Migration version: {migration_info.version}")
+
+                # 2. Generate filename
+                dump_name, json_name = generate_backup_filename(
+                    self.backup_base_name,
+                    backup_type,
+                    migration_info.version,
+                    backup_format=self.backup_format,
+                )
+
+                # Determine output directory
+                if backup_type == "daily":
+                    output_dir = self.backup_dir / "daily"
+                elif backup_type == "weekly":
+                    output_dir = self.backup_dir / "weekly"
+                else:
+                    output_dir = self.backup_dir / "manual"
+
+                output_dir.mkdir(parents=True, exist_ok=True)
+                backup_path = output_dir / dump_name
+                metadata_path = output_dir / json_name
+
+                # 3. Get table counts and catalog fingerprint in the dump's snapshot
+                table_counts = self._get_table_counts()
+                catalog_fingerprint = self._get_catalog_fingerprint()
+                source_info = {**source.to_dict(), "lsn": self._get_wal_lsn()}
+
+                # 4. Run pg_dump (streaming to GCS at the same time if configured)
+                stream_upload = self._open_stream_upload(backup_type, dump_name)
+                throttle = Throttle(
+                    nice=self.nice,
+                    ionice_class=self.ionice_class,
+                    rate_bytes_per_second=self.rate_limits.get(backup_type, 0),
+                )
+                logger.info(f"Running pg_dump to: {backup_path}")
+                dump_result = None
+                shards = None
+                dump_started = time.monotonic()
+                if self.backup_format == "sharded":
+                    shards = self._dump_shards(
+                        source.config, backup_path, snapshot_id, on_progress, throttle
+                    )
+                else:
+                    dump_result = run_pg_dump(
+                        source.config,
+                        backup_path,
+                        compression_level=self.compression_level,
+                        compression=self.compression,
+                        verbose=True,
+                        backup_format=self.backup_format,
+                        jobs=self.dump_jobs,
+                        extra_sinks=[stream_upload] if stream_upload else None,
+                        snapshot=snapshot_id,
+                        on_progress=on_progress,
+                        throttle=throttle,
+                    )
+                dump_duration = time.monotonic() - dump_started
 
             # Verify backup was created
             if not backup_path.exists():
                 raise BackupError(f"Backup file was not created: {backup_path}")
 
             # 5. Generate and save metadata
+            # Every shard of a sharded backup is a custom-format dump
+            compression = self.compression.to_dict(
+                "custom" if self.backup_format == "sharded" else self.backup_format
+            )
+            if dump_result and self.backup_format == "chunked":
+                compression.update(
+                    chunks_total=dump_result.chunks_total,
+                    chunks_new=dump_result.chunks_new,
+                    stored_bytes=dump_result.stored_bytes,
+                )
+
             backup_info = BackupInfo(
                 timestamp=datetime.now(UTC),
                 type=backup_type,
                 database=self.pg_config.pg_database,
                 filename=dump_name,
-                size_bytes=backup_path.stat().st_size,
+                size_bytes=(dump_result and dump_result.size_bytes) or calculate_file_size(backup_path),
+                format=self.backup_format,
+                compression=compression,
+                snapshot_consistent=snapshot_id is not None,
             )
 
+            # Custom-format and chunked dumps are hashed while pg_dump writes
+            # them (a chunked backup's checksum is that of the reassembled
+            # dump); directory and sharded backups are checksummed over all
+            # their files
+            checksum = dump_result.checksum_sha256 if dump_result else ""
+            if not checksum:
+                checksum = calculate_sha256(backup_path)
+            checksum_tree = dump_result.checksum_tree if dump_result else None
+
+            # Directory-format dumps bypass the throttle's byte count
+            dumped_bytes = throttle.bytes_written or backup_info.size_bytes
+            throughput = {
+                "bytes": dumped_bytes,
+                "duration_seconds": round(dump_duration, 2),
+                "bytes_per_second": int(dumped_bytes / dump_duration) if dump_duration else 0,
+                **throttle.to_dict(),
+            }
+
+            # Record the archive's TOC once, so later tools need not re-scan it
+            self._save_toc_index(backup_path)
+
             metadata_dict = generate_metadata_dict(
                 backup_info=backup_info,
                 migration_info=migration_info,
                 table_counts=table_counts,
-                checksum="",  # Will be filled by save_metadata
+                checksum=checksum,
+                table_count_mode=self.table_count_mode,
+                catalog_fingerprint=catalog_fingerprint,
+                shards=shards,
+                throughput=throughput,
+                source=source_info,
+                checksum_tree=checksum_tree,
             )
             save_metadata(metadata_path, metadata_dict)
 
-            # 6. Run retention cleanup
+            # 6. Finalize the streamed cloud copy and mark it in the registry
+            uploaded_key = None
+            if stream_upload:
+                stream_finalized = True
+                uploaded_key = self._finish_stream_upload(
+                    stream_upload, backup_type, dump_name, metadata_path, checksum
+                )
+
+            # 7. Run retention cleanup
             logger.info("Running retention policy enforcement")
             self.retention.enforce_retention()
 
@@ -160,6 +325,7 @@ class BackupManager:
                 metadata_path=metadata_path,
                 backup_info=backup_info,
                 checksum=metadata_dict["backup_info"]["checksum_sha256"],
+                uploaded_key=uploaded_key,
             )
 
         except Exception as e:
@@ -179,6 +345,240 @@ class BackupManager:
                 error=str(e),
             )
 
+        finally:
+            # A failed dump, checksum, TOC index or metadata write leaves the
+            # streamed copy unfinalized: abandon it, never commit a partial object
+            if stream_upload and not stream_finalized:
+                stream_upload.abort()
+            # Don't hold an idle connection between scheduled backups
+            if self._owns_session:
+                self.session.close()
+
+    @contextmanager
+    def _source_session(self, source: BackupSource) -> Iterator[None]:
+        """
+        Route the session's queries to the backup source for the context.
+
+        The snapshot pg_dump imports has to be exported on the server
+        pg_dump connects to, so a replica gets its own session.
+
+        Args:
+            source: Server chosen by select_backup_source()
+        """
+        if not source.is_replica:
+            yield
+            return
+
+        primary_session = self.session
+        self.session = DatabaseSession(source.config)
+        try:
+            yield
+        finally:
+            self.session.close()
+            self.session = primary_session
+
+    @contextmanager
+    def _dump_snapshot(self) -> Iterator[str | None]:
+        """
+        Hold an exported snapshot open for the pre-dump queries and pg_dump.
+
+        Queries made through the session inside the context run in the
+        snapshot's repeatable-read transaction, and pg_dump imports it via
+        --snapshot, so the recorded counts match the dumped data.
+
+        Yields:
+            Snapshot identifier, or None if no snapshot could be exported
+            (the backup then proceeds without one)
+        """
+        with ExitStack() as stack:
+            snapshot_id: str | None
+            try:
+                snapshot_id = stack.enter_context(self.session.exported_snapshot())
+                logger.info(f"Using exported snapshot: {snapshot_id}")
+            except DatabaseError as e:
+                logger.warning(f"{e}; continuing without a consistent snapshot")
+                snapshot_id = None
+            yield snapshot_id
+
+    def _dump_shards(
+        self,
+        config: PostgresConfig,
+        backup_path: Path,
+        snapshot_id: str | None,
+        on_progress: ProgressCallback | None = None,
+        throttle: Throttle | None = None,
+    ) -> list[dict]:
+        """
+        Dump a sharded backup: schema, small tables and each large table concurrently.
+
+        Args:
+            config: Connection configuration of the backup source
+            backup_path: Backup directory to create
+            snapshot_id: Exported snapshot shared by all shards
+            on_progress: Optional progress callback (called from worker threads)
+            throttle: Optional throttle shared by all shards
+
+        Returns:
+            Shard entries for the metadata JSON
+
+        Raises:
+            BackupError: If no snapshot is available or a shard fails
+        """
+        if snapshot_id is None:
+            # Shards dumped at different points in time would not restore consistently
+            raise BackupError("Sharded backups require an exported snapshot")
+
+        shards = plan_shards(self._get_table_sizes(), self.shard_min_bytes)
+        large = [s.table for s in shards if s.table]
+        logger.info(f"Sharded dump: {len(large)} large tables in own shards: {large}")
+
+        return dump_shards(
+            config,
+            backup_path,
+            shards,
+            snapshot=snapshot_id,
+            compression=self.compression,
+            max_workers=self.dump_jobs,
+            on_progress=on_progress,
+            throttle=throttle,
+        )
+
+    def _get_wal_lsn(self) -> str | None:
+        """
+        Get the WAL position of the backup source.
+
+        On a replica this is the replayed position, which the dump's
+        snapshot cannot be ahead of.
+
+        Returns:
+            LSN as text (e.g., "0/3000148"), or None if the query fails
+        """
+        query = """
+            SELECT CASE WHEN pg_is_in_recovery()
+                THEN pg_last_wal_replay_lsn()
+                ELSE pg_current_wal_lsn()
+            END::text;
+        """
+
+        try:
+            lsn: str | None = self.session.fetch_value(query)
+            return lsn
+        except Exception as e:
+            logger.warning(f"Could not get WAL position: {e}")
+            return None
+
+    def _save_toc_index(self, backup_path: Path) -> None:
+        """
+        Write the TOC index sidecar of a new backup.
+
+        A backup without an index is still complete (verification falls
+        back to pg_restore --list), so failures are only logged.
+
+        Args:
+            backup_path: Backup just written
+        """
+        try:
+            if self.backup_format == "sharded":
+                index = build_shard_toc_index(backup_path)
+            else:
+                index = build_toc_index(backup_path)
+            save_toc_index(toc_index_path(backup_path), index)
+        except (ArchiveFormatError, OSError) as e:
+            logger.warning(f"Could not write TOC index for {backup_path.name}: {e}")
+
+    def _get_table_sizes(self) -> dict[str, int]:
+        """
+        Get the on-disk size of every table in the public schema.
+
+        Uses pg_table_size (heap and TOAST, without indexes), which is what
+        a data-only dump has to read.
+
+        Returns:
+            Table name -> size in bytes (empty if the query fails)
+        """
+        query = """
+            SELECT c.relname, pg_table_size(c.oid)
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'public'
+            AND c.relkind = 'r';
+        """
+
+        try:
+            return {table: int(size) for table, size in self.session.fetch_all(query)}
+        except Exception as e:
+            logger.warning(f"Could not get table sizes, dumping all data in one shard: {e}")
+            return {}
+
+    def _open_stream_upload(
+        self,
+        backup_type: str,
+        dump_name: str,
+    ) -> "StreamingUpload | None":
+        """
+        Open a streaming GCS upload for the dump, if configured.
+
+        Only custom-format dumps are streamed; directory backups are
+        uploaded by the scheduler's cloud sync as before.
+
+        Args:
+            backup_type: Type of backup
+            dump_name: Backup filename
+
+        Returns:
+            StreamingUpload sink, or None if streaming is not used
+        """
+        if not self.cloud_manager or not self.registry or self.backup_format != "custom":
+            return None
+
+        gcs_key = self.cloud_manager.backup_key(backup_type, dump_name)
+        try:
+            return self.cloud_manager.open_stream_upload(gcs_key)
+        except Exception as e:
+            logger.warning(f"Streaming upload unavailable, cloud sync will upload later: {e}")
+            return None
+
+    def _finish_stream_upload(
+        self,
+        stream_upload: "StreamingUpload",
+        backup_type: str,
+        dump_name: str,
+        metadata_path: Path,
+        checksum: str,
+    ) -> str | None:
+        """
+        Finalize a streaming upload, upload the metadata and mark the registry.
+
+        Failures are logged, not raised: the local backup is complete and
+        the regular cloud sync will upload it later.
+
+        Args:
+            stream_upload: Streaming upload fed during pg_dump
+            backup_type: Type of backup
+            dump_name: Backup filename
+            metadata_path: Path to .json metadata
+            checksum: SHA-256 checksum of the dump
+
+        Returns:
+            GCS key of the uploaded dump, or None if the upload failed
+        """
+        assert self.cloud_manager is not None and self.registry is not None
+
+        result = stream_upload.close()
+        if not result.success:
+            logger.warning(f"Streaming upload failed, cloud sync will retry: {result.error}")
+            return None
+
+        metadata_key = self.cloud_manager.backup_key(backup_type, metadata_path.name)
+        metadata_result = self.cloud_manager.upload_file(metadata_path, metadata_key)
+        if not metadata_result.success:
+            logger.warning(f"Metadata upload failed, cloud sync will retry: {metadata_result.error}")
+            return None
+
+        self.cloud_manager.upload_toc_index(metadata_path.parent / dump_name, result.key)
+        self.registry.mark_uploaded(backup_type, dump_name, checksum, result.key)
+        return result.key
+
     def _get_migration_info(self) -> MigrationInfo:
         """
         Query migration version from schema_migrations table.
@@ -196,13 +596,10 @@ class BackupManager:
         """
 
         try:
-            result = run_psql(self.pg_config, query)
-            if result.success and result.stdout.strip():
-                parts = result.stdout.strip().split("|")
-                if len(parts) == 2:
-                    version = int(parts[0].strip())
-                    dirty = parts[1].strip().lower() == "t"
-                    return MigrationInfo(version=version, dirty=dirty)
+            row = self.session.fetch_one(query)
+            if row:
+                version, dirty = row
+                return MigrationInfo(version=int(version), dirty=bool(dirty))
 
             # Default if table doesn't exist or is empty
             logger.warning("No migration info found, using default")
@@ -214,51 +611,133 @@ class BackupManager:
 
     def _get_table_counts(self) -> TableCounts:
         """
-        Get row counts for all known tables.
+        Get row counts for all known tables using the configured mode.
 
         Returns:
-            TableCounts with row counts
-
-        Raises:
-            BackupError: If query fails
+            TableCounts with row counts (all zero in "skip" mode)
         """
-        tables = [
-            "clients",
-            "users",
-            "ioc",
-            "group_scans",
-            "ioc_scans",
-            "virustotal_scan_results",
-            "scan_results_generic",
-            "firewalls",
-            "action_logs",
-        ]
+        if self.table_count_mode == "skip":
+            logger.info("Skipping table counts (BACKUP_TABLE_COUNT_MODE=skip)")
+            return TableCounts()
+        if self.table_count_mode == "estimate":
+            return self._get_estimated_table_counts()
+        return self._get_exact_table_counts()
+
+    def _get_exact_table_counts(self) -> TableCounts:
+        """
+        Get exact row counts with COUNT(*) (one sequential scan per table).
 
+        Returns:
+            TableCounts with row counts
+        """
         counts = TableCounts()
 
-        for table in tables:
+        for table in self.COUNTED_TABLES:
             try:
-                query = f"SELECT COUNT(*) FROM \"{table}\";"
-                result = run_psql(self.pg_config, query)
-                if result.success and result.stdout.strip():
-                    count = int(result.stdout.strip())
-                    setattr(counts, table, count)
-                    logger.debug(f"Table {table}: {count} rows")
+                query = sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(table))
+                count = self.session.fetch_value(query)
+                setattr(counts, table, count)
+                logger.debug(f"Table {table}: {count} rows")
             except Exception as e:
                 # Table might not exist, continue with others
                 logger.debug(f"Could not get count for {table}: {e}")
 
         return counts
 
+    def _get_estimated_table_counts(self) -> TableCounts:
+        """
+        Get estimated row counts from planner statistics without scanning tables.
+
+        Uses pg_stat_user_tables.n_live_tup, falling back to pg_class.reltuples
+        for tables without activity statistics (e.g., after a stats reset).
+        Tables that were never analyzed count as 0.
+
+        Returns:
+            TableCounts with estimated row counts
+        """
+        query = """
+            SELECT c.relname,
+                   CASE WHEN s.n_live_tup > 0 THEN s.n_live_tup
+                        ELSE GREATEST(c.reltuples, 0)::bigint
+                   END
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+            WHERE n.nspname = 'public'
+            AND c.relkind IN ('r', 'p')
+            AND c.relname = ANY(%s);
+        """
+
+        counts = TableCounts()
+
+        try:
+            for table, count in self.session.fetch_all(query, (self.COUNTED_TABLES,)):
+                setattr(counts, table, int(count))
+                logger.debug(f"Table {table}: ~{count} rows")
+        except Exception as e:
+            logger.warning(f"Could not get estimated table counts: {e}")
+
+        return counts
+
+    def _get_catalog_fingerprint(self) -> str:
+        """
+        Get an MD5 fingerprint of the public schema definition.
+
+        Covers columns and their types, indexes, constraints and enum
+        labels, so two databases with the same fingerprint have the same
+        schema regardless of object creation order.
+
+        Returns:
+            Hex MD5 digest, or "" if it could not be computed
+        """
+        query = """
+            SELECT md5(COALESCE(string_agg(item, E'\\n' ORDER BY item), ''))
+            FROM (
+                SELECT format('column %s.%s %s %s', c.relname, a.attname,
+                              format_type(a.atttypid, a.atttypmod), a.attnotnull) AS item
+                FROM pg_attribute a
+                JOIN pg_class c ON c.oid = a.attrelid
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = 'public'
+                AND c.relkind IN ('r', 'p')
+                AND a.attnum > 0
+                AND NOT a.attisdropped
+                UNION ALL
+                SELECT format('index %s %s', indexname, indexdef)
+                FROM pg_indexes
+                WHERE schemaname = 'public'
+                UNION ALL
+                SELECT format('constraint %s %s %s', con.conrelid::regclass, con.conname,
+                              pg_get_constraintdef(con.oid))
+                FROM pg_constraint con
+                JOIN pg_namespace n ON n.oid = con.connamespace
+                WHERE n.nspname = 'public'
+                UNION ALL
+                SELECT format('enum %s %s %s', t.typname, e.enumsortorder, e.enumlabel)
+                FROM pg_enum e
+                JOIN pg_type t ON t.oid = e.enumtypid
+                JOIN pg_namespace n ON n.oid = t.typnamespace
+                WHERE n.nspname = 'public'
+            ) items;
+        """
+
+        try:
+            fingerprint = self.session.fetch_value(query) or ""
+            logger.debug(f"Catalog fingerprint: {fingerprint}")
+            return fingerprint
+        except Exception as e:
+            logger.warning(f"Could not compute catalog fingerprint: {e}")
+            return ""
+
     def list_backups(self, backup_type: str) -> list[Path]:
         """
         List backups of a given type.
 
         Args:
-            backup_type: Type of backup ("daily", "weekly", "manual")
+            backup_type: Type of backup ("daily", "weekly", "manual", "physical")
 
         Returns:
-            Sorted list of backup file paths
+            Sorted list of backup paths (.dump files and .dir directories)
         """
         if backup_type == "daily":
             directory = self.backup_dir / "daily"
@@ -266,13 +745,12 @@ class BackupManager:
             directory = self.backup_dir / "weekly"
         elif backup_type == "manual":
             directory = self.backup_dir / "manual"
+        elif backup_type == "physical":
+            directory = self.backup_dir / "physical"
         else:
             raise ValueError(f"Invalid backup type: {backup_type}")
 
-        if not directory.exists():
-            return []
-
-        return sorted(directory.glob("*.dump"))
+        return list_backup_paths(directory)
 
     def get_latest_backup(self, backup_type: str) -> Path | None:
         """
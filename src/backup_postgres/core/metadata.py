@@ -8,6 +8,7 @@ import json
 import logging
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import Any
 
 from backup_postgres.core.models import (
     BackupInfo,
@@ -16,15 +17,27 @@ from backup_postgres.core.models import (
     TableCounts,
 )
 from backup_postgres.utils.checksum import calculate_sha256
+from backup_postgres.utils.chunking import MANIFEST_SUFFIX
+from backup_postgres.utils.toc import TOC_INDEX_SUFFIX
 
 logger = logging.getLogger(__name__)
 
+# Suffix of single-file custom-format backups
+DUMP_SUFFIX = ".dump"
+
+# Suffix of directory-format backups (one directory per backup)
+DIRECTORY_SUFFIX = ".dir"
+
+# All suffixes that identify a backup (file, directory or chunk manifest)
+BACKUP_SUFFIXES = (DUMP_SUFFIX, DIRECTORY_SUFFIX, MANIFEST_SUFFIX)
+
 
 def generate_backup_filename(
     base_name: str,
     backup_type: str,
     migration_version: int,
     timestamp: datetime | None = None,
+    backup_format: str = "custom",
 ) -> tuple[str, str]:
     """
     Generate backup filename and metadata filename.
@@ -33,11 +46,15 @@ def generate_backup_filename(
 
     Example: postgres_db_20260211_030316_v7_daily.dump
 
+    Directory-format and sharded backups use the same name with a .dir
+    suffix, chunked backups with a .manifest suffix.
+
     Args:
         base_name: Base name for the backup (e.g., "postgres_db")
         backup_type: Type of backup ("daily", "weekly", "manual")
         migration_version: Migration schema version
         timestamp: Timestamp to use (defaults to now)
+        backup_format: "custom", "directory", "chunked" or "sharded"
 
     Returns:
         Tuple of (dump_filename, json_filename)
@@ -47,8 +64,63 @@ def generate_backup_filename(
 
     ts_str = timestamp.strftime("%Y%m%d_%H%M%S")
     base = f"{base_name}_{ts_str}_v{migration_version}_{backup_type}"
+    if backup_format in ("directory", "sharded"):
+        suffix = DIRECTORY_SUFFIX
+    elif backup_format == "chunked":
+        suffix = MANIFEST_SUFFIX
+    else:
+        suffix = DUMP_SUFFIX
+
+    return f"{base}{suffix}", f"{base}.json"
+
+
+def list_backup_paths(directory: Path) -> list[Path]:
+    """
+    List all backups (.dump files, .dir directories and .manifest files) in a directory.
 
-    return f"{base}.dump", f"{base}.json"
+    Args:
+        directory: Directory to scan
+
+    Returns:
+        Backup paths sorted by name (which includes timestamp)
+    """
+    if not directory.exists():
+        return []
+
+    return sorted(
+        p for p in directory.iterdir()
+        if (p.suffix in (DUMP_SUFFIX, MANIFEST_SUFFIX) and p.is_file())
+        or (p.suffix == DIRECTORY_SUFFIX and p.is_dir())
+    )
+
+
+def metadata_key_for(backup_key: str) -> str:
+    """
+    Get the metadata (.json) key or filename for a backup key or filename.
+
+    Args:
+        backup_key: Backup key ending in .dump, .dir or .manifest
+
+    Returns:
+        Matching .json key
+    """
+    for suffix in BACKUP_SUFFIXES:
+        if backup_key.endswith(suffix):
+            return backup_key[: -len(suffix)] + ".json"
+    return backup_key + ".json"
+
+
+def toc_index_key_for(backup_key: str) -> str:
+    """
+    Get the TOC index sidecar (.toc.json) key or filename for a backup key or filename.
+
+    Args:
+        backup_key: Backup key ending in .dump, .dir or .manifest
+
+    Returns:
+        Matching .toc.json key
+    """
+    return metadata_key_for(backup_key)[: -len(".json")] + TOC_INDEX_SUFFIX
 
 
 def generate_metadata_dict(
@@ -56,6 +128,12 @@ def generate_metadata_dict(
     migration_info: MigrationInfo,
     table_counts: TableCounts,
     checksum: str,
+    table_count_mode: str = "exact",
+    catalog_fingerprint: str = "",
+    shards: list[dict] | None = None,
+    throughput: dict | None = None,
+    source: dict | None = None,
+    checksum_tree: dict | None = None,
 ) -> dict:
     """
     Generate metadata dictionary matching EXACT schema.
@@ -67,17 +145,30 @@ def generate_metadata_dict(
         migration_info: Migration information
         table_counts: Table row counts
         checksum: SHA-256 checksum of backup file
+        table_count_mode: How table_counts were obtained ("exact",
+            "estimate" or "skip")
+        catalog_fingerprint: MD5 of the public schema definition at dump time
+        shards: Files of a sharded backup (added as "shards" if given)
+        throughput: Dump duration, rate and throttle settings (added as
+            "throughput" if given)
+        source: Host the backup was taken from and its WAL position
+            (added as "source" if given)
+        checksum_tree: Tree hash of a single-file backup (added to
+            backup_info as "checksum_tree" if given)
 
     Returns:
         Dictionary with metadata structure
     """
-    return {
+    metadata: dict[str, Any] = {
         "backup_info": {
             "timestamp": backup_info.timestamp.isoformat() + "Z",
             "type": backup_info.type,
             "database": backup_info.database,
             "filename": backup_info.filename,
             "size_bytes": backup_info.size_bytes,
+            "format": backup_info.format,
+            "compression": backup_info.compression,
+            "snapshot_consistent": backup_info.snapshot_consistent,
             "checksum_sha256": checksum,
         },
         "migration_info": {
@@ -85,6 +176,8 @@ def generate_metadata_dict(
             "dirty": migration_info.dirty,
         },
         "table_counts": table_counts.to_dict(),
+        "table_count_mode": table_count_mode,
+        "catalog_fingerprint": catalog_fingerprint,
         "enum_types": [
             "ioc_type",
             "scanner_type",
@@ -94,6 +187,15 @@ def generate_metadata_dict(
             "action_types",
         ],
     }
+    if checksum_tree is not None:
+        metadata["backup_info"]["checksum_tree"] = checksum_tree
+    if shards is not None:
+        metadata["shards"] = shards
+    if throughput is not None:
+        metadata["throughput"] = throughput
+    if source is not None:
+        metadata["source"] = source
+    return metadata
 
 
 def save_metadata(metadata_path: Path, metadata_dict: dict) -> None:
@@ -152,8 +254,10 @@ def calculate_file_size(file_path: Path) -> int:
     """
     Calculate file size in bytes.
 
+    For directory-format backups, returns the total size of all files.
+
     Args:
-        file_path: Path to file
+        file_path: Path to file or backup directory
 
     Returns:
         File size in bytes
@@ -162,6 +266,8 @@ def calculate_file_size(file_path: Path) -> int:
         IOError: If file cannot be accessed
     """
     try:
+        if file_path.is_dir():
+            return sum(p.stat().st_size for p in file_path.rglob("*") if p.is_file())
         return file_path.stat().st_size
     except OSError as e:
         logger.error(f"Failed to get file size for {file_path}: {e}")
@@ -174,16 +280,18 @@ def create_backup_metadata(
     database: str,
     migration_info: MigrationInfo,
     table_counts: TableCounts,
+    table_count_mode: str = "exact",
 ) -> BackupMetadata:
     """
     Create complete backup metadata for a backup file.
 
     Args:
-        backup_path: Path to backup .dump file
+        backup_path: Path to backup .dump file or .dir directory
         backup_type: Type of backup
         database: Database name
         migration_info: Migration information
         table_counts: Table row counts
+        table_count_mode: How table_counts were obtained
 
     Returns:
         BackupMetadata object
@@ -198,6 +306,7 @@ def create_backup_metadata(
         database=database,
         filename=backup_path.name,
         size_bytes=size_bytes,
+        format="directory" if backup_path.is_dir() else "custom",
     )
 
     return BackupMetadata(
@@ -213,4 +322,5 @@ def create_backup_metadata(
             "firewall_types",
             "action_types",
         ],
+        table_count_mode=table_count_mode,
     )
@@ -4,7 +4,7 @@ Data models for backup operations.
 Defines data structures for backup results, metadata, and validation results.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -31,6 +31,9 @@ class BackupInfo:
     database: str
     filename: str
     size_bytes: int
+    format: str = "custom"  # "custom" (.dump), "directory"/"sharded" (.dir) or "chunked"
+    compression: dict[str, Any] | None = None  # Codec, level, threads and stage
+    snapshot_consistent: bool = False  # Counts and dump read one exported snapshot
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -40,6 +43,9 @@ class BackupInfo:
             "database": self.database,
             "filename": self.filename,
             "size_bytes": self.size_bytes,
+            "format": self.format,
+            "compression": self.compression,
+            "snapshot_consistent": self.snapshot_consistent,
         }
 
 
@@ -53,6 +59,7 @@ class BackupResult:
     backup_info: BackupInfo
     checksum: str
     error: str | None = None
+    uploaded_key: str | None = None  # Set when the dump was streamed to GCS
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -63,6 +70,7 @@ class BackupResult:
             "backup_info": self.backup_info.to_dict(),
             "checksum": self.checksum,
             "error": self.error,
+            "uploaded_key": self.uploaded_key,
         }
 
 
@@ -75,6 +83,11 @@ class RestoreResult:
     validation_passed: bool
     validation_errors: list[str]
     duration_seconds: float
+    wait_seconds: float = 0.0  # Part of duration_seconds spent waiting for the server
+    jobs: int = 1  # Effective pg_restore parallelism
+    phase_seconds: dict[str, float] = field(default_factory=dict)  # Duration of each restore step
+    check_seconds: dict[str, float] = field(default_factory=dict)  # Wall time of each validation check
+    profile: str | None = None  # Restore profile applied while pg_restore ran
     error: str | None = None
 
     def to_dict(self) -> dict[str, Any]:
@@ -85,6 +98,11 @@ class RestoreResult:
             "validation_passed": self.validation_passed,
             "validation_errors": self.validation_errors,
             "duration_seconds": self.duration_seconds,
+            "wait_seconds": self.wait_seconds,
+            "jobs": self.jobs,
+            "phase_seconds": self.phase_seconds,
+            "check_seconds": self.check_seconds,
+            "profile": self.profile,
             "error": self.error,
         }
 
@@ -98,6 +116,7 @@ class ValidationResult:
     details: str
     expected: Any = None
     actual: Any = None
+    duration_seconds: float | None = None
 
 
 @dataclass
@@ -138,6 +157,7 @@ class BackupMetadata:
     table_counts: TableCounts
     checksum_sha256: str
     enum_types: list[str]
+    table_count_mode: str = "exact"  # "exact", "estimate" or "skip"
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -145,5 +165,6 @@ class BackupMetadata:
             "backup_info": self.backup_info.to_dict(),
             "migration_info": self.migration_info.to_dict(),
             "table_counts": self.table_counts.to_dict(),
+            "table_count_mode": self.table_count_mode,
             "enum_types": self.enum_types,
         }
@@ -0,0 +1,254 @@
+"""
+PostgreSQL physical backup manager.
+
+Handles base backups of the whole cluster using pg_basebackup via subprocess.
+"""
+
+import logging
+import shutil
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+from backup_postgres.config.settings import BackupConfig, PostgresConfig
+from backup_postgres.core.metadata import (
+    calculate_file_size,
+    generate_backup_filename,
+    generate_metadata_dict,
+    list_backup_paths,
+    save_metadata,
+)
+from backup_postgres.core.models import (
+    BackupInfo,
+    BackupResult,
+    MigrationInfo,
+    TableCounts,
+)
+from backup_postgres.core.retention import RetentionPolicy
+from backup_postgres.utils.checksum import calculate_sha256
+from backup_postgres.utils.database import DatabaseSession
+from backup_postgres.utils.exceptions import BackupError
+from backup_postgres.utils.logging import log_execution_time
+from backup_postgres.utils.subprocess import run_pg_basebackup
+from backup_postgres.utils.throttle import Throttle
+
+logger = logging.getLogger(__name__)
+
+# First PostgreSQL version supporting server-side compression (--compress=server-*)
+SERVER_COMPRESSION_MIN_VERSION = 150000
+
+
+class PhysicalBackupManager:
+    """
+    Manages physical (pg_basebackup) backup creation.
+
+    A physical backup is a copy of the data directory plus the WAL needed
+    to make it consistent. Restoring it skips the index rebuilds a logical
+    restore has to do, at the cost of being tied to the server's major
+    version. Backups are stored as .dir directories under physical/ and
+    have their own retention.
+
+    Responsibilities:
+    - Execute pg_basebackup via subprocess
+    - Generate metadata JSON
+    - Enforce physical retention
+    """
+
+    BACKUP_TYPE = "physical"
+
+    def __init__(
+        self,
+        postgres_config: PostgresConfig,
+        backup_config: BackupConfig,
+        session: DatabaseSession | None = None,
+    ) -> None:
+        """
+        Initialize physical backup manager.
+
+        Args:
+            postgres_config: PostgreSQL connection configuration (the user
+                needs the REPLICATION attribute)
+            backup_config: Backup configuration
+            session: Shared database session (default: a session owned by
+                this manager, closed at the end of each backup)
+        """
+        self.pg_config = postgres_config
+        self.backup_config = backup_config
+        self.backup_dir = backup_config.physical_dir
+        self.compression_level = backup_config.physical_compression_level
+        self.nice = backup_config.process_nice
+        self.ionice_class = None if backup_config.ionice_class == "none" else backup_config.ionice_class
+        self.rate_limit = backup_config.rate_limits[self.BACKUP_TYPE]
+        self.session = session or DatabaseSession(postgres_config)
+        self._owns_session = session is None
+        self.retention = RetentionPolicy(backup_config)
+
+    @log_execution_time
+    def create_backup(self) -> BackupResult:
+        """
+        Create a physical backup (base backup + metadata).
+
+        Returns:
+            BackupResult with paths and metadata
+        """
+        logger.info(f"Creating physical backup of {self.pg_config.pg_host}:{self.pg_config.pg_port}")
+        backup_path = Path("")
+
+        try:
+            # 1. Server version decides where compression runs
+            server_version = self._get_server_version()
+            server_compression = server_version >= SERVER_COMPRESSION_MIN_VERSION
+            migration_info = self._get_migration_info()
+
+            # 2. Generate names (same scheme as directory-format logical backups)
+            dump_name, json_name = generate_backup_filename(
+                self.backup_config.backup_base_name,
+                self.BACKUP_TYPE,
+                migration_info.version,
+                backup_format="directory",
+            )
+            self.backup_dir.mkdir(parents=True, exist_ok=True)
+            backup_path = self.backup_dir / dump_name
+            metadata_path = self.backup_dir / json_name
+
+            # 3. Run pg_basebackup
+            logger.info(f"Running pg_basebackup to: {backup_path}")
+            throttle = Throttle(
+                nice=self.nice,
+                ionice_class=self.ionice_class,
+                rate_bytes_per_second=self.rate_limit,
+            )
+            started = time.monotonic()
+            run_pg_basebackup(
+                self.pg_config,
+                backup_path,
+                compression_level=self.compression_level,
+                server_compression=server_compression,
+                verbose=True,
+                throttle=throttle,
+            )
+            duration = time.monotonic() - started
+            size_bytes = calculate_file_size(backup_path)
+
+            # 4. Generate and save metadata
+            backup_info = BackupInfo(
+                timestamp=datetime.now(UTC),
+                type=self.BACKUP_TYPE,
+                database=self.pg_config.pg_database,
+                filename=dump_name,
+                size_bytes=size_bytes,
+                format="physical",
+                compression={
+                    "method": "zstd",
+                    "level": self.compression_level,
+                    "stage": "server" if server_compression else "client",
+                    "server_version": server_version,
+                },
+            )
+
+            # Row counts of a running cluster cannot be pinned to the
+            # backup's end point, so they are not recorded
+            metadata_dict = generate_metadata_dict(
+                backup_info=backup_info,
+                migration_info=migration_info,
+                table_counts=TableCounts(),
+                checksum=calculate_sha256(backup_path),
+                table_count_mode="skip",
+                # The rate limit is enforced by the server (--max-rate), so
+                # throttled_seconds stays 0
+                throughput={
+                    "bytes": size_bytes,
+                    "duration_seconds": round(duration, 2),
+                    "bytes_per_second": int(size_bytes / duration) if duration else 0,
+                    **throttle.to_dict(),
+                },
+            )
+            save_metadata(metadata_path, metadata_dict)
+
+            # 5. Run physical retention cleanup
+            logger.info("Running physical retention policy enforcement")
+            self.retention.enforce_physical_retention()
+
+            logger.info(f"Physical backup completed successfully: {backup_path}")
+
+            return BackupResult(
+                success=True,
+                backup_path=backup_path,
+                metadata_path=metadata_path,
+                backup_info=backup_info,
+                checksum=metadata_dict["backup_info"]["checksum_sha256"],
+            )
+
+        except Exception as e:
+            logger.error(f"Physical backup failed: {e}")
+            # Never leave a partial base backup behind for sync/retention to pick up
+            if backup_path.name and backup_path.exists():
+                shutil.rmtree(backup_path, ignore_errors=True)
+            return BackupResult(
+                success=False,
+                backup_path=Path(""),
+                metadata_path=Path(""),
+                backup_info=BackupInfo(
+                    timestamp=datetime.now(UTC),
+                    type=self.BACKUP_TYPE,
+                    database=self.pg_config.pg_database,
+                    filename="",
+                    size_bytes=0,
+                    format="physical",
+                ),
+                checksum="",
+                error=str(e),
+            )
+
+        finally:
+            if self._owns_session:
+                self.session.close()
+
+    def _get_server_version(self) -> int:
+        """
+        Get the server version number (e.g., 160004).
+
+        Returns:
+            server_version_num as an integer
+
+        Raises:
+            BackupError: If the server cannot be queried
+        """
+        try:
+            return int(self.session.fetch_value("SHOW server_version_num;"))
+        except Exception as e:
+            raise BackupError(f"Could not determine server version: {e}") from e
+
+    def _get_migration_info(self) -> MigrationInfo:
+        """
+        Query migration version from schema_migrations table.
+
+        Returns:
+            MigrationInfo with version and dirty flag (0/False if unavailable)
+        """
+        try:
+            row = self.session.fetch_one("SELECT version, dirty FROM schema_migrations LIMIT 1;")
+            if row:
+                return MigrationInfo(version=int(row[0]), dirty=bool(row[1]))
+        except Exception as e:
+            logger.warning(f"Failed to get migration info: {e}, using default")
+        return MigrationInfo(version=0, dirty=False)
+
+    def list_backups(self) -> list[Path]:
+        """
+        List physical backups.
+
+        Returns:
+            Sorted list of backup directories
+        """
+        return list_backup_paths(self.backup_dir)
+
+    def get_latest_backup(self) -> Path | None:
+        """
+        Get the latest physical backup.
+
+        Returns:
+            Path to latest backup, or None if no backups exist
+        """
+        backups = self.list_backups()
+        return backups[-1] if backups else None
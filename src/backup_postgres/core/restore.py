@@ -4,31 +4,170 @@ PostgreSQL restore manager with 9-point validation.
 Handles restore operations using pg_restore and comprehensive validation.
 """
 
+import itertools
 import logging
 import re
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+from psycopg import errors, sql
 
 from backup_postgres.config.settings import PostgresConfig
-from backup_postgres.core.metadata import load_metadata
+from backup_postgres.core.metadata import DIRECTORY_SUFFIX, load_metadata
 from backup_postgres.core.models import (
     MigrationInfo,
     RestoreResult,
     ValidationResult,
     TableCounts,
 )
-from backup_postgres.utils.exceptions import RestoreError, ValidationError
+from backup_postgres.core.sharding import (
+    SCHEMA_FILE,
+    build_shard_toc_index,
+    data_shard_files,
+    is_sharded_backup,
+    restore_shards,
+    verify_shards,
+)
+from backup_postgres.core.tuning import apply_profile, get_profile
+from backup_postgres.utils.checksum import StreamVerifier, TreeHash
+from backup_postgres.utils.checksum import verify_checksum as verify_file_checksum
+from backup_postgres.utils.chunking import MANIFEST_SUFFIX
+from backup_postgres.utils.compression import codec_from_magic, codec_from_metadata
+from backup_postgres.utils.database import DatabaseSession
+from backup_postgres.utils.exceptions import (
+    ArchiveFormatError,
+    ChunkStoreError,
+    DatabaseError,
+    RestoreError,
+    ValidationError,
+)
+from backup_postgres.utils.readiness import wait_for_postgres
+from backup_postgres.utils.toc import (
+    build_toc_index,
+    format_restore_list,
+    index_entries,
+    load_toc_index,
+    read_archive_header,
+    select_toc_entries,
+)
 from backup_postgres.utils.subprocess import (
-    check_pg_ready,
+    ProgressCallback,
+    available_cpus,
+    extract_tar_archive,
+    restore_parallelism,
     run_pg_restore,
-    run_psql,
+    start_postgres_server,
+    stop_postgres_server,
     verify_backup_format,
 )
 
+if TYPE_CHECKING:
+    from backup_postgres.cloud.gcs_storage import CloudStorageManager
+
 logger = logging.getLogger(__name__)
 
+# Poll interval while following a spool file that is still being written (seconds)
+FOLLOW_INTERVAL = 0.05
+
+# Read size when following a spool file
+FOLLOW_CHUNK_SIZE = 1024 * 1024
+
+
+@contextmanager
+def _timed(phases: dict[str, float], name: str) -> Iterator[None]:
+    """Record the duration of a restore step in phases[name]."""
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        phases[name] = round(time.monotonic() - started, 3)
+
+
+def _follow_file(path: Path, done: threading.Event) -> Iterator[bytes]:
+    """Read a file that another thread is still writing, until it sets done."""
+    with open(path, "rb") as f:
+        while True:
+            finished = done.is_set()
+            data = f.read(FOLLOW_CHUNK_SIZE)
+            if data:
+                yield data
+            elif finished:
+                return
+            else:
+                done.wait(FOLLOW_INTERVAL)
+
+
+# Catalog facts of validation checks 1-6 in one round trip. schema_migrations
+# may be missing from a broken restore, so it is read through query_to_xml()
+# only if it exists; a static reference would fail the whole query.
+CATALOG_QUERY = """
+    WITH migrations AS (
+        SELECT
+            to_regclass('schema_migrations') IS NOT NULL AS present,
+            CASE WHEN to_regclass('schema_migrations') IS NOT NULL THEN
+                query_to_xml('SELECT version, dirty FROM schema_migrations LIMIT 1', false, false, '')
+            END AS row_xml
+    )
+    SELECT
+        m.present,
+        (xpath('//row/version/text()', m.row_xml))[1]::text,
+        (xpath('//row/dirty/text()', m.row_xml))[1]::text,
+        ARRAY(SELECT tablename::text FROM pg_tables WHERE schemaname = 'public' ORDER BY 1),
+        ARRAY(SELECT typname::text FROM pg_type WHERE typtype = 'e' ORDER BY 1),
+        (SELECT count(*) FROM pg_indexes WHERE schemaname = 'public'),
+        (SELECT count(*)
+         FROM pg_constraint c
+         JOIN pg_class r ON r.oid = c.conrelid
+         JOIN pg_namespace n ON n.oid = r.relnamespace
+         WHERE c.contype = 'f' AND n.nspname = 'public')
+    FROM migrations m;
+"""
+
+# Orphaned records of the common FK relationships (check 9).
+# This is a simplified check - full implementation would check all FK relationships
+ORPHAN_QUERY = """
+    SELECT
+        (SELECT COUNT(*) FROM clients WHERE user_id NOT IN (SELECT id FROM users WHERE id IS NOT NULL)) +
+        (SELECT COUNT(*) FROM ioc_scans WHERE ioc_id NOT IN (SELECT id FROM ioc WHERE id IS NOT NULL))
+    AS orphan_count;
+"""
+
+# Names of the checks evaluated from the catalog snapshot (1-6)
+CATALOG_CHECKS = [
+    "Migration Version",
+    "Migration Dirty Flag",
+    "Tables Exist",
+    "ENUM Types Exist",
+    "Indexes Present",
+    "Foreign Keys Present",
+]
+
+
+def _is_timeout(error: Exception) -> bool:
+    """Whether a query failed because statement_timeout cancelled it."""
+    return isinstance(error.__cause__, errors.QueryCanceled)
+
+
+@dataclass
+class CatalogSnapshot:
+    """Catalog facts checked by validation checks 1-6."""
+
+    has_migrations: bool
+    migration_version: int | None
+    migration_dirty: bool | None
+    tables: list[str]
+    enums: list[str]
+    index_count: int
+    foreign_key_count: int
+
 
 @dataclass
 class ValidationReport:
@@ -52,6 +191,14 @@ class ValidationReport:
         """Check if all validation checks passed."""
         return self.failed == 0
 
+    def check_seconds(self) -> dict[str, float]:
+        """Wall time of each timed check in seconds."""
+        return {
+            c.check_name: round(c.duration_seconds, 3)
+            for c in self.checks
+            if c.duration_seconds is not None
+        }
+
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
         return {
@@ -62,6 +209,9 @@ class ValidationReport:
                     "details": c.details,
                     "expected": str(c.expected) if c.expected else None,
                     "actual": str(c.actual) if c.actual else None,
+                    "duration_seconds": (
+                        round(c.duration_seconds, 3) if c.duration_seconds is not None else None
+                    ),
                 }
                 for c in self.checks
             ],
@@ -108,36 +258,109 @@ class RestoreManager:
         "action_logs",
     ]
 
-    def __init__(self, postgres_config: PostgresConfig) -> None:
+    # Allowed deviation from row counts recorded as planner estimates:
+    # relative to the expected count, but at least a fixed number of rows
+    # since estimates for small or never-analyzed tables are coarse
+    ESTIMATE_TOLERANCE = 0.10
+    ESTIMATE_MIN_SLACK = 100
+
+    # Connections running the data checks concurrently, and the seconds
+    # each of their queries may run before the server cancels it
+    VALIDATION_WORKERS = 4
+    CHECK_TIMEOUT = 1800.0
+
+    def __init__(
+        self,
+        postgres_config: PostgresConfig,
+        session: DatabaseSession | None = None,
+        validation_workers: int | None = None,
+        check_timeout: float | None = None,
+        parallel_query_workers: int = 0,
+        profile: str | None = None,
+    ) -> None:
         """
         Initialize restore manager.
 
         Args:
             postgres_config: PostgreSQL connection configuration
+            session: Shared database session (default: a session owned by
+                this manager, closed at the end of each restore)
+            validation_workers: Connections running the data checks
+                (default: VALIDATION_WORKERS)
+            check_timeout: statement_timeout of each data check query in
+                seconds (default: CHECK_TIMEOUT)
+            parallel_query_workers: max_parallel_workers_per_gather of the
+                data check connections (0 = server default)
+            profile: Restore profile applied to the server while pg_restore
+                runs (see core.tuning.PROFILES; None = server settings as is)
+
+        Raises:
+            ValueError: If the profile does not exist
         """
         self.pg_config = postgres_config
+        self.session = session or DatabaseSession(postgres_config)
+        self._owns_session = session is None
+        self.validation_workers = validation_workers or self.VALIDATION_WORKERS
+        self.check_timeout = check_timeout or self.CHECK_TIMEOUT
+        self.parallel_query_workers = parallel_query_workers
+        self.profile = get_profile(profile) if profile else None
+
+    def close(self) -> None:
+        """Close the database session if this manager owns it."""
+        if self._owns_session:
+            self.session.close()
+
+    @contextmanager
+    def _tuned(self) -> Iterator[dict[str, str] | None]:
+        """
+        Apply the restore profile, if any, for the duration of the context.
+
+        Yields:
+            Session settings for pg_restore (None without a profile)
+        """
+        if self.profile is None:
+            yield None
+            return
+        with apply_profile(self.session, self.profile) as options:
+            yield options
 
     def restore_backup(
         self,
         backup_path: Path,
         metadata_path: Path | None = None,
         drop_schema: bool = True,
+        on_progress: ProgressCallback | None = None,
+        jobs: int | None = None,
+        verify_checksum: bool = False,
     ) -> RestoreResult:
         """
         Restore database from backup file.
 
         Args:
-            backup_path: Path to .dump file
+            backup_path: Path to .dump file, .dir directory (directory-format
+                or sharded) or .manifest
             metadata_path: Optional path to .json metadata
             drop_schema: Whether to drop existing schema before restore
+            on_progress: Optional callable receiving a ProgressEvent for
+                every object pg_restore finishes
+            jobs: Parallel pg_restore jobs (default: CPUs available to
+                this process); streamed archives always use one
+            verify_checksum: Re-read the whole file to check it against the
+                metadata's tree hash first (off by default: downloads are
+                already verified range by range)
 
         Returns:
-            RestoreResult with status and validation
+            RestoreResult with status, validation, effective parallelism
+            and the duration of each step
 
         Raises:
             RestoreError: If restore fails
         """
         start_time = datetime.now(UTC)
+        wait_seconds = 0.0
+        phases: dict[str, float] = {}
+        jobs = jobs or available_cpus()
+        effective_jobs = 1
         logger.info(f"Starting restore from: {backup_path}")
 
         # Load metadata if available
@@ -154,29 +377,84 @@ class RestoreManager:
             if not backup_path.exists():
                 raise RestoreError(f"Backup file not found: {backup_path}")
 
-            logger.info("Verifying backup format...")
-            verify_backup_format(backup_path)
+            # Externally compressed dumps are decompressed transparently
+            codec = codec_from_metadata(metadata)
+            sharded = is_sharded_backup(backup_path)
+
+            with _timed(phases, "verify"):
+                # Single-file backups with a tree hash are checked chunk by chunk
+                # in parallel; a mismatch logs the corrupted byte ranges
+                backup_info = (metadata or {}).get("backup_info", {})
+                tree = backup_info.get("checksum_tree")
+                if verify_checksum and tree and backup_path.is_file():
+                    logger.info("Verifying backup checksum...")
+                    if not verify_file_checksum(backup_path, backup_info.get("checksum_sha256", ""), tree):
+                        raise RestoreError(f"Backup checksum mismatch: {backup_path}")
+
+                self._log_archive_header(backup_path / SCHEMA_FILE if sharded else backup_path, codec)
+
+                # The TOC index (if any) is checked against the archive's TOC
+                index = load_toc_index(backup_path)
+                if index:
+                    self._log_restore_plan(index)
+
+                logger.info("Verifying backup format...")
+                if sharded:
+                    verify_shards(backup_path, codec=codec, index=index)
+                else:
+                    verify_backup_format(backup_path, codec=codec, index=index)
 
             # 2. Wait for database to be ready
             logger.info("Waiting for database to be ready...")
-            if not check_pg_ready(self.pg_config, timeout=60):
+            with _timed(phases, "wait_for_database"):
+                readiness = wait_for_postgres(self.pg_config, timeout=60)
+            wait_seconds = readiness.wait_seconds
+            if not readiness.ready:
                 raise RestoreError("Database not ready after timeout")
 
             # 3. Drop existing schema if requested
             if drop_schema:
                 logger.info("Dropping existing schema...")
-                self._drop_schema()
+                with _timed(phases, "drop_schema"):
+                    self._drop_schema()
 
-            # 4. Run pg_restore
+            # 4. Run pg_restore (data shards of a sharded backup concurrently)
             logger.info("Running pg_restore...")
-            run_pg_restore(self.pg_config, backup_path, verbose=True)
+            with _timed(phases, "pg_restore"), self._tuned() as options:
+                if sharded:
+                    effective_jobs = restore_shards(
+                        self.pg_config,
+                        backup_path,
+                        codec=codec,
+                        max_workers=jobs,
+                        on_progress=on_progress,
+                        options=options,
+                    )
+                else:
+                    effective_jobs = restore_parallelism(backup_path, jobs, codec)
+                    run_pg_restore(
+                        self.pg_config,
+                        backup_path,
+                        verbose=True,
+                        codec=codec,
+                        on_progress=on_progress,
+                        jobs=effective_jobs,
+                        options=options,
+                    )
 
             # 5. Run validation
             logger.info("Running validation checks...")
-            validation = self.validate_restore(metadata)
+            with _timed(phases, "validate"):
+                validation = self.validate_restore(metadata)
             duration = (datetime.now(UTC) - start_time).total_seconds()
 
-            logger.info(f"Restore completed in {duration:.2f}s")
+            logger.info(
+                f"Restore completed in {duration:.2f}s with {effective_jobs} parallel jobs "
+                f"({wait_seconds:.2f}s waiting for the database)"
+            )
+            logger.info(
+                "Restore phases: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in phases.items())
+            )
 
             return RestoreResult(
                 success=True,
@@ -185,7 +463,12 @@ class RestoreManager:
                 validation_errors=[
                     c.details for c in validation.checks if not c.passed
                 ],
+                check_seconds=validation.check_seconds(),
                 duration_seconds=duration,
+                wait_seconds=wait_seconds,
+                jobs=effective_jobs,
+                phase_seconds=phases,
+                profile=self.profile.name if self.profile else None,
             )
 
         except Exception as e:
@@ -197,10 +480,650 @@ class RestoreManager:
                 validation_passed=False,
                 validation_errors=[str(e)],
                 duration_seconds=duration,
+                wait_seconds=wait_seconds,
+                jobs=effective_jobs,
+                phase_seconds=phases,
+                profile=self.profile.name if self.profile else None,
+                error=str(e),
+            )
+
+        finally:
+            self.close()
+
+    def restore_from_cloud(
+        self,
+        cloud_manager: "CloudStorageManager",
+        gcs_key: str,
+        drop_schema: bool = True,
+        on_progress: ProgressCallback | None = None,
+        spool_dir: Path | None = None,
+        jobs: int | None = None,
+        keep_spool: bool = False,
+    ) -> RestoreResult:
+        """
+        Restore a single-file backup straight from GCS, overlapping download and restore.
+
+        The object is streamed into pg_restore's stdin while it downloads
+        and its bytes are checked against the metadata checksums in flight
+        (chunk by chunk if the metadata has a tree hash), so a corrupted
+        download aborts the restore.
+
+        With spool_dir, the object is downloaded to a file there on a
+        background thread instead; the pre-data section is restored from
+        the growing file meanwhile, and once the download is complete and
+        verified, data and post-data are restored from it with parallel
+        jobs.
+
+        Args:
+            cloud_manager: GCS storage manager
+            gcs_key: Key of the .dump backup
+            drop_schema: Whether to drop existing schema before restore
+            on_progress: Optional callable receiving a ProgressEvent for
+                every object pg_restore finishes
+            spool_dir: Directory to spool the download to (enables the
+                parallel pass)
+            jobs: Parallel pg_restore jobs of the pass from the spool file
+                (default: CPUs available to this process)
+            keep_spool: Keep the spool file after the restore
+
+        Returns:
+            RestoreResult with status, validation, effective parallelism
+            and the duration of each step
+        """
+        start_time = datetime.now(UTC)
+        wait_seconds = 0.0
+        phases: dict[str, float] = {}
+        effective_jobs = 1
+        backup_file = Path(gcs_key)
+        logger.info(f"Starting restore from gs://{cloud_manager.bucket_name}/{gcs_key}")
+
+        try:
+            # 1. Load metadata (codec and checksums of the stream)
+            if gcs_key.endswith((DIRECTORY_SUFFIX, MANIFEST_SUFFIX)):
+                raise RestoreError(
+                    "Only single-file backups can be restored from a stream; download this one first"
+                )
+            metadata = cloud_manager.get_metadata(gcs_key)
+            backup_info = (metadata or {}).get("backup_info", {})
+            tree = backup_info.get("checksum_tree")
+            verifier = StreamVerifier(
+                backup_info.get("checksum_sha256", ""),
+                TreeHash.from_dict(tree) if tree else None,
+            )
+            if not verifier.expected_sha256:
+                logger.warning("No checksum in metadata, the download cannot be verified")
+
+            stream = verifier.wrap(cloud_manager.iter_blob(gcs_key))
+            codec = codec_from_metadata(metadata)
+            if metadata is None:
+                # Without metadata the codec is sniffed from the first bytes
+                stream, codec = self._sniff_codec(stream)
+
+            # 2. Wait for database to be ready
+            logger.info("Waiting for database to be ready...")
+            with _timed(phases, "wait_for_database"):
+                readiness = wait_for_postgres(self.pg_config, timeout=60)
+            wait_seconds = readiness.wait_seconds
+            if not readiness.ready:
+                raise RestoreError("Database not ready after timeout")
+
+            # 3. Drop existing schema if requested
+            if drop_schema:
+                logger.info("Dropping existing schema...")
+                with _timed(phases, "drop_schema"):
+                    self._drop_schema()
+
+            # 4. Run pg_restore on the stream, or spool it for a parallel pass
+            with self._tuned() as options:
+                if spool_dir is None:
+                    logger.info("Running pg_restore on the download stream...")
+                    with _timed(phases, "pg_restore"):
+                        run_pg_restore(
+                            self.pg_config,
+                            backup_file,
+                            verbose=True,
+                            codec=codec,
+                            on_progress=on_progress,
+                            source=stream,
+                            options=options,
+                        )
+                        # Hash whatever pg_restore did not need to read
+                        for _ in stream:
+                            pass
+                        verifier.finish()
+                else:
+                    spool_path = spool_dir / backup_file.name
+                    try:
+                        effective_jobs = self._restore_spooled(
+                            stream,
+                            verifier,
+                            spool_path,
+                            codec,
+                            jobs or available_cpus(),
+                            phases,
+                            on_progress,
+                            options,
+                        )
+                    finally:
+                        if not keep_spool:
+                            spool_path.unlink(missing_ok=True)
+
+            if verifier.expected_sha256:
+                logger.info("Download checksum verified")
+
+            # 5. Run validation
+            logger.info("Running validation checks...")
+            with _timed(phases, "validate"):
+                validation = self.validate_restore(metadata)
+            duration = (datetime.now(UTC) - start_time).total_seconds()
+
+            logger.info(
+                f"Restore completed in {duration:.2f}s with {effective_jobs} parallel jobs "
+                f"({wait_seconds:.2f}s waiting for the database)"
+            )
+            logger.info(
+                "Restore phases: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in phases.items())
+            )
+
+            return RestoreResult(
+                success=True,
+                backup_file=backup_file,
+                validation_passed=validation.all_passed,
+                validation_errors=[
+                    c.details for c in validation.checks if not c.passed
+                ],
+                check_seconds=validation.check_seconds(),
+                duration_seconds=duration,
+                wait_seconds=wait_seconds,
+                jobs=effective_jobs,
+                phase_seconds=phases,
+                profile=self.profile.name if self.profile else None,
+            )
+
+        except Exception as e:
+            logger.error(f"Restore failed: {e}")
+            duration = (datetime.now(UTC) - start_time).total_seconds()
+            return RestoreResult(
+                success=False,
+                backup_file=backup_file,
+                validation_passed=False,
+                validation_errors=[str(e)],
+                duration_seconds=duration,
+                wait_seconds=wait_seconds,
+                jobs=effective_jobs,
+                phase_seconds=phases,
+                profile=self.profile.name if self.profile else None,
+                error=str(e),
+            )
+
+        finally:
+            self.close()
+
+    def _restore_spooled(
+        self,
+        stream: Iterator[bytes],
+        verifier: StreamVerifier,
+        spool_path: Path,
+        codec: str | None,
+        jobs: int,
+        phases: dict[str, float],
+        on_progress: ProgressCallback | None,
+        options: dict[str, str] | None = None,
+    ) -> int:
+        """
+        Download a stream to a spool file in the background and restore from it.
+
+        Pre-data is restored from the spool file while it grows; data and
+        post-data follow with parallel jobs once the download is complete
+        and verified.
+
+        Returns:
+            Number of pg_restore jobs of the parallel pass
+        """
+        spool_path.parent.mkdir(parents=True, exist_ok=True)
+        done = threading.Event()
+        cancel = threading.Event()
+        download_errors: list[BaseException] = []
+        download_started = time.monotonic()
+
+        def download() -> None:
+            try:
+                with open(spool_path, "wb") as f:
+                    for chunk in stream:
+                        if cancel.is_set():
+                            return
+                        f.write(chunk)
+                        f.flush()
+                verifier.finish()
+            except BaseException as e:
+                download_errors.append(e)
+            finally:
+                phases["download"] = round(time.monotonic() - download_started, 3)
+                done.set()
+
+        spool_path.touch()
+        downloader = threading.Thread(target=download, name="spool-download", daemon=True)
+        downloader.start()
+
+        try:
+            logger.info(f"Spooling download to {spool_path}, restoring pre-data meanwhile...")
+            with _timed(phases, "pg_restore_pre_data"):
+                run_pg_restore(
+                    self.pg_config,
+                    spool_path,
+                    verbose=True,
+                    codec=codec,
+                    restore_args=["--section=pre-data"],
+                    on_progress=on_progress,
+                    source=_follow_file(spool_path, done),
+                    options=options,
+                )
+        except BaseException as e:
+            cancel.set()
+            downloader.join()
+            # A failed download explains a failed pre-data pass (truncated input)
+            if download_errors:
+                raise download_errors[0] from e
+            raise
+
+        downloader.join()
+        if download_errors:
+            raise download_errors[0]
+
+        effective_jobs = restore_parallelism(spool_path, jobs, codec)
+        logger.info(f"Restoring data and post-data from {spool_path}...")
+        with _timed(phases, "pg_restore"):
+            run_pg_restore(
+                self.pg_config,
+                spool_path,
+                verbose=True,
+                codec=codec,
+                restore_args=["--section=data", "--section=post-data"],
+                on_progress=on_progress,
+                jobs=effective_jobs,
+                options=options,
+            )
+        return effective_jobs
+
+    @staticmethod
+    def _sniff_codec(stream: Iterator[bytes]) -> tuple[Iterator[bytes], str | None]:
+        """Detect the external codec of a stream from its first chunk."""
+        first = next(stream, b"")
+        return itertools.chain([first], stream), codec_from_magic(first)
+
+    def restore_selected(
+        self,
+        backup_path: Path,
+        tables: list[str] | None = None,
+        schemas: list[str] | None = None,
+        sections: list[str] | None = None,
+        metadata_path: Path | None = None,
+        clean: bool = False,
+        on_progress: ProgressCallback | None = None,
+        jobs: int | None = None,
+    ) -> RestoreResult:
+        """
+        Restore selected tables, schemas or sections of a backup.
+
+        The archive's TOC (from the TOC index, or parsed from the archive)
+        is filtered with select_toc_entries(), which adds dependent objects
+        such as indexes, constraints, defaults and owned sequences, and the
+        result is passed to pg_restore -L. Nothing outside the selection is
+        dropped; e.g., tables=["users"] with sections=["data"] reloads the
+        rows of a truncated table.
+
+        Foreign keys are only restored when both of their tables are
+        selected. With clean, only the selected objects are dropped: a
+        selected table still referenced by a foreign key of an unselected
+        table cannot be dropped (select the referencing tables too, or drop
+        those keys first), and a selected table's foreign keys to
+        unselected tables are dropped with it but not recreated.
+
+        Validation runs the catalog checks, and compares row counts only
+        for the tables whose data was restored; the orphan check is skipped.
+
+        Args:
+            backup_path: Path to .dump file, .dir directory (directory-format
+                or sharded) or .manifest
+            tables: Relations to restore ("schema.name" or "name")
+            schemas: Schemas to restore
+            sections: Sections to restore ("pre-data", "data", "post-data");
+                all if empty
+            metadata_path: Optional path to .json metadata
+            clean: Drop the selected objects before recreating them
+                (pg_restore --clean --if-exists; see above for foreign keys)
+            on_progress: Optional callable receiving a ProgressEvent for
+                every object pg_restore finishes
+            jobs: Parallel pg_restore jobs (default: CPUs available to
+                this process); streamed archives always use one
+
+        Returns:
+            RestoreResult with status, validation, effective parallelism
+            and the duration of each step
+        """
+        start_time = datetime.now(UTC)
+        wait_seconds = 0.0
+        phases: dict[str, float] = {}
+        jobs = jobs or available_cpus()
+        effective_jobs = 1
+        logger.info(f"Starting selective restore from: {backup_path}")
+
+        metadata = None
+        if metadata_path and metadata_path.exists():
+            try:
+                metadata = load_metadata(metadata_path)
+            except Exception as e:
+                logger.warning(f"Could not load metadata: {e}")
+
+        try:
+            if not backup_path.exists():
+                raise RestoreError(f"Backup file not found: {backup_path}")
+
+            # 1. Build one pg_restore list per archive file
+            codec = codec_from_metadata(metadata)
+            with _timed(phases, "plan"):
+                plan = self._selective_plan(backup_path, codec, tables, schemas, sections)
+            selected = sum(len(entries) for _, entries in plan)
+            if not selected:
+                raise RestoreError("No TOC entries match the restore filters")
+            logger.info(f"Selected {selected} TOC entries to restore")
+
+            # 2. Wait for database to be ready
+            logger.info("Waiting for database to be ready...")
+            with _timed(phases, "wait_for_database"):
+                readiness = wait_for_postgres(self.pg_config, timeout=60)
+            wait_seconds = readiness.wait_seconds
+            if not readiness.ready:
+                raise RestoreError("Database not ready after timeout")
+
+            # 3. Run pg_restore with each list
+            restore_args = ["--clean", "--if-exists"] if clean else []
+            with _timed(phases, "pg_restore"), self._tuned() as options:
+                for archive_path, entries in plan:
+                    archive_jobs = restore_parallelism(archive_path, jobs, codec) if entries else 1
+                    effective_jobs = max(effective_jobs, archive_jobs)
+                    self._restore_list(
+                        archive_path, entries, codec, restore_args, archive_jobs, on_progress, options
+                    )
+
+            # 4. Run validation (row counts only of the tables whose data was restored)
+            restored_tables = {
+                entry["name"]
+                for _, entries in plan
+                for entry in entries
+                if entry["type"] == "TABLE DATA" and entry["schema"] == "public"
+            }
+            logger.info("Running validation checks...")
+            with _timed(phases, "validate"):
+                validation = self.validate_restore(metadata, restored_tables=restored_tables)
+            duration = (datetime.now(UTC) - start_time).total_seconds()
+
+            logger.info(f"Selective restore completed in {duration:.2f}s ({selected} TOC entries)")
+
+            return RestoreResult(
+                success=True,
+                backup_file=backup_path,
+                validation_passed=validation.all_passed,
+                validation_errors=[
+                    c.details for c in validation.checks if not c.passed
+                ],
+                check_seconds=validation.check_seconds(),
+                duration_seconds=duration,
+                wait_seconds=wait_seconds,
+                jobs=effective_jobs,
+                phase_seconds=phases,
+                profile=self.profile.name if self.profile else None,
+            )
+
+        except Exception as e:
+            logger.error(f"Restore failed: {e}")
+            duration = (datetime.now(UTC) - start_time).total_seconds()
+            return RestoreResult(
+                success=False,
+                backup_file=backup_path,
+                validation_passed=False,
+                validation_errors=[str(e)],
+                duration_seconds=duration,
+                wait_seconds=wait_seconds,
+                jobs=effective_jobs,
+                phase_seconds=phases,
+                profile=self.profile.name if self.profile else None,
+                error=str(e),
+            )
+
+        finally:
+            self.close()
+
+    @staticmethod
+    def _selective_plan(
+        backup_path: Path,
+        codec: str | None,
+        tables: list[str] | None,
+        schemas: list[str] | None,
+        sections: list[str] | None,
+    ) -> list[tuple[Path, list[dict[str, Any]]]]:
+        """
+        Select the TOC entries to restore from each archive file, in restore order.
+
+        A sharded backup is restored like restore_shards() does: pre-data
+        from schema.dump, then the data shards, then post-data from
+        schema.dump again.
+        """
+        def wanted(*names: str) -> list[str]:
+            return [name for name in names if not sections or name in sections]
+
+        if not is_sharded_backup(backup_path):
+            index = load_toc_index(backup_path) or build_toc_index(backup_path, codec)
+            return [(backup_path, select_toc_entries(index_entries(index), tables, schemas, sections))]
+
+        index = load_toc_index(backup_path) or build_shard_toc_index(backup_path)
+        shards = index["shards"]
+        schema_entries = index_entries(shards[SCHEMA_FILE])
+        schema_path = backup_path / SCHEMA_FILE
+        plan = []
+        if pre := wanted("pre-data"):
+            plan.append((schema_path, select_toc_entries(schema_entries, tables, schemas, pre)))
+        if data := wanted("data"):
+            for path in data_shard_files(backup_path):
+                entries = index_entries(shards[path.name])
+                plan.append((path, select_toc_entries(entries, tables, schemas, data)))
+        if post := wanted("post-data"):
+            plan.append((schema_path, select_toc_entries(schema_entries, tables, schemas, post)))
+        return plan
+
+    def _restore_list(
+        self,
+        archive_path: Path,
+        entries: list[dict[str, Any]],
+        codec: str | None,
+        restore_args: list[str],
+        jobs: int,
+        on_progress: ProgressCallback | None,
+        options: dict[str, str] | None = None,
+    ) -> None:
+        """Restore the given TOC entries of one archive with pg_restore -L."""
+        if not entries:
+            return
+        with tempfile.NamedTemporaryFile("w", prefix="restore_", suffix=".list", delete=False) as f:
+            f.write(format_restore_list(entries))
+            list_path = Path(f.name)
+        try:
+            logger.info(f"Restoring {len(entries)} TOC entries from {archive_path.name}")
+            run_pg_restore(
+                self.pg_config,
+                archive_path,
+                verbose=True,
+                codec=codec,
+                restore_args=["-L", str(list_path), *restore_args],
+                on_progress=on_progress,
+                jobs=jobs,
+                options=options,
+            )
+        finally:
+            list_path.unlink(missing_ok=True)
+
+    def restore_physical_backup(
+        self,
+        backup_path: Path,
+        data_dir: Path,
+        metadata_path: Path | None = None,
+        port: int = 5433,
+        pg_bin_dir: Path | None = None,
+        keep_running: bool = False,
+    ) -> RestoreResult:
+        """
+        Restore a physical (pg_basebackup) backup into a fresh data directory.
+
+        Unpacks base.tar and pg_wal.tar, starts a server on the data
+        directory (crash recovery replays the included WAL) and runs the
+        validation checks against it. The configured database is not
+        touched; only its name and credentials are used to connect.
+
+        Args:
+            backup_path: Path to the physical backup .dir directory
+            data_dir: New data directory (must not exist or be empty)
+            metadata_path: Optional path to .json metadata
+            port: Port for the restored server (listens on localhost)
+            pg_bin_dir: Directory with pg_ctl/postgres of the backup's major version
+            keep_running: Leave the server running after validation
+
+        Returns:
+            RestoreResult with status and validation
+        """
+        start_time = datetime.now(UTC)
+        wait_seconds = 0.0
+        logger.info(f"Starting physical restore from: {backup_path}")
+
+        metadata = None
+        if metadata_path and metadata_path.exists():
+            try:
+                metadata = load_metadata(metadata_path)
+            except Exception as e:
+                logger.warning(f"Could not load metadata: {e}")
+
+        started = False
+        session: DatabaseSession | None = None
+
+        try:
+            # 1. Unpack the base backup and its WAL
+            base_archive = self._find_archive(backup_path, "base.tar")
+            if base_archive is None:
+                raise RestoreError(f"No base.tar archive found in: {backup_path}")
+            if data_dir.exists() and any(data_dir.iterdir()):
+                raise RestoreError(f"Data directory is not empty: {data_dir}")
+
+            data_dir.mkdir(parents=True, exist_ok=True)
+            data_dir.chmod(0o700)  # The server refuses group/world-accessible data dirs
+            extract_tar_archive(base_archive, data_dir)
+
+            wal_archive = self._find_archive(backup_path, "pg_wal.tar")
+            if wal_archive is not None:
+                extract_tar_archive(wal_archive, data_dir / "pg_wal")
+
+            # 2. Start the server; it reaches consistency by replaying the WAL
+            start_postgres_server(data_dir, port, pg_bin_dir=pg_bin_dir)
+            started = True
+
+            restored_config = self.pg_config.model_copy(
+                update={"pg_host": "localhost", "pg_port": port}
+            )
+            # Includes WAL replay up to the end of the backup
+            readiness = wait_for_postgres(restored_config, timeout=60)
+            wait_seconds = readiness.wait_seconds
+            if not readiness.ready:
+                raise RestoreError("Restored server not ready after timeout")
+
+            # 3. Validate against the restored server
+            logger.info("Running validation checks...")
+            session = DatabaseSession(restored_config)
+            validation = RestoreManager(
+                restored_config,
+                session=session,
+                validation_workers=self.validation_workers,
+                check_timeout=self.check_timeout,
+                parallel_query_workers=self.parallel_query_workers,
+            ).validate_restore(metadata)
+            duration = (datetime.now(UTC) - start_time).total_seconds()
+
+            logger.info(
+                f"Physical restore completed in {duration:.2f}s ({wait_seconds:.2f}s until the server was ready)"
+            )
+
+            return RestoreResult(
+                success=True,
+                backup_file=backup_path,
+                validation_passed=validation.all_passed,
+                validation_errors=[
+                    c.details for c in validation.checks if not c.passed
+                ],
+                check_seconds=validation.check_seconds(),
+                duration_seconds=duration,
+                wait_seconds=wait_seconds,
+            )
+
+        except Exception as e:
+            logger.error(f"Physical restore failed: {e}")
+            duration = (datetime.now(UTC) - start_time).total_seconds()
+            return RestoreResult(
+                success=False,
+                backup_file=backup_path,
+                validation_passed=False,
+                validation_errors=[str(e)],
+                duration_seconds=duration,
+                wait_seconds=wait_seconds,
                 error=str(e),
             )
 
-    def validate_restore(self, metadata: dict | None = None) -> ValidationReport:
+        finally:
+            if session:
+                session.close()
+            if started and not keep_running:
+                stop_postgres_server(data_dir, pg_bin_dir=pg_bin_dir)
+
+    @staticmethod
+    def _log_archive_header(archive_path: Path, codec: str | None) -> None:
+        """Log where and when an archive was dumped (pre-flight, reads only its header)."""
+        try:
+            header = read_archive_header(archive_path, codec)
+        except (ArchiveFormatError, ChunkStoreError, OSError) as e:
+            logger.debug(f"Could not read archive header: {e}")
+            return
+        logger.info(
+            f"Archive: {header.format} format {header.version_str}, {header.compression} compression, "
+            f"dumped {header.created or 'at unknown time'} from PostgreSQL {header.server_version} "
+            f"(pg_dump {header.dump_version})"
+        )
+
+    @staticmethod
+    def _log_restore_plan(index: dict) -> None:
+        """Log what a restore will load, from the backup's TOC index."""
+        entries = index_entries(index)
+        data = [e for e in entries if e["section"] == "data" and e["length"]]
+        data_bytes = sum(e["length"] for e in data)
+        logger.info(
+            f"Restore plan: {len(entries)} TOC entries, {len(data)} data entries "
+            f"({data_bytes / (1024 * 1024):.1f} MB archived data)"
+        )
+        for entry in sorted(data, key=lambda e: e["length"], reverse=True)[:5]:
+            logger.debug(f"  {entry['schema']}.{entry['name']}: {entry['length']} bytes")
+
+    @staticmethod
+    def _find_archive(backup_path: Path, name: str) -> Path | None:
+        """Find a tar archive in a physical backup, with or without compression suffix."""
+        for suffix in ("", ".zst", ".lz4", ".gz"):
+            candidate = backup_path / f"{name}{suffix}"
+            if candidate.is_file():
+                return candidate
+        return None
+
+    @staticmethod
+    def is_physical_backup(backup_path: Path) -> bool:
+        """Check whether a backup path is a physical (pg_basebackup) backup."""
+        return backup_path.is_dir() and RestoreManager._find_archive(backup_path, "base.tar") is not None
+
+    def validate_restore(
+        self, metadata: dict | None = None, restored_tables: set[str] | None = None
+    ) -> ValidationReport:
         """
         Run 9-point validation system.
 
@@ -217,41 +1140,67 @@ class RestoreManager:
 
         Args:
             metadata: Optional metadata dict for comparison
+            restored_tables: Tables whose data a selective restore loaded;
+                if given, only their row counts are compared and the
+                orphan check is skipped (the other tables were not restored)
 
         Returns:
             ValidationReport with all check results
         """
         report = ValidationReport()
 
-        # Check 1: Migration version match
-        report.add_check(self._check_migration_version(metadata))
+        # Checks 1-6 are evaluated from one catalog snapshot
+        started = time.monotonic()
+        try:
+            catalog = self._read_catalog()
+            logger.debug(f"Read catalog snapshot in {time.monotonic() - started:.3f}s")
+        except Exception as e:
+            logger.error(f"Could not read catalog: {e}")
+            for check_name in CATALOG_CHECKS:
+                report.add_check(
+                    ValidationResult(
+                        check_name=check_name,
+                        passed=False,
+                        details=f"Failed to check: {e}",
+                        duration_seconds=time.monotonic() - started,
+                    )
+                )
+        else:
+            # Check 1: Migration version match
+            report.add_check(self._check_migration_version(catalog, metadata))
+
+            # Check 2: Migration dirty flag
+            report.add_check(self._check_migration_dirty(catalog))
 
-        # Check 2: Migration dirty flag
-        report.add_check(self._check_migration_dirty(metadata))
+            # Check 3: Tables exist
+            report.add_check(self._check_tables_exist(catalog))
 
-        # Check 3: Tables exist
-        report.add_check(self._check_tables_exist())
+            # Check 4: ENUM types exist
+            report.add_check(self._check_enums_exist(catalog))
 
-        # Check 4: ENUM types exist
-        report.add_check(self._check_enums_exist())
+            # Check 5: Indexes present
+            report.add_check(self._check_indexes(catalog))
 
-        # Check 5: Indexes present
-        report.add_check(self._check_indexes())
+            # Check 6: Foreign keys present
+            report.add_check(self._check_foreign_keys(catalog))
 
-        # Check 6: Foreign keys present
-        report.add_check(self._check_foreign_keys())
+            # Checks 1-6 share the wall time of the catalog query
+            for result in report.checks:
+                result.duration_seconds = time.monotonic() - started
 
         # Check 7: Row counts match (if metadata available)
-        if metadata and "table_counts" in metadata:
-            report.add_check(self._check_row_counts(metadata["table_counts"]))
-        else:
+        count_mode = (metadata or {}).get("table_count_mode", "exact")
+        if count_mode == "skip":
+            logger.info("Skipping row count check (counts not recorded at backup time)")
+        elif not (metadata and "table_counts" in metadata):
             logger.info("Skipping row count check (no metadata)")
 
         # Check 8: API health (optional - skipped in this implementation)
         logger.info("Skipping API health check (not configured)")
 
-        # Check 9: Orphaned records (basic check)
-        report.add_check(self._check_orphans())
+        # Checks 7 and 9 scan table data and run concurrently
+        for result in self._run_data_checks(metadata, count_mode, restored_tables):
+            report.add_check(result)
 
         return report
 
@@ -265,228 +1214,308 @@ class RestoreManager:
         """
 
         try:
-            run_psql(self.pg_config, query)
+            self.session.execute(query)
             logger.info("Schema dropped and recreated")
         except Exception as e:
             logger.warning(f"Could not drop schema: {e}")
 
-    def _check_migration_version(self, metadata: dict | None) -> ValidationResult:
-        """Check 1: Migration version matches metadata."""
-        try:
-            query = "SELECT version FROM schema_migrations LIMIT 1;"
-            result = run_psql(self.pg_config, query)
-
-            if result.success and result.stdout.strip():
-                version = int(result.stdout.strip())
-
-                if metadata and "migration_info" in metadata:
-                    expected = metadata["migration_info"]["version"]
-                    if version == expected:
-                        return ValidationResult(
-                            check_name="Migration Version",
-                            passed=True,
-                            details=f"Version {version} matches expected",
-                            expected=expected,
-                            actual=version,
-                        )
-                    else:
-                        return ValidationResult(
-                            check_name="Migration Version",
-                            passed=False,
-                            details=f"Version {version} does not match expected {expected}",
-                            expected=expected,
-                            actual=version,
-                        )
-                else:
-                    return ValidationResult(
-                        check_name="Migration Version",
-                        passed=True,
-                        details=f"Version {version} (no metadata to compare)",
-                    )
+    def _read_catalog(self) -> CatalogSnapshot:
+        """
+        Read the catalog facts of checks 1-6 in one query.
 
+        Raises:
+            DatabaseError: If the query fails
+        """
+        row = self.session.fetch_one(CATALOG_QUERY)
+        if row is None:
+            raise DatabaseError("Catalog query returned no row")
+
+        has_migrations, version, dirty, tables, enums, index_count, fk_count = row
+        return CatalogSnapshot(
+            has_migrations=bool(has_migrations),
+            migration_version=int(version) if version not in (None, "") else None,
+            migration_dirty={"true": True, "false": False}.get(dirty or ""),
+            tables=list(tables),
+            enums=list(enums),
+            index_count=int(index_count),
+            foreign_key_count=int(fk_count),
+        )
+
+    def _check_migration_version(
+        self,
+        catalog: CatalogSnapshot,
+        metadata: dict | None,
+    ) -> ValidationResult:
+        """Check 1: Migration version matches metadata."""
+        if not catalog.has_migrations:
             return ValidationResult(
                 check_name="Migration Version",
                 passed=False,
-                details="No migration version found",
+                details="schema_migrations table not found",
             )
 
-        except Exception as e:
+        version = catalog.migration_version
+        if version is None:
             return ValidationResult(
                 check_name="Migration Version",
                 passed=False,
-                details=f"Failed to check: {e}",
+                details="No migration version found",
             )
 
-    def _check_migration_dirty(self, metadata: dict | None) -> ValidationResult:
-        """Check 2: Migration is not dirty."""
-        try:
-            query = "SELECT dirty FROM schema_migrations LIMIT 1;"
-            result = run_psql(self.pg_config, query)
-
-            if result.success and result.stdout.strip():
-                dirty = result.stdout.strip().lower() in ["t", "true", "1"]
+        if metadata and "migration_info" in metadata:
+            expected = metadata["migration_info"]["version"]
+            if version == expected:
+                return ValidationResult(
+                    check_name="Migration Version",
+                    passed=True,
+                    details=f"Version {version} matches expected",
+                    expected=expected,
+                    actual=version,
+                )
+            else:
+                return ValidationResult(
+                    check_name="Migration Version",
+                    passed=False,
+                    details=f"Version {version} does not match expected {expected}",
+                    expected=expected,
+                    actual=version,
+                )
 
-                if not dirty:
-                    return ValidationResult(
-                        check_name="Migration Dirty Flag",
-                        passed=True,
-                        details="Migration is clean",
-                    )
-                else:
-                    return ValidationResult(
-                        check_name="Migration Dirty Flag",
-                        passed=False,
-                        details="Migration is dirty - pending migrations",
-                    )
+        return ValidationResult(
+            check_name="Migration Version",
+            passed=True,
+            details=f"Version {version} (no metadata to compare)",
+        )
 
+    def _check_migration_dirty(self, catalog: CatalogSnapshot) -> ValidationResult:
+        """Check 2: Migration is not dirty."""
+        if catalog.migration_dirty is None:
             return ValidationResult(
                 check_name="Migration Dirty Flag",
                 passed=False,
                 details="Could not determine dirty status",
             )
 
-        except Exception as e:
+        if not catalog.migration_dirty:
+            return ValidationResult(
+                check_name="Migration Dirty Flag",
+                passed=True,
+                details="Migration is clean",
+            )
+        else:
             return ValidationResult(
                 check_name="Migration Dirty Flag",
                 passed=False,
-                details=f"Failed to check: {e}",
+                details="Migration is dirty - pending migrations",
             )
 
-    def _check_tables_exist(self) -> ValidationResult:
+    def _check_tables_exist(self, catalog: CatalogSnapshot) -> ValidationResult:
         """Check 3: All expected tables exist."""
-        try:
-            tables_list = self._get_tables_list()
-            missing = [t for t in self.EXPECTED_TABLES if t not in tables_list]
+        missing = [t for t in self.EXPECTED_TABLES if t not in catalog.tables]
 
-            if not missing:
-                return ValidationResult(
-                    check_name="Tables Exist",
-                    passed=True,
-                    details=f"All {len(self.EXPECTED_TABLES)} expected tables present",
-                )
-            else:
-                return ValidationResult(
-                    check_name="Tables Exist",
-                    passed=False,
-                    details=f"Missing tables: {missing}",
-                )
-
-        except Exception as e:
+        if not missing:
+            return ValidationResult(
+                check_name="Tables Exist",
+                passed=True,
+                details=f"All {len(self.EXPECTED_TABLES)} expected tables present",
+            )
+        else:
             return ValidationResult(
                 check_name="Tables Exist",
                 passed=False,
-                details=f"Failed to check: {e}",
+                details=f"Missing tables: {missing}",
             )
 
-    def _check_enums_exist(self) -> ValidationResult:
+    def _check_enums_exist(self, catalog: CatalogSnapshot) -> ValidationResult:
         """Check 4: All expected ENUM types exist."""
-        try:
-            enums_list = self._get_enums_list()
-            missing = [e for e in self.EXPECTED_ENUMS if e not in enums_list]
+        missing = [e for e in self.EXPECTED_ENUMS if e not in catalog.enums]
 
-            if not missing:
-                return ValidationResult(
-                    check_name="ENUM Types Exist",
-                    passed=True,
-                    details=f"All {len(self.EXPECTED_ENUMS)} expected ENUMs present",
-                )
-            else:
-                return ValidationResult(
-                    check_name="ENUM Types Exist",
-                    passed=False,
-                    details=f"Missing ENUMs: {missing}",
-                )
-
-        except Exception as e:
+        if not missing:
+            return ValidationResult(
+                check_name="ENUM Types Exist",
+                passed=True,
+                details=f"All {len(self.EXPECTED_ENUMS)} expected ENUMs present",
+            )
+        else:
             return ValidationResult(
                 check_name="ENUM Types Exist",
                 passed=False,
-                details=f"Failed to check: {e}",
+                details=f"Missing ENUMs: {missing}",
             )
 
-    def _check_indexes(self) -> ValidationResult:
+    def _check_indexes(self, catalog: CatalogSnapshot) -> ValidationResult:
         """Check 5: Indexes are present."""
-        try:
-            query = "SELECT COUNT(*) FROM pg_indexes WHERE schemaname = 'public';"
-            result = run_psql(self.pg_config, query)
+        return ValidationResult(
+            check_name="Indexes Present",
+            passed=catalog.index_count > 0,
+            details=f"Found {catalog.index_count} indexes in database",
+        )
 
-            if result.success and result.stdout.strip():
-                count = int(result.stdout.strip())
-                return ValidationResult(
-                    check_name="Indexes Present",
-                    passed=count > 0,
-                    details=f"Found {count} indexes in database",
-                )
+    def _check_foreign_keys(self, catalog: CatalogSnapshot) -> ValidationResult:
+        """Check 6: Foreign key constraints are present."""
+        return ValidationResult(
+            check_name="Foreign Keys Present",
+            passed=True,  # Any count is OK, the catalog was readable
+            details=f"Found {catalog.foreign_key_count} foreign key constraints",
+        )
+
+    def _run_data_checks(
+        self, metadata: dict | None, count_mode: str, restored_tables: set[str] | None = None
+    ) -> list[ValidationResult]:
+        """
+        Run the table-scanning checks (7 and 9) on a bounded thread pool.
 
-            return ValidationResult(
-                check_name="Indexes Present",
-                passed=False,
-                details="Could not count indexes",
-            )
+        Every worker thread uses its own connection, so the per-table
+        COUNT(*) queries and the orphan query scan tables concurrently.
+        The wall time of a check is measured from the start of this phase
+        to the completion of its last query.
 
-        except Exception as e:
-            return ValidationResult(
-                check_name="Indexes Present",
-                passed=False,
-                details=f"Failed to check: {e}",
-            )
+        Args:
+            metadata: Optional metadata dict with recorded table counts
+            count_mode: How the recorded counts were taken (exact/estimate)
+            restored_tables: Only count these tables and skip the orphan
+                check (selective restores); all tables if None
 
-    def _check_foreign_keys(self) -> ValidationResult:
-        """Check 6: Foreign key constraints are present."""
-        try:
-            query = """
-                SELECT COUNT(*)
-                FROM information_schema.table_constraints
-                WHERE constraint_type = 'FOREIGN KEY'
-                AND table_schema = 'public';
-            """
-            result = run_psql(self.pg_config, query)
-
-            if result.success and result.stdout.strip():
-                count = int(result.stdout.strip())
-                return ValidationResult(
-                    check_name="Foreign Keys Present",
-                    passed=count >= 0,  # Any count is OK, just checking query works
-                    details=f"Found {count} foreign key constraints",
+        Returns:
+            Results of the row count check (if counts were recorded) and
+            the orphan check, in check order
+        """
+        counts = (metadata or {}).get("table_counts") if count_mode != "skip" else None
+        if counts is not None and restored_tables is not None:
+            counts = {table: count for table, count in counts.items() if table in restored_tables}
+        if restored_tables is not None and not counts:
+            logger.info("Skipping data checks (no restored table has a recorded row count)")
+            return []
+        local = threading.local()
+        sessions: list[DatabaseSession] = []
+        lock = threading.Lock()
+
+        def worker_session() -> DatabaseSession:
+            session: DatabaseSession | None = getattr(local, "session", None)
+            if session is None:
+                session = DatabaseSession(
+                    self.pg_config,
+                    database=self.session.database,
+                    application_name="backup-postgres-validate",
                 )
+                with lock:
+                    sessions.append(session)
+                session.execute(self._validation_settings())
+                local.session = session
+            return session
 
-            return ValidationResult(
-                check_name="Foreign Keys Present",
-                passed=False,
-                details="Could not count foreign keys",
-            )
+        def timed(func: Any, *args: Any) -> tuple[Any, float]:
+            try:
+                return func(worker_session(), *args), time.monotonic()
+            except Exception as e:
+                return e, time.monotonic()
+
+        workers = max(1, self.validation_workers)
+        logger.info(
+            f"Running data checks on {workers} connections "
+            f"(query timeout {self.check_timeout:g}s, "
+            f"{self.parallel_query_workers or 'default'} parallel query workers)"
+        )
+        started = time.monotonic()
+        results: list[ValidationResult] = []
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="validate") as pool:
+                # The orphan query is a single long scan: start it first
+                orphans = pool.submit(timed, self._query_orphans) if restored_tables is None else None
+                tables = {
+                    table: pool.submit(timed, self._count_rows, table) for table in counts or {}
+                }
 
-        except Exception as e:
-            return ValidationResult(
-                check_name="Foreign Keys Present",
-                passed=False,
-                details=f"Failed to check: {e}",
+                if counts is not None:
+                    outcomes = {table: future.result() for table, future in tables.items()}
+                    result = self._check_row_counts(
+                        counts, {table: value for table, (value, _) in outcomes.items()}, count_mode
+                    )
+                    finished = max((end for _, end in outcomes.values()), default=started)
+                    result.duration_seconds = finished - started
+                    results.append(result)
+
+                if orphans is not None:
+                    value, finished = orphans.result()
+                    result = self._check_orphans(value)
+                    result.duration_seconds = finished - started
+                    results.append(result)
+        finally:
+            for session in sessions:
+                session.close()
+
+        for result in results:
+            logger.info(f"{result.check_name} took {result.duration_seconds:.2f}s")
+        return results
+
+    def _validation_settings(self) -> sql.Composed:
+        """Session settings of the data check connections."""
+        statements = [
+            sql.SQL("SET statement_timeout = {}").format(
+                sql.Literal(f"{int(self.check_timeout * 1000)}ms")
             )
+        ]
+        if self.parallel_query_workers > 0:
+            statements.append(
+                sql.SQL("SET max_parallel_workers_per_gather = {}").format(
+                    sql.Literal(self.parallel_query_workers)
+                )
+            )
+        return sql.SQL("; ").join(statements)
+
+    @staticmethod
+    def _count_rows(session: DatabaseSession, table: str) -> int:
+        """Count the rows of a restored table."""
+        query = sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(table))
+        count: int = session.fetch_value(query)
+        return count
+
+    @staticmethod
+    def _query_orphans(session: DatabaseSession) -> int | None:
+        """Count orphaned records of the common FK relationships."""
+        count: int | None = session.fetch_value(ORPHAN_QUERY)
+        return count
+
+    def _check_row_counts(
+        self,
+        metadata_counts: dict,
+        actual_counts: dict[str, int | Exception],
+        count_mode: str = "exact",
+    ) -> ValidationResult:
+        """
+        Check 7: Row counts match metadata.
 
-    def _check_row_counts(self, metadata_counts: dict) -> ValidationResult:
-        """Check 7: Row counts match metadata."""
+        Exact counts must match exactly; estimated counts must be within
+        ESTIMATE_TOLERANCE (or ESTIMATE_MIN_SLACK rows) of the restored count.
+        A table whose count query hit the timeout, or that has no count at
+        all, is reported as a mismatch.
+        """
         try:
             mismatches = []
 
             for table, expected_count in metadata_counts.items():
-                try:
-                    query = f'SELECT COUNT(*) FROM "{table}";'
-                    result = run_psql(self.pg_config, query)
-
-                    if result.success and result.stdout.strip():
-                        actual_count = int(result.stdout.strip())
-                        if actual_count != expected_count:
-                            mismatches.append(
-                                f"{table}: expected {expected_count}, got {actual_count}"
-                            )
-                except Exception:
-                    pass  # Table might not exist
+                actual_count = actual_counts.get(table)
+                if isinstance(actual_count, Exception):
+                    if _is_timeout(actual_count):
+                        mismatches.append(f"{table}: count timed out after {self.check_timeout:g}s")
+                    continue  # Table might not exist
+                if not isinstance(actual_count, int):
+                    mismatches.append(f"{table}: expected {expected_count}, got no count")
+                    continue
+
+                if not self._row_count_matches(expected_count, actual_count, count_mode):
+                    mismatches.append(
+                        f"{table}: expected {expected_count}, got {actual_count}"
+                    )
 
             if not mismatches:
+                details = "All row counts match metadata"
+                if count_mode == "estimate":
+                    details = "All row counts within tolerance of estimated counts"
                 return ValidationResult(
                     check_name="Row Counts Match",
                     passed=True,
-                    details="All row counts match metadata",
+                    details=details,
                 )
             else:
                 return ValidationResult(
@@ -502,65 +1531,32 @@ class RestoreManager:
                 details=f"Failed to check: {e}",
             )
 
-    def _check_orphans(self) -> ValidationResult:
-        """Check 9: Basic orphaned record check."""
-        try:
-            # Basic check: look for common orphan patterns
-            # This is a simplified check - full implementation would check all FK relationships
-            query = """
-                SELECT
-                    (SELECT COUNT(*) FROM clients WHERE user_id NOT IN (SELECT id FROM users WHERE id IS NOT NULL)) +
-                    (SELECT COUNT(*) FROM ioc_scans WHERE ioc_id NOT IN (SELECT id FROM ioc WHERE id IS NOT NULL))
-                AS orphan_count;
-            """
-            result = run_psql(self.pg_config, query)
-
-            if result.success and result.stdout.strip():
-                count = int(result.stdout.strip())
-                return ValidationResult(
-                    check_name="Orphaned Records",
-                    passed=count == 0,
-                    details=f"Found {count} orphaned records",
-                )
+    def _row_count_matches(self, expected: int, actual: int, count_mode: str) -> bool:
+        """Compare a restored row count against the recorded one."""
+        if count_mode != "estimate":
+            return actual == expected
+        slack = max(expected * self.ESTIMATE_TOLERANCE, self.ESTIMATE_MIN_SLACK)
+        return abs(actual - expected) <= slack
 
+    def _check_orphans(self, count: int | None | Exception) -> ValidationResult:
+        """Check 9: Basic orphaned record check."""
+        if isinstance(count, Exception):
+            # Don't fail on this check - it's optional
             return ValidationResult(
                 check_name="Orphaned Records",
                 passed=True,
-                details="Could not check orphans (query may not apply)",
+                details=f"Orphan check skipped: {count}",
             )
 
-        except Exception as e:
-            # Don't fail on this check - it's optional
+        if count is not None:
             return ValidationResult(
                 check_name="Orphaned Records",
-                passed=True,
-                details=f"Orphan check skipped: {e}",
+                passed=count == 0,
+                details=f"Found {count} orphaned records",
             )
 
-    def _get_tables_list(self) -> list[str]:
-        """Get list of tables in public schema."""
-        query = """
-            SELECT tablename
-            FROM pg_tables
-            WHERE schemaname = 'public'
-            ORDER BY tablename;
-        """
-        result = run_psql(self.pg_config, query)
-
-        if result.success:
-            return [line.strip() for line in result.stdout.strip().split("\n") if line.strip()]
-        return []
-
-    def _get_enums_list(self) -> list[str]:
-        """Get list of ENUM types."""
-        query = """
-            SELECT typname
-            FROM pg_type
-            WHERE typtype = 'e'
-            ORDER BY typname;
-        """
-        result = run_psql(self.pg_config, query)
-
-        if result.success:
-            return [line.strip() for line in result.stdout.strip().split("\n") if line.strip()]
-        return []
+        return ValidationResult(
+            check_name="Orphaned Records",
+            passed=True,
+            details="Could not check orphans (query may not apply)",
+        )
@@ -5,15 +5,28 @@ Maintains the same retention logic as cleanup.sh:
 - Daily: Keep 7 most recent
 - Weekly: Keep 4 most recent
 - Manual: No automatic cleanup
+- Physical: Keep BACKUP_RETENTION_PHYSICAL most recent (enforced separately)
+
+Chunks of chunked backups that no remaining manifest references are
+garbage-collected after the logical backups have been pruned.
 """
 
 import logging
+import shutil
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List
 
 from backup_postgres.config.settings import BackupConfig
-from backup_postgres.utils.exceptions import RetentionError
+from backup_postgres.core.metadata import list_backup_paths
+from backup_postgres.utils.chunking import (
+    CHUNK_DIR_NAME,
+    MANIFEST_SUFFIX,
+    ChunkStore,
+    referenced_chunks,
+)
+from backup_postgres.utils.exceptions import ChunkStoreError, RetentionError
+from backup_postgres.utils.toc import toc_index_path
 
 logger = logging.getLogger(__name__)
 
@@ -24,21 +37,27 @@ class RetentionReport:
 
     removed_daily: List[Path] = field(default_factory=list)
     removed_weekly: List[Path] = field(default_factory=list)
+    removed_physical: List[Path] = field(default_factory=list)
     kept_daily: int = 0
     kept_weekly: int = 0
+    kept_physical: int = 0
+    removed_chunks: int = 0
 
     @property
     def total_removed(self) -> int:
         """Total number of files removed."""
-        return len(self.removed_daily) + len(self.removed_weekly)
+        return len(self.removed_daily) + len(self.removed_weekly) + len(self.removed_physical)
 
     def to_dict(self) -> dict:
         """Convert to dictionary."""
         return {
             "removed_daily": [str(p) for p in self.removed_daily],
             "removed_weekly": [str(p) for p in self.removed_weekly],
+            "removed_physical": [str(p) for p in self.removed_physical],
             "kept_daily": self.kept_daily,
             "kept_weekly": self.kept_weekly,
+            "kept_physical": self.kept_physical,
+            "removed_chunks": self.removed_chunks,
             "total_removed": self.total_removed,
         }
 
@@ -51,6 +70,7 @@ class RetentionPolicy:
     - Daily: Keep 7 most recent
     - Weekly: Keep 4 most recent
     - Manual: No automatic cleanup
+    - Physical: Keep BACKUP_RETENTION_PHYSICAL most recent
     """
 
     def __init__(self, config: BackupConfig) -> None:
@@ -66,13 +86,17 @@ class RetentionPolicy:
         self.daily_dir = config.daily_dir
         self.weekly_dir = config.weekly_dir
         self.manual_dir = config.manual_dir
+        self.chunk_dir = config.daily_dir.parent / CHUNK_DIR_NAME
+        # Physical backups are pruned only by enforce_physical_retention()
+        self.retention_physical = config.retention_physical
+        self.physical_dir = config.physical_dir
 
     def enforce_retention(self) -> RetentionReport:
         """
         Enforce retention policy on local backups.
 
         Removes oldest backups exceeding retention limits.
-        Both .dump and .json files are removed together.
+        Both .dump (or .dir) and .json files are removed together.
 
         Returns:
             RetentionReport with details of actions taken
@@ -104,9 +128,65 @@ class RetentionPolicy:
             logger.error(f"Failed to clean weekly backups: {e}")
             raise RetentionError(f"Weekly cleanup failed: {e}") from e
 
+        report.removed_chunks = self.collect_chunk_garbage()
+
         logger.info(f"Retention enforcement complete: {report.total_removed // 2} backups removed")
         return report
 
+    def enforce_physical_retention(self) -> RetentionReport:
+        """
+        Enforce retention policy on local physical backups.
+
+        Physical backups run on their own schedule, so they are pruned
+        separately from the logical daily/weekly backups.
+
+        Returns:
+            RetentionReport with details of actions taken
+
+        Raises:
+            RetentionError: If cleanup fails
+        """
+        report = RetentionReport()
+
+        try:
+            removed = self._cleanup_directory(self.physical_dir, self.retention_physical)
+            report.removed_physical = removed
+            report.kept_physical = self._count_backups(self.physical_dir)
+            logger.info(f"Physical retention: removed {len(removed) // 2} backups")
+        except Exception as e:
+            logger.error(f"Failed to clean physical backups: {e}")
+            raise RetentionError(f"Physical cleanup failed: {e}") from e
+
+        return report
+
+    def collect_chunk_garbage(self) -> int:
+        """
+        Remove chunks no longer referenced by any chunked backup.
+
+        Manifests of all logical backup types (including manual backups,
+        which are never pruned) keep their chunks alive. If any manifest
+        cannot be read, nothing is removed.
+
+        Returns:
+            Number of chunks removed
+        """
+        if not self.chunk_dir.exists():
+            return 0
+
+        manifests = [
+            path
+            for directory in (self.daily_dir, self.weekly_dir, self.manual_dir)
+            for path in list_backup_paths(directory)
+            if path.suffix == MANIFEST_SUFFIX
+        ]
+        try:
+            referenced = referenced_chunks(manifests)
+        except ChunkStoreError as e:
+            logger.error(f"Skipping chunk garbage collection: {e}")
+            return 0
+
+        return ChunkStore(self.chunk_dir).collect_garbage(referenced)
+
     def _cleanup_directory(self, directory: Path, retention: int) -> List[Path]:
         """
         Remove oldest backups exceeding retention limit.
@@ -116,14 +196,14 @@ class RetentionPolicy:
             retention: Number of backups to keep
 
         Returns:
-            List of removed file paths (both .dump and .json)
+            List of removed file paths (.dump/.dir, .json and .toc.json)
         """
         if not directory.exists():
             logger.warning(f"Directory does not exist: {directory}")
             return []
 
-        # Get all .dump files sorted by name (which includes timestamp)
-        dump_files = sorted(directory.glob("*.dump"))
+        # Get all backups sorted by name (which includes timestamp)
+        dump_files = list_backup_paths(directory)
 
         if len(dump_files) <= retention:
             logger.debug(f"No cleanup needed for {directory}: {len(dump_files)} <= {retention}")
@@ -135,8 +215,11 @@ class RetentionPolicy:
 
         for dump_file in to_remove:
             try:
-                # Remove .dump file
-                dump_file.unlink()
+                # Remove .dump file (or the whole .dir directory-format backup)
+                if dump_file.is_dir():
+                    shutil.rmtree(dump_file)
+                else:
+                    dump_file.unlink()
                 removed.append(dump_file)
                 logger.debug(f"Removed: {dump_file}")
 
@@ -149,6 +232,12 @@ class RetentionPolicy:
                 else:
                     logger.warning(f"Metadata file not found: {json_file}")
 
+                # Remove the TOC index sidecar, if any
+                index_file = toc_index_path(dump_file)
+                if index_file.exists():
+                    index_file.unlink()
+                    removed.append(index_file)
+
             except OSError as e:
                 logger.error(f"Failed to remove {dump_file}: {e}")
                 # Continue with other files
@@ -163,18 +252,16 @@ class RetentionPolicy:
             directory: Directory to count
 
         Returns:
-            Number of .dump files
+            Number of backups (.dump/.manifest files and .dir directories)
         """
-        if not directory.exists():
-            return 0
-        return len(list(directory.glob("*.dump")))
+        return len(list_backup_paths(directory))
 
     def get_backup_count(self, backup_type: str) -> int:
         """
         Get number of backups for a given type.
 
         Args:
-            backup_type: Type of backup ("daily", "weekly", "manual")
+            backup_type: Type of backup ("daily", "weekly", "manual", "physical")
 
         Returns:
             Number of backups
@@ -188,6 +275,8 @@ class RetentionPolicy:
             return self._count_backups(self.weekly_dir)
         elif backup_type == "manual":
             return self._count_backups(self.manual_dir)
+        elif backup_type == "physical":
+            return self._count_backups(self.physical_dir)
         else:
             raise ValueError(f"Invalid backup type: {backup_type}")
 
@@ -196,7 +285,7 @@ class RetentionPolicy:
         List backups for a given type.
 
         Args:
-            backup_type: Type of backup ("daily", "weekly", "manual")
+            backup_type: Type of backup ("daily", "weekly", "manual", "physical")
 
         Returns:
             Sorted list of backup file paths
@@ -210,10 +299,9 @@ class RetentionPolicy:
             directory = self.weekly_dir
         elif backup_type == "manual":
             directory = self.manual_dir
+        elif backup_type == "physical":
+            directory = self.physical_dir
         else:
             raise ValueError(f"Invalid backup type: {backup_type}")
 
-        if not directory.exists():
-            return []
-
-        return sorted(directory.glob("*.dump"))
+        return list_backup_paths(directory)
@@ -0,0 +1,146 @@
+"""
+Backup source routing.
+
+Picks the server a logical backup is dumped from: the least-loaded
+streaming replica whose replay lag is under a ceiling, or the primary if
+no replica qualifies. Dumping from a replica keeps pg_dump's long-running
+reads off the primary.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from backup_postgres.config.settings import PostgresConfig
+from backup_postgres.utils.database import DatabaseSession
+from backup_postgres.utils.exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+# Recovery state, replay lag and load of a server in one round trip.
+# A replica that has replayed everything it received is not lagging, even
+# if the primary has been idle since the last replayed transaction.
+PROBE_QUERY = """
+    SELECT
+        pg_is_in_recovery(),
+        CASE
+            WHEN NOT pg_is_in_recovery() THEN 0
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+        END,
+        (SELECT count(*) FROM pg_stat_activity
+         WHERE state = 'active' AND backend_type = 'client backend'
+         AND pid <> pg_backend_pid());
+"""
+
+
+@dataclass
+class HostStatus:
+    """Probe result of one candidate host."""
+
+    host: str
+    port: int
+    in_recovery: bool = False
+    lag_seconds: float = 0.0
+    active_connections: int = 0
+    error: str | None = None
+
+
+@dataclass
+class BackupSource:
+    """Server chosen to take a backup from."""
+
+    config: PostgresConfig
+    is_replica: bool = False
+    lag_seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON metadata."""
+        return {
+            "host": self.config.pg_host,
+            "port": self.config.pg_port,
+            "role": "replica" if self.is_replica else "primary",
+            "replay_lag_seconds": round(self.lag_seconds, 2),
+        }
+
+
+def probe_host(config: PostgresConfig, host: str, port: int) -> HostStatus:
+    """
+    Query the recovery state, replay lag and load of a host.
+
+    Args:
+        config: PostgreSQL configuration (credentials and database)
+        host: Host to probe
+        port: Port to probe
+
+    Returns:
+        HostStatus (with error set if the host could not be queried)
+    """
+    host_config = config.model_copy(update={"pg_host": host, "pg_port": port})
+    with DatabaseSession(host_config, application_name="backup-postgres-probe") as session:
+        try:
+            row = session.fetch_one(PROBE_QUERY)
+        except DatabaseError as e:
+            return HostStatus(host=host, port=port, error=str(e))
+
+    in_recovery, lag, active = row  # type: ignore[misc]
+    return HostStatus(
+        host=host,
+        port=port,
+        in_recovery=bool(in_recovery),
+        lag_seconds=float(lag),
+        active_connections=int(active),
+    )
+
+
+def select_backup_source(config: PostgresConfig) -> BackupSource:
+    """
+    Choose the server to dump from.
+
+    Every configured replica is probed; among those that are in recovery
+    and lag at most config.replica_max_lag_seconds, the one with the
+    fewest active queries (then the smallest lag) is chosen. Without a
+    qualifying replica the backup is taken from the primary.
+
+    Args:
+        config: PostgreSQL configuration with the candidate replicas
+
+    Returns:
+        BackupSource with the connection configuration to use
+    """
+    candidates = config.replica_hosts
+    if not candidates:
+        return BackupSource(config=config)
+
+    eligible: list[HostStatus] = []
+    for host, port in candidates:
+        status = probe_host(config, host, port)
+        if status.error:
+            logger.warning(f"Replica {host}:{port} unavailable: {status.error}")
+        elif not status.in_recovery:
+            logger.warning(f"{host}:{port} is not in recovery, not using it as a replica")
+        elif status.lag_seconds > config.replica_max_lag_seconds:
+            logger.warning(
+                f"Replica {host}:{port} lags {status.lag_seconds:.0f}s "
+                f"(limit {config.replica_max_lag_seconds}s)"
+            )
+        else:
+            logger.debug(
+                f"Replica {host}:{port}: lag {status.lag_seconds:.1f}s, "
+                f"{status.active_connections} active queries"
+            )
+            eligible.append(status)
+
+    if not eligible:
+        logger.warning(
+            f"No usable replica, backing up from primary {config.pg_host}:{config.pg_port}"
+        )
+        return BackupSource(config=config)
+
+    best = min(eligible, key=lambda s: (s.active_connections, s.lag_seconds))
+    logger.info(f"Backing up from replica {best.host}:{best.port} (lag {best.lag_seconds:.1f}s)")
+    return BackupSource(
+        config=config.model_copy(update={"pg_host": best.host, "pg_port": best.port}),
+        is_replica=True,
+        lag_seconds=best.lag_seconds,
+    )
@@ -0,0 +1,362 @@
+"""
+Sharded dumps: large tables dumped and restored as concurrent pg_dump streams.
+
+A sharded backup is a .dir directory of custom-format dumps taken from
+one exported snapshot:
+
+- schema.dump: pre-data and post-data sections (restored before and after the data)
+- data.dump: data of all tables below the shard threshold (and large objects)
+- data_<table>.dump: data of one large table each
+
+Shards are scheduled largest first on a bounded worker pool, so a few huge
+tables no longer serialize the whole dump.
+"""
+
+import logging
+import math
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from backup_postgres.config.settings import PostgresConfig
+from backup_postgres.utils.compression import CompressionSpec
+from backup_postgres.utils.exceptions import BackupError, RestoreError
+from backup_postgres.utils.subprocess import (
+    ProgressCallback,
+    available_cpus,
+    restore_parallelism,
+    run_pg_dump,
+    run_pg_restore,
+    verify_backup_format,
+)
+from backup_postgres.utils.throttle import Throttle
+from backup_postgres.utils.toc import TOC_INDEX_VERSION, build_toc_index
+
+logger = logging.getLogger(__name__)
+
+# Files of a sharded backup
+SCHEMA_FILE = "schema.dump"
+DATA_FILE = "data.dump"
+SHARD_PREFIX = "data_"
+
+
+@dataclass
+class Shard:
+    """One pg_dump stream of a sharded backup."""
+
+    filename: str
+    dump_args: list[str] = field(default_factory=list)
+    table: str | None = None  # Set for single-table data shards
+    estimated_bytes: int = 0
+    # Only data.dump carries large objects; the -t of a table shard would
+    # drop them anyway, and -b would copy them into every shard
+    large_objects: bool = False
+
+
+def _table_pattern(table: str) -> str:
+    """Get a pg_dump -t/-T pattern matching exactly one public table."""
+    return 'public."{}"'.format(table.replace('"', '""'))
+
+
+def plan_shards(table_sizes: dict[str, int], min_shard_bytes: int) -> list[Shard]:
+    """
+    Split a dump into shards by table size.
+
+    Every table of at least min_shard_bytes gets its own data shard; all
+    other table data goes into one shared data shard.
+
+    Args:
+        table_sizes: Table name -> size in bytes (public schema)
+        min_shard_bytes: Minimum table size for a dedicated shard
+
+    Returns:
+        Shards ordered largest first (the order they are scheduled in)
+    """
+    large = [t for t, size in table_sizes.items() if size >= min_shard_bytes]
+    small_bytes = sum(size for t, size in table_sizes.items() if t not in large)
+
+    exclude_args: list[str] = []
+    for table in large:
+        exclude_args += ["-T", _table_pattern(table)]
+
+    shards = [
+        Shard(SCHEMA_FILE, ["--section=pre-data", "--section=post-data"]),
+        Shard(
+            DATA_FILE,
+            ["--section=data", *exclude_args],
+            estimated_bytes=small_bytes,
+            large_objects=True,
+        ),
+    ]
+    shards += [
+        Shard(
+            f"{SHARD_PREFIX}{re.sub(r'[^A-Za-z0-9_.-]', '_', table)}.dump",
+            ["--section=data", "-t", _table_pattern(table)],
+            table=table,
+            estimated_bytes=table_sizes[table],
+        )
+        for table in large
+    ]
+
+    shards.sort(key=lambda s: s.estimated_bytes, reverse=True)
+    return shards
+
+
+def shard_workers(shards: list[Shard], max_workers: int) -> int:
+    """
+    Size the worker pool for a set of shards.
+
+    A dump cannot finish before its largest shard, so more workers than
+    total / largest bytes only add load on the server without shortening
+    the dump.
+
+    Args:
+        shards: Planned shards
+        max_workers: Upper bound (BACKUP_DUMP_JOBS)
+
+    Returns:
+        Number of concurrent pg_dump processes
+    """
+    total = sum(s.estimated_bytes for s in shards)
+    largest = max((s.estimated_bytes for s in shards), default=0)
+    useful = math.ceil(total / largest) if largest else 1
+    return max(1, min(max_workers, len(shards), useful))
+
+
+def dump_shards(
+    config: PostgresConfig,
+    backup_path: Path,
+    shards: list[Shard],
+    snapshot: str,
+    compression: CompressionSpec,
+    max_workers: int,
+    on_progress: ProgressCallback | None = None,
+    throttle: Throttle | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Dump all shards concurrently from one exported snapshot.
+
+    Args:
+        config: PostgreSQL configuration
+        backup_path: Backup directory to create (.dir)
+        shards: Shards from plan_shards()
+        snapshot: Exported snapshot id; the exporting transaction must stay
+            open until the last shard has started
+        compression: Compression settings applied to every shard
+        max_workers: Maximum concurrent pg_dump processes
+        on_progress: Optional progress callback (called from worker threads)
+        throttle: Optional throttle shared by all shards, so the rate limit
+            applies to the backup as a whole
+
+    Returns:
+        Shard entries for the metadata JSON, in schedule order
+
+    Raises:
+        BackupError: If any shard fails (the partial directory is removed)
+    """
+    workers = shard_workers(shards, max_workers)
+    logger.info(f"Dumping {len(shards)} shards with {workers} workers")
+    backup_path.mkdir(parents=True, exist_ok=False)
+    # Set when a shard fails: the running pg_dump processes are terminated
+    cancel = threading.Event()
+
+    def dump(shard: Shard) -> dict[str, Any]:
+        if cancel.is_set():
+            raise BackupError(f"Shard {shard.filename} cancelled")
+        started = time.monotonic()
+        try:
+            result = run_pg_dump(
+                config,
+                backup_path / shard.filename,
+                compression=compression,
+                snapshot=snapshot,
+                dump_args=shard.dump_args,
+                verbose=True,
+                on_progress=on_progress,
+                throttle=throttle,
+                large_objects=shard.large_objects,
+                cancel=cancel,
+            )
+        except BaseException:
+            # Set before this worker can pick up a queued shard
+            cancel.set()
+            raise
+        duration = time.monotonic() - started
+        logger.info(f"Shard {shard.filename} done in {duration:.1f}s ({result.size_bytes} bytes)")
+        return {
+            "file": shard.filename,
+            "table": shard.table,
+            "section": "schema" if shard.filename == SCHEMA_FILE else "data",
+            "size_bytes": result.size_bytes,
+            "checksum_sha256": result.checksum_sha256,
+            "duration_seconds": round(duration, 2),
+        }
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pg_dump") as pool:
+            futures = [pool.submit(dump, shard) for shard in shards]
+            try:
+                # Returns as soon as any shard fails, not in schedule order
+                wait(futures, return_when=FIRST_EXCEPTION)
+                return [future.result() for future in futures]
+            except BaseException:
+                # Don't start queued shards and stop the running ones, so a
+                # doomed backup does not keep the snapshot open and load the server
+                for future in futures:
+                    future.cancel()
+                cancel.set()
+                raise
+    except BaseException as e:
+        shutil.rmtree(backup_path, ignore_errors=True)
+        if isinstance(e, BackupError):
+            raise
+        raise BackupError(f"Sharded dump failed: {e}") from e
+
+
+def is_sharded_backup(backup_path: Path) -> bool:
+    """Whether a path is a sharded backup directory."""
+    return backup_path.is_dir() and (backup_path / SCHEMA_FILE).is_file()
+
+
+def data_shard_files(backup_path: Path) -> list[Path]:
+    """
+    Get the data shards of a sharded backup, largest first.
+
+    Args:
+        backup_path: Sharded backup directory
+
+    Returns:
+        Paths of data.dump and every data_<table>.dump
+    """
+    files = list(backup_path.glob(f"{SHARD_PREFIX}*.dump"))
+    if (backup_path / DATA_FILE).is_file():
+        files.append(backup_path / DATA_FILE)
+    return sorted(files, key=lambda p: p.stat().st_size, reverse=True)
+
+
+def build_shard_toc_index(backup_path: Path) -> dict[str, Any]:
+    """
+    Build the TOC index of a sharded backup: one index per shard file.
+
+    Args:
+        backup_path: Sharded backup directory
+
+    Returns:
+        TOC index with the shard indexes under "shards"
+
+    Raises:
+        ArchiveFormatError: If a shard cannot be parsed
+    """
+    files = [backup_path / SCHEMA_FILE, *data_shard_files(backup_path)]
+    return {
+        "version": TOC_INDEX_VERSION,
+        "shards": {path.name: build_toc_index(path) for path in files},
+    }
+
+
+def verify_shards(
+    backup_path: Path,
+    codec: str | None = None,
+    index: dict[str, Any] | None = None,
+) -> None:
+    """
+    Verify the format of every shard of a sharded backup.
+
+    Args:
+        backup_path: Sharded backup directory
+        codec: External codec of the shards, detected per file if None
+        index: Optional TOC index from build_shard_toc_index()
+
+    Raises:
+        RestoreError: If a shard is not a valid archive
+    """
+    shard_indexes = (index or {}).get("shards", {})
+    for path in [backup_path / SCHEMA_FILE, *data_shard_files(backup_path)]:
+        verify_backup_format(path, codec=codec, index=shard_indexes.get(path.name))
+
+
+def restore_shards(
+    config: PostgresConfig,
+    backup_path: Path,
+    codec: str | None = None,
+    max_workers: int | None = None,
+    on_progress: ProgressCallback | None = None,
+    options: dict[str, str] | None = None,
+) -> int:
+    """
+    Restore a sharded backup, loading the data shards concurrently.
+
+    Order: pre-data (tables, types) from schema.dump, then all data
+    shards in parallel, then post-data (indexes, constraints, triggers)
+    with up to max_workers pg_restore jobs.
+
+    Args:
+        config: PostgreSQL configuration
+        backup_path: Sharded backup directory
+        codec: External codec of the shards, detected per file if None
+        max_workers: Maximum concurrent pg_restore processes (default:
+            available CPUs)
+        on_progress: Optional progress callback (called from worker threads)
+        options: Session settings of every pg_restore connection
+
+    Returns:
+        Number of data shards restored concurrently
+
+    Raises:
+        RestoreError: If any step fails
+    """
+    schema_path = backup_path / SCHEMA_FILE
+    data_files = data_shard_files(backup_path)
+    max_workers = max_workers or available_cpus()
+    workers = max(1, min(max_workers, len(data_files)))
+
+    logger.info("Restoring pre-data section")
+    run_pg_restore(
+        config,
+        schema_path,
+        verbose=True,
+        codec=codec,
+        restore_args=["--section=pre-data"],
+        on_progress=on_progress,
+        options=options,
+    )
+
+    logger.info(f"Restoring {len(data_files)} data shards with {workers} workers")
+
+    def restore(path: Path) -> None:
+        run_pg_restore(
+            config,
+            path,
+            verbose=True,
+            codec=codec,
+            restore_args=["--section=data"],
+            on_progress=on_progress,
+            options=options,
+        )
+        logger.info(f"Shard {path.name} restored")
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pg_restore") as pool:
+            list(pool.map(restore, data_files))
+    except RestoreError:
+        raise
+    except Exception as e:
+        raise RestoreError(f"Sharded restore failed: {e}") from e
+
+    logger.info("Restoring post-data section")
+    run_pg_restore(
+        config,
+        schema_path,
+        verbose=True,
+        codec=codec,
+        restore_args=["--section=post-data"],
+        on_progress=on_progress,
+        jobs=restore_parallelism(schema_path, max_workers, codec),
+        options=options,
+    )
+    return workers
@@ -0,0 +1,164 @@
+"""
+Restore performance profiles.
+
+A profile tunes the target server for a bulk load while pg_restore runs:
+server-wide settings (checkpoint spacing, autovacuum) are changed with
+ALTER SYSTEM and reloaded, and per-connection settings are passed to
+pg_restore's own connections through PGOPTIONS. Server-wide settings are
+reverted to their previous postgresql.auto.conf state afterwards, whether
+the restore succeeded or not.
+"""
+
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from psycopg import sql
+
+from backup_postgres.utils.database import DatabaseSession
+from backup_postgres.utils.exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+# Values of the given settings currently written by ALTER SYSTEM, in file
+# order (a later entry for the same name wins)
+AUTO_CONF_QUERY = """
+    SELECT name, setting
+    FROM pg_file_settings
+    WHERE right(sourcefile, 20) = 'postgresql.auto.conf' AND name = ANY(%s)
+    ORDER BY seqno;
+"""
+
+
+@dataclass(frozen=True)
+class RestoreProfile:
+    """Server and session settings applied while pg_restore runs."""
+
+    name: str
+    # Applied with ALTER SYSTEM + pg_reload_conf(), reverted afterwards
+    system_settings: dict[str, str] = field(default_factory=dict)
+    # Applied to pg_restore's connections only (PGOPTIONS)
+    session_settings: dict[str, str] = field(default_factory=dict)
+
+
+PROFILES = {
+    "bulk-load": RestoreProfile(
+        name="bulk-load",
+        system_settings={
+            # Fewer checkpoints (and full-page writes after them) during the load
+            "max_wal_size": "16GB",
+            "checkpoint_timeout": "30min",
+            # No vacuum/analyze workers competing for freshly loaded tables
+            "autovacuum": "off",
+        },
+        session_settings={
+            # Per pg_restore job: index builds sort in memory
+            "maintenance_work_mem": "512MB",
+            "max_parallel_maintenance_workers": "4",
+            # A lost commit just means restoring again
+            "synchronous_commit": "off",
+        },
+    ),
+}
+
+
+def get_profile(name: str) -> RestoreProfile:
+    """
+    Look up a restore profile by name.
+
+    Raises:
+        ValueError: If there is no such profile
+    """
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown restore profile: {name} (available: {', '.join(PROFILES)})"
+        ) from None
+
+
+@contextmanager
+def apply_profile(session: DatabaseSession, profile: RestoreProfile) -> Iterator[dict[str, str]]:
+    """
+    Apply a restore profile for the duration of the context.
+
+    ALTER SYSTEM needs superuser (or, from PostgreSQL 15, a GRANT ALTER
+    SYSTEM privilege); without it only the session settings are used.
+    On exit every setting changed here is set back to its previous
+    postgresql.auto.conf value (or reset if it had none) and the
+    configuration is reloaded. The revert statements are logged up
+    front, so they can be run by hand if the process is killed.
+
+    Args:
+        session: Session on the target server
+        profile: Profile to apply
+
+    Yields:
+        Session settings to pass to pg_restore (see run_pg_restore options)
+    """
+    names = list(profile.system_settings)
+    applied: list[str] = []
+    previous: dict[str, str] = {}
+
+    if names:
+        try:
+            previous = dict(session.fetch_all(AUTO_CONF_QUERY, (names,)))
+            for name in names:
+                session.execute(
+                    sql.SQL("ALTER SYSTEM SET {} = {}").format(
+                        sql.Identifier(name), sql.Literal(profile.system_settings[name])
+                    )
+                )
+                applied.append(name)
+            session.execute("SELECT pg_reload_conf()")
+        except DatabaseError as e:
+            logger.warning(f"Cannot apply server settings of restore profile {profile.name}: {e}")
+            _revert(session, applied, previous)
+            applied = []
+
+    if applied:
+        logger.info(
+            f"Applied restore profile {profile.name}: "
+            + ", ".join(f"{name}={profile.system_settings[name]}" for name in applied)
+        )
+        logger.info(
+            "If this restore is interrupted, revert with: "
+            + "; ".join(_revert_statement(name, previous).as_string(session.connection) for name in applied)
+            + "; SELECT pg_reload_conf();"
+        )
+
+    try:
+        yield dict(profile.session_settings)
+    finally:
+        if applied:
+            _revert(session, applied, previous)
+            logger.info(f"Reverted server settings of restore profile {profile.name}")
+
+
+def _revert_statement(name: str, previous: dict[str, str]) -> sql.Composed:
+    """ALTER SYSTEM statement restoring a setting's previous auto.conf state."""
+    if name in previous:
+        return sql.SQL("ALTER SYSTEM SET {} = {}").format(
+            sql.Identifier(name), sql.Literal(previous[name])
+        )
+    return sql.SQL("ALTER SYSTEM RESET {}").format(sql.Identifier(name))
+
+
+def _revert(session: DatabaseSession, names: list[str], previous: dict[str, str]) -> None:
+    """Revert settings changed by apply_profile() and reload the configuration."""
+    if not names:
+        return
+    failed = []
+    for name in names:
+        try:
+            session.execute(_revert_statement(name, previous))
+        except DatabaseError as e:
+            logger.error(f"Failed to revert {name}: {e}")
+            failed.append(name)
+    try:
+        session.execute("SELECT pg_reload_conf()")
+    except DatabaseError as e:
+        logger.error(f"Failed to reload configuration after reverting restore profile: {e}")
+    if failed:
+        logger.error(f"Server settings left changed by the restore profile: {', '.join(failed)}")
@@ -5,8 +5,11 @@ Manages scheduled backup jobs and cloud sync operations.
 """
 
 import logging
+import threading
+from collections import deque
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import Any, Literal
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
@@ -16,6 +19,8 @@ from backup_postgres.cloud.registry import UploadRegistry
 from backup_postgres.config.settings import Settings
 from backup_postgres.core.backup import BackupManager
 from backup_postgres.core.metadata import load_metadata
+from backup_postgres.core.physical import PhysicalBackupManager
+from backup_postgres.utils.subprocess import ProgressEvent
 
 logger = logging.getLogger(__name__)
 
@@ -27,12 +32,16 @@ class JobScheduler:
     Replaces cron daemon with Python-based scheduling.
     """
 
+    # Number of progress events kept for get_progress()
+    PROGRESS_HISTORY = 50
+
     def __init__(
         self,
         settings: Settings,
         backup_manager: BackupManager,
         cloud_manager: CloudStorageManager | None = None,
         registry: UploadRegistry | None = None,
+        physical_manager: PhysicalBackupManager | None = None,
     ) -> None:
         """
         Initialize job scheduler.
@@ -42,16 +51,28 @@ class JobScheduler:
             backup_manager: Backup manager for backup operations
             cloud_manager: Optional cloud storage manager
             registry: Optional upload registry
+            physical_manager: Optional physical backup manager (weekly base backups)
         """
         self.settings = settings
         self.backup_manager = backup_manager
         self.cloud_manager = cloud_manager
         self.registry = registry
+        self.physical_manager = physical_manager
 
         # Configure scheduler with memory jobstore
         # Jobs are recreated on each startup, so persistence isn't needed
         self.scheduler = BackgroundScheduler(timezone=UTC)
 
+        # Progress of the running (or last) backup job, fed by pg_dump -v output
+        self._progress_lock = threading.Lock()
+        self._progress: dict[str, Any] = {
+            "job": None,
+            "started_at": None,
+            "finished_at": None,
+            "objects_done": 0,
+            "events": deque(maxlen=self.PROGRESS_HISTORY),
+        }
+
         logger.info("Job scheduler initialized")
 
     def start(self) -> None:
@@ -78,6 +99,17 @@ class JobScheduler:
         )
         logger.info("Scheduled: Weekly backup on Sunday at 03:00 UTC")
 
+        # Physical base backup Saturday at 1 AM UTC (optional)
+        if self.physical_manager:
+            self.scheduler.add_job(
+                func=self._physical_backup_with_upload,
+                trigger=CronTrigger(day_of_week="sat", hour=1, minute=0, timezone=UTC),
+                id="physical_backup",
+                name="Physical PostgreSQL Base Backup",
+                replace_existing=True,
+            )
+            logger.info("Scheduled: Physical backup on Saturday at 01:00 UTC")
+
         # Cloud retention cleanup daily at 4 AM UTC (optional)
         if self.cloud_manager and self.settings.gcs.cloud_retention_enabled:
             self.scheduler.add_job(
@@ -130,15 +162,57 @@ class JobScheduler:
         self.scheduler.shutdown(wait=wait)
         logger.info("Scheduler stopped")
 
+    def _start_progress(self, job: str) -> None:
+        """Reset progress tracking for a new job."""
+        with self._progress_lock:
+            self._progress.update(
+                job=job,
+                started_at=datetime.now(UTC),
+                finished_at=None,
+                objects_done=0,
+            )
+            self._progress["events"].clear()
+
+    def _record_progress(self, event: ProgressEvent) -> None:
+        """Record a progress event (called from the backup's worker threads)."""
+        with self._progress_lock:
+            self._progress["objects_done"] += 1
+            self._progress["events"].append(event)
+
+    def _finish_progress(self) -> None:
+        """Mark the tracked job as finished."""
+        with self._progress_lock:
+            self._progress["finished_at"] = datetime.now(UTC)
+
+    def get_progress(self) -> dict[str, Any]:
+        """
+        Get progress of the running (or last finished) backup job.
+
+        Returns:
+            Dictionary with job name, start/finish times, number of
+            objects finished and the most recent progress events
+        """
+        with self._progress_lock:
+            progress = self._progress
+            return {
+                "job": progress["job"],
+                "running": progress["job"] is not None and progress["finished_at"] is None,
+                "started_at": progress["started_at"].isoformat() if progress["started_at"] else None,
+                "finished_at": progress["finished_at"].isoformat() if progress["finished_at"] else None,
+                "objects_done": progress["objects_done"],
+                "recent_events": [event.to_dict() for event in progress["events"]],
+            }
+
     def _daily_backup_with_upload(self) -> None:
         """Execute daily backup and upload."""
         logger.info("=" * 50)
         logger.info("Starting DAILY backup")
         logger.info("=" * 50)
 
+        self._start_progress("daily_backup")
         try:
             # Create backup
-            result = self.backup_manager.create_backup("daily")
+            result = self.backup_manager.create_backup("daily", on_progress=self._record_progress)
 
             if result.success:
                 logger.info(f"Daily backup created: {result.backup_path}")
@@ -151,6 +225,8 @@ class JobScheduler:
 
         except Exception as e:
             logger.error(f"Daily backup job failed: {e}", exc_info=True)
+        finally:
+            self._finish_progress()
 
     def _weekly_backup_with_upload(self) -> None:
         """Execute weekly backup and upload."""
@@ -158,9 +234,10 @@ class JobScheduler:
         logger.info("Starting WEEKLY backup")
         logger.info("=" * 50)
 
+        self._start_progress("weekly_backup")
         try:
             # Create backup
-            result = self.backup_manager.create_backup("weekly")
+            result = self.backup_manager.create_backup("weekly", on_progress=self._record_progress)
 
             if result.success:
                 logger.info(f"Weekly backup created: {result.backup_path}")
@@ -173,6 +250,32 @@ class JobScheduler:
 
         except Exception as e:
             logger.error(f"Weekly backup job failed: {e}", exc_info=True)
+        finally:
+            self._finish_progress()
+
+    def _physical_backup_with_upload(self) -> None:
+        """Execute physical base backup and upload."""
+        if not self.physical_manager:
+            return
+
+        logger.info("=" * 50)
+        logger.info("Starting PHYSICAL backup")
+        logger.info("=" * 50)
+
+        try:
+            result = self.physical_manager.create_backup()
+
+            if result.success:
+                logger.info(f"Physical backup created: {result.backup_path}")
+
+                # Upload to cloud if configured
+                if self.cloud_manager and self.registry:
+                    self._upload_backup(result.backup_path, result.metadata_path, "physical")
+            else:
+                logger.error(f"Physical backup failed: {result.error}")
+
+        except Exception as e:
+            logger.error(f"Physical backup job failed: {e}", exc_info=True)
 
     def _sync_to_cloud(self) -> None:
         """Sync all local backups to cloud."""
@@ -187,7 +290,7 @@ class JobScheduler:
             error_count = 0
 
             # Check each backup type
-            for backup_type in ["daily", "weekly", "manual"]:
+            for backup_type in ["daily", "weekly", "manual", "physical"]:
                 backups = self.backup_manager.list_backups(backup_type)
 
                 for backup_path in backups:
@@ -243,12 +346,14 @@ class JobScheduler:
             total_deleted = 0
 
             # Clean each backup type
-            for backup_type in ["daily", "weekly"]:
+            for backup_type in ["daily", "weekly", "physical"]:
                 # Get retention limit from settings
                 if backup_type == "daily":
                     retention = self.settings.gcs.cloud_retention_daily
-                else:  # weekly
+                elif backup_type == "weekly":
                     retention = self.settings.gcs.cloud_retention_weekly
+                else:  # physical
+                    retention = self.settings.gcs.cloud_retention_physical
 
                 # Enforce retention
                 deleted = self.cloud_manager.enforce_retention(backup_type, retention)
@@ -272,7 +377,7 @@ class JobScheduler:
         Upload a single backup to cloud storage.
 
         Args:
-            backup_path: Path to .dump file
+            backup_path: Path to .dump file (or .dir directory-format backup)
             metadata_path: Path to .json file
             backup_type: Type of backup
 
@@ -298,14 +403,13 @@ class JobScheduler:
                 logger.debug(f"Already uploaded: {filename}")
                 return True
 
-            # Generate GCS keys
-            prefix = self.settings.gcs.gcs_backup_prefix
-            gcs_key = f"{prefix}/{backup_type}/{filename}"
-            metadata_key = f"{prefix}/{backup_type}/{metadata_path.name}"
+            # Generate GCS keys (physical backups go under their own prefix)
+            gcs_key = self.cloud_manager.backup_key(backup_type, filename)
+            metadata_key = self.cloud_manager.backup_key(backup_type, metadata_path.name)
 
-            # Upload backup file
+            # Upload backup file (all files of a .dir backup as one unit)
             logger.info(f"Uploading: {filename}")
-            result = self.cloud_manager.upload_file(
+            result = self.cloud_manager.upload_backup(
                 backup_path,
                 gcs_key,
             )
@@ -369,20 +473,32 @@ class JobScheduler:
 
         return jobs
 
-    def trigger_backup(self, backup_type: str) -> bool:
+    def trigger_backup(
+        self, backup_type: Literal["daily", "weekly", "manual", "physical"]
+    ) -> bool:
         """
         Manually trigger a backup job.
 
         Args:
-            backup_type: Type of backup to trigger ("daily", "weekly", "manual")
+            backup_type: Type of backup to trigger ("daily", "weekly", "manual",
+                "physical")
 
         Returns:
             True if triggered successfully, False otherwise
         """
         logger.info(f"Manual trigger: {backup_type} backup")
 
+        self._start_progress(f"{backup_type}_backup")
         try:
-            result = self.backup_manager.create_backup(backup_type)
+            if backup_type == "physical":
+                if not self.physical_manager:
+                    logger.error("Physical backups are not enabled")
+                    return False
+                result = self.physical_manager.create_backup()
+            else:
+                result = self.backup_manager.create_backup(
+                    backup_type, on_progress=self._record_progress
+                )
 
             if result.success:
                 logger.info(f"Manual backup completed: {result.backup_path}")
@@ -399,3 +515,6 @@ class JobScheduler:
         except Exception as e:
             logger.error(f"Manual backup failed: {e}")
             return False
+
+        finally:
+            self._finish_progress()
@@ -0,0 +1,234 @@
+"""
+Compression settings for pg_dump output.
+
+Maps the configured codec onto either pg_dump's own compression or an
+external multithreaded compressor stage that pg_dump's output is piped
+through, and provides the matching decompression commands for restore.
+"""
+
+import functools
+import logging
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .chunking import MANIFEST_SUFFIX
+
+logger = logging.getLogger(__name__)
+
+# Valid compression levels per method
+LEVEL_RANGES = {
+    "gzip": (0, 9),
+    "zstd": (1, 19),
+    "lz4": (1, 12),
+}
+
+# Magic bytes of externally compressed dumps
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+LZ4_MAGIC = b"\x04\x22\x4d\x18"
+
+# Codecs applied by an external compressor stage
+EXTERNAL_CODECS = ("zstd", "lz4")
+
+# First pg_dump major version that compresses with zstd/lz4 itself
+NATIVE_CODECS_MIN_VERSION = 16
+
+# Pseudo-codec of chunked backups: the "decompressor" reassembles the dump
+CHUNKED_CODEC = "chunked"
+
+
+@dataclass
+class CompressionSpec:
+    """Compression codec, level and thread count for a dump."""
+
+    method: str = "gzip"  # "gzip", "zstd", "lz4" or "none"
+    level: int = 9  # Ignored for "none"
+    threads: int = 0  # 0 = all available cores (zstd only)
+
+    def uses_external_stage(self, backup_format: str = "custom") -> bool:
+        """
+        Whether the codec runs as an external stage after pg_dump.
+
+        zstd and lz4 use pg_dump's native support when the client has it
+        (PostgreSQL 16+): the archive stays a seekable custom-format file
+        that pg_restore can read with -j and -L. Older clients produce
+        custom-format dumps uncompressed (-Z0) and pipe them through a
+        zstd (multithreaded) or lz4 process instead; such dumps can only
+        be restored through stdin, with one job. Directory-format dumps
+        cannot be piped, so they always use the native support (and
+        compress in parallel via -j).
+
+        Args:
+            backup_format: "custom" or "directory"
+
+        Returns:
+            True if an external compressor stage is used
+        """
+        if self.method not in EXTERNAL_CODECS or backup_format != "custom":
+            return False
+        return not native_codecs_supported()
+
+    def pg_dump_args(self, backup_format: str = "custom") -> list[str]:
+        """
+        Get pg_dump compression arguments.
+
+        Chunked backups are always dumped with -Z0: compressed output
+        would change entirely on small data changes and defeat deduplication.
+        Their chunks are compressed in the chunk store instead.
+
+        Args:
+            backup_format: "custom", "directory" or "chunked"
+
+        Returns:
+            List of command-line arguments
+        """
+        if (
+            self.method == "none"
+            or backup_format == "chunked"
+            or self.uses_external_stage(backup_format)
+        ):
+            return ["-Z0"]
+        if self.method == "gzip":
+            return [f"-Z{self.level}"]
+        return [f"--compress={self.method}:{self.level}"]
+
+    def compressor_cmd(self) -> list[str]:
+        """
+        Get the external compressor command (stdin -> stdout).
+
+        Returns:
+            Command list for zstd or lz4
+        """
+        if self.method == "zstd":
+            return ["zstd", "-q", "-c", f"-{self.level}", f"-T{self.threads}"]
+        # lz4 < 1.10 (as shipped by Debian) has no -T; it is fast enough single-threaded
+        return ["lz4", "-q", "-c", f"-{self.level}"]
+
+    @property
+    def chunk_level(self) -> int:
+        """zlib level for chunk store compression (0 for "none")."""
+        if self.method == "none":
+            return 0
+        return min(max(self.level, 1), 9)
+
+    def to_dict(self, backup_format: str = "custom") -> dict[str, Any]:
+        """Convert to dictionary for JSON metadata."""
+        if backup_format == "chunked":
+            return {"method": "zlib", "level": self.chunk_level, "threads": 1, "stage": "chunks"}
+        return {
+            "method": self.method,
+            "level": self.level,
+            "threads": self.threads,
+            "stage": "external" if self.uses_external_stage(backup_format) else "pg_dump",
+        }
+
+
+@functools.cache
+def pg_dump_major_version() -> int | None:
+    """
+    Get the major version of the installed pg_dump client (cached).
+
+    Returns:
+        Major version (e.g., 16), or None if pg_dump cannot be run
+    """
+    try:
+        result = subprocess.run(
+            ["pg_dump", "--version"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.warning(f"Cannot determine pg_dump version: {e}")
+        return None
+    # e.g. "pg_dump (PostgreSQL) 16.2 (Debian 16.2-1.pgdg120+2)"
+    match = re.search(r"\)\s*(\d+)", result.stdout)
+    return int(match.group(1)) if match else None
+
+
+def native_codecs_supported() -> bool:
+    """Whether pg_dump can compress with zstd and lz4 itself."""
+    version = pg_dump_major_version()
+    return version is not None and version >= NATIVE_CODECS_MIN_VERSION
+
+
+def decompressor_cmd(codec: str) -> list[str]:
+    """
+    Get the command that decompresses an external codec to stdout.
+
+    For chunked backups, the command reassembles the dump from the
+    manifest given as trailing argument.
+
+    Args:
+        codec: "zstd", "lz4" or "chunked"
+
+    Returns:
+        Command list reading from stdin or a trailing file argument
+
+    Raises:
+        ValueError: If codec is not an external codec
+    """
+    if codec == CHUNKED_CODEC:
+        return [sys.executable, "-m", "backup_postgres.utils.chunking", "cat"]
+    if codec == "zstd":
+        return ["zstd", "-q", "-d", "-c"]
+    if codec == "lz4":
+        return ["lz4", "-q", "-d", "-c"]
+    raise ValueError(f"Unsupported external codec: {codec}")
+
+
+def detect_external_codec(backup_path: Path) -> str | None:
+    """
+    Detect whether a dump file was compressed by an external stage.
+
+    Args:
+        backup_path: Path to backup file
+
+    Returns:
+        "zstd" or "lz4" if the file starts with that codec's magic,
+        "chunked" for chunk manifests, None for plain pg_dump archives
+        and directories
+    """
+    if not backup_path.is_file():
+        return None
+    if backup_path.suffix == MANIFEST_SUFFIX:
+        return CHUNKED_CODEC
+
+    with open(backup_path, "rb") as f:
+        return codec_from_magic(f.read(4))
+
+
+def codec_from_magic(data: bytes) -> str | None:
+    """
+    Detect an external codec from the first bytes of a dump.
+
+    Args:
+        data: Leading bytes of the dump (at least 4)
+
+    Returns:
+        "zstd" or "lz4" if data starts with that codec's magic, else None
+    """
+    magic = bytes(data[:4])
+    if magic == ZSTD_MAGIC:
+        return "zstd"
+    if magic == LZ4_MAGIC:
+        return "lz4"
+    return None
+
+
+def codec_from_metadata(metadata: dict | None) -> str | None:
+    """
+    Get the external codec recorded in backup metadata.
+
+    Args:
+        metadata: Metadata dictionary (may be None)
+
+    Returns:
+        "zstd" or "lz4" if the dump went through an external stage, else None
+    """
+    if not metadata:
+        return None
+    compression = metadata.get("backup_info", {}).get("compression") or {}
+    if compression.get("stage") == "external":
+        return compression.get("method")
+    return None
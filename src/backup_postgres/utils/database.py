@@ -0,0 +1,230 @@
+"""
+PostgreSQL connection utilities.
+
+Provides a persistent database session shared by the queries of a job,
+replacing one psql process and one connection handshake per query.
+"""
+
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, cast
+
+import psycopg
+from psycopg import sql
+from psycopg.pq import TransactionStatus
+
+from backup_postgres.config.settings import PostgresConfig
+
+from .exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+Query = str | sql.SQL | sql.Composed
+
+
+class DatabaseSession:
+    """
+    Persistent PostgreSQL connection for the queries of one job.
+
+    Connects lazily on first use and keeps the connection open until
+    close(). Runs in autocommit mode, so a failing query (e.g., a table
+    that does not exist) does not affect later queries. Rows are returned
+    as tuples of Python values (int, bool, str, ...) rather than text.
+    """
+
+    # Seconds to wait for the TCP connection and authentication
+    CONNECT_TIMEOUT = 10
+
+    def __init__(
+        self,
+        config: PostgresConfig,
+        database: str | None = None,
+        application_name: str = "backup-postgres",
+    ) -> None:
+        """
+        Initialize database session.
+
+        Args:
+            config: PostgreSQL configuration
+            database: Database name (defaults to config.pg_database)
+            application_name: Name reported in pg_stat_activity
+        """
+        self.config = config
+        self.database = database or config.pg_database
+        self.application_name = application_name
+        self._conn: psycopg.Connection | None = None
+
+    @property
+    def connection(self) -> psycopg.Connection:
+        """
+        Get the open connection, connecting if needed.
+
+        Raises:
+            DatabaseError: If the connection cannot be established
+        """
+        if self._conn is None or self._conn.closed:
+            try:
+                self._conn = psycopg.connect(
+                    host=self.config.pg_host,
+                    port=self.config.pg_port,
+                    user=self.config.pg_user,
+                    password=self.config.pg_password,
+                    dbname=self.database,
+                    application_name=self.application_name,
+                    connect_timeout=self.CONNECT_TIMEOUT,
+                    autocommit=True,
+                )
+                logger.debug(
+                    f"Connected to {self.config.pg_host}:{self.config.pg_port}/{self.database}"
+                )
+            except psycopg.Error as e:
+                error_msg = f"Failed to connect to database {self.database}: {e}"
+                logger.error(error_msg)
+                raise DatabaseError(error_msg) from e
+        return self._conn
+
+    def fetch_all(self, query: Query, params: Any = None) -> list[tuple[Any, ...]]:
+        """
+        Execute a query and return all rows.
+
+        Args:
+            query: SQL query (string or psycopg.sql composable)
+            params: Optional query parameters
+
+        Returns:
+            List of row tuples
+
+        Raises:
+            DatabaseError: If the query fails
+        """
+        return cast(list[tuple[Any, ...]], self._run(query, params, lambda cur: cur.fetchall()))
+
+    def fetch_one(self, query: Query, params: Any = None) -> tuple[Any, ...] | None:
+        """
+        Execute a query and return the first row.
+
+        Args:
+            query: SQL query
+            params: Optional query parameters
+
+        Returns:
+            Row tuple, or None if the query returned no rows
+
+        Raises:
+            DatabaseError: If the query fails
+        """
+        return cast(tuple[Any, ...] | None, self._run(query, params, lambda cur: cur.fetchone()))
+
+    def fetch_value(self, query: Query, params: Any = None) -> Any:
+        """
+        Execute a query and return the first column of the first row.
+
+        Args:
+            query: SQL query
+            params: Optional query parameters
+
+        Returns:
+            Value, or None if the query returned no rows
+
+        Raises:
+            DatabaseError: If the query fails
+        """
+        row = self.fetch_one(query, params)
+        return row[0] if row else None
+
+    def execute(self, query: Query, params: Any = None) -> None:
+        """
+        Execute a statement without returning rows.
+
+        Args:
+            query: SQL statement(s); several statements are allowed without params
+            params: Optional query parameters
+
+        Raises:
+            DatabaseError: If the statement fails
+        """
+        self._run(query, params, lambda cur: None)
+
+    def _run(self, query: Query, params: Any, fetch: Any) -> Any:
+        """Execute a query and apply fetch() to the cursor."""
+        if isinstance(query, str):
+            logger.debug(f"Executing query: {query.strip()[:100]}...")
+
+        try:
+            conn = self.connection
+            if conn.info.transaction_status == TransactionStatus.IDLE:
+                with conn.cursor() as cur:
+                    cur.execute(query, params)
+                    return fetch(cur)
+
+            # Inside a snapshot transaction: isolate each query in a savepoint
+            # so one failing query does not abort the whole transaction
+            with conn.transaction(), conn.cursor() as cur:
+                cur.execute(query, params)
+                return fetch(cur)
+        except psycopg.Error as e:
+            if self._conn is not None and self._conn.broken:
+                self._conn = None  # Reconnect on next use
+            error_msg = f"Query failed: {e}"
+            logger.debug(error_msg)
+            raise DatabaseError(error_msg) from e
+
+    @contextmanager
+    def exported_snapshot(self) -> Iterator[str]:
+        """
+        Run queries in a repeatable-read transaction and export its snapshot.
+
+        All queries made through this session inside the context see the
+        same point in time, and other sessions (e.g., pg_dump --snapshot) can
+        import the snapshot while the context is open.
+
+        Yields:
+            Snapshot identifier from pg_export_snapshot()
+
+        Raises:
+            DatabaseError: If the transaction cannot be started or the
+                snapshot cannot be exported
+        """
+        conn = self.connection
+        try:
+            with conn.cursor() as cur:
+                cur.execute("BEGIN ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+                cur.execute("SELECT pg_export_snapshot()")
+                row = cur.fetchone()
+        except psycopg.Error as e:
+            self._end_transaction()
+            raise DatabaseError(f"Failed to export snapshot: {e}") from e
+
+        snapshot_id = row[0] if row else ""
+        logger.debug(f"Exported snapshot {snapshot_id}")
+        try:
+            yield snapshot_id
+        finally:
+            self._end_transaction()
+
+    def _end_transaction(self) -> None:
+        """Roll back an explicitly started transaction, if any."""
+        if self._conn is None or self._conn.closed:
+            return
+        try:
+            if self._conn.info.transaction_status != TransactionStatus.IDLE:
+                self._conn.execute("ROLLBACK")
+        except psycopg.Error as e:
+            logger.warning(f"Failed to end transaction, closing connection: {e}")
+            self.close()
+
+    def close(self) -> None:
+        """Close the connection, if open."""
+        if self._conn is not None and not self._conn.closed:
+            self._conn.close()
+            logger.debug(f"Closed connection to {self.database}")
+        self._conn = None
+
+    def __enter__(self) -> "DatabaseSession":
+        """Enter context manager."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Close connection on context exit."""
+        self.close()
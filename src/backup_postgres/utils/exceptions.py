@@ -59,6 +59,30 @@ class RetentionError(BackupError):
     pass
 
 
+class DatabaseError(Exception):
+    """Raised when a database connection or query fails."""
+
+    pass
+
+
+class ChunkStoreError(Exception):
+    """Raised when a chunked backup's manifest or chunks are missing or corrupt."""
+
+    pass
+
+
+class ChecksumError(Exception):
+    """Raised when data does not match its recorded checksum."""
+
+    pass
+
+
+class ArchiveFormatError(Exception):
+    """Raised when a pg_dump archive or its TOC index cannot be parsed."""
+
+    pass
+
+
 class ConfigurationError(Exception):
     """Raised when configuration is invalid."""
 
@@ -6,6 +6,7 @@ Provides consistent logging format across the application.
 
 import json
 import logging
+from collections.abc import Callable
 from datetime import UTC, datetime
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
@@ -58,6 +59,8 @@ class JsonFormatter(logging.Formatter):
             log_obj["database"] = record.database  # type: ignore
         if hasattr(record, "file_size"):
             log_obj["file_size"] = record.file_size  # type: ignore
+        if hasattr(record, "progress"):
+            log_obj["progress"] = record.progress  # type: ignore
 
         return json.dumps(log_obj)
 
@@ -139,7 +142,7 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
 
-def log_execution_time(func: callable) -> callable:
+def log_execution_time[**P, R](func: Callable[P, R]) -> Callable[P, R]:
     """
     Decorator to log function execution time.
 
@@ -150,7 +153,7 @@ def log_execution_time(func: callable) -> callable:
         Wrapped function with execution time logging
     """
 
-    def wrapper(*args: Any, **kwargs: Any) -> Any:
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
         """Execute function and log execution time."""
         logger = get_logger(func.__module__)
         import time
@@ -0,0 +1,171 @@
+"""
+PostgreSQL readiness probe.
+
+Waits for a server to accept connections by speaking the first step of
+the wire protocol directly (TCP connect + startup packet), like
+pg_isready does, but in-process and with exponential backoff instead of
+spawning a pg_isready process every few seconds.
+"""
+
+import asyncio
+import logging
+import random
+import struct
+import time
+from dataclasses import dataclass
+
+from backup_postgres.config.settings import PostgresConfig
+
+logger = logging.getLogger(__name__)
+
+# Protocol version 3.0
+PROTOCOL_VERSION = 3 << 16
+
+# SQLSTATE cannot_connect_now: starting up, shutting down or in crash recovery
+CANNOT_CONNECT_NOW = "57P03"
+
+# Backoff between attempts (seconds)
+INITIAL_DELAY = 0.05
+MAX_DELAY = 2.0
+
+# Timeout of a single attempt (seconds)
+ATTEMPT_TIMEOUT = 5.0
+
+
+@dataclass
+class ReadinessResult:
+    """Outcome of waiting for a server."""
+
+    ready: bool
+    wait_seconds: float
+    attempts: int
+
+
+def _startup_packet(user: str, database: str) -> bytes:
+    """Build a StartupMessage for the given user and database."""
+    params = b""
+    for key, value in (("user", user), ("database", database), ("application_name", "backup-postgres-probe")):
+        params += key.encode() + b"\0" + value.encode() + b"\0"
+    body = struct.pack("!I", PROTOCOL_VERSION) + params + b"\0"
+    return struct.pack("!I", len(body) + 4) + body
+
+
+def _error_code(payload: bytes) -> str:
+    """Extract the SQLSTATE (field 'C') from an ErrorResponse payload."""
+    for field in payload.split(b"\0"):
+        if field[:1] == b"C":
+            return field[1:].decode("ascii", errors="replace")
+    return ""
+
+
+async def probe(host: str, port: int, user: str, database: str) -> bool:
+    """
+    Check once whether a server accepts connections.
+
+    Any answer to the startup packet other than "cannot connect now"
+    (an authentication request, or an error such as a failed password
+    check) means the server is up, which is what pg_isready reports too.
+
+    Args:
+        host: Server host
+        port: Server port
+        user: User name sent in the startup packet
+        database: Database name sent in the startup packet
+
+    Returns:
+        True if the server accepts connections
+    """
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), timeout=ATTEMPT_TIMEOUT
+        )
+    except (OSError, TimeoutError):
+        return False
+
+    try:
+        writer.write(_startup_packet(user, database))
+        await writer.drain()
+        header = await asyncio.wait_for(reader.readexactly(5), timeout=ATTEMPT_TIMEOUT)
+        kind, length = header[:1], struct.unpack("!I", header[1:])[0]
+        if kind != b"E":
+            return True
+        payload = await asyncio.wait_for(reader.readexactly(length - 4), timeout=ATTEMPT_TIMEOUT)
+        return _error_code(payload) != CANNOT_CONNECT_NOW
+    except (OSError, asyncio.IncompleteReadError, TimeoutError):
+        return False
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+
+async def wait_until_ready(
+    host: str,
+    port: int,
+    user: str,
+    database: str,
+    timeout: float = 60.0,
+) -> ReadinessResult:
+    """
+    Probe a server until it accepts connections or the deadline passes.
+
+    Delays between attempts grow exponentially from INITIAL_DELAY to
+    MAX_DELAY with full jitter, so a server that comes up quickly is
+    detected within milliseconds while a slow one is not hammered.
+
+    Args:
+        host: Server host
+        port: Server port
+        user: User name sent in the startup packet
+        database: Database name sent in the startup packet
+        timeout: Overall deadline in seconds
+
+    Returns:
+        ReadinessResult with the measured time to ready
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    delay = INITIAL_DELAY
+    attempts = 0
+
+    while True:
+        attempts += 1
+        if await probe(host, port, user, database):
+            return ReadinessResult(True, time.monotonic() - started, attempts)
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return ReadinessResult(False, time.monotonic() - started, attempts)
+        await asyncio.sleep(min(random.uniform(0, delay), remaining))
+        delay = min(delay * 2, MAX_DELAY)
+
+
+def wait_for_postgres(config: PostgresConfig, timeout: float = 60.0) -> ReadinessResult:
+    """
+    Wait until PostgreSQL accepts connections.
+
+    Args:
+        config: PostgreSQL configuration
+        timeout: Overall deadline in seconds
+
+    Returns:
+        ReadinessResult (ready is False if the deadline passed)
+    """
+    result = asyncio.run(
+        wait_until_ready(
+            config.pg_host,
+            config.pg_port,
+            config.pg_user,
+            config.pg_database,
+            timeout=timeout,
+        )
+    )
+    if result.ready:
+        logger.info(
+            f"PostgreSQL is ready after {result.wait_seconds:.2f}s ({result.attempts} attempts)"
+        )
+    else:
+        logger.warning(f"PostgreSQL not ready after {timeout}s ({result.attempts} attempts)")
+    return result
@@ -1,21 +1,65 @@
 """
 PostgreSQL subprocess utilities.
 
-Provides wrappers for pg_dump, pg_restore, and psql commands.
+Provides wrappers for pg_dump, pg_restore, pg_basebackup, pg_ctl and psql commands.
+
+pg_dump, pg_restore and pg_basebackup run on an asyncio process runner that
+streams their output while they run: -v messages become progress events,
+other lines are forwarded to the logger, and only a bounded tail is kept
+in memory for error messages.
 """
 
+import asyncio
 import logging
+import os
+import re
 import subprocess
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
+from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Protocol
 
 from backup_postgres.config.settings import PostgresConfig
 
-from .exceptions import BackupError, RestoreError
+from .checksum import HashingWriter
+from .chunking import ChunkingWriter, chunk_store_for
+from .compression import CompressionSpec, decompressor_cmd, detect_external_codec
+from .exceptions import ArchiveFormatError, BackupError, ChunkStoreError, RestoreError
+from .throttle import Throttle
+from .toc import index_entries, read_archive
 
 logger = logging.getLogger(__name__)
 
+# Chunk size for streaming child process output (1MB)
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Bytes of each child process's stderr kept for error messages (64KB)
+OUTPUT_TAIL_BYTES = 64 * 1024
+
+# stderr lines forwarded to the log at WARNING instead of DEBUG
+WARNING_LINE = re.compile(r"^\S+: (?:warning|error): ")
+
+# How often a running command checks its cancel event (seconds)
+CANCEL_POLL_INTERVAL = 0.2
+
+# CPU quota of the process's cgroup (v2, then v1)
+CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+CGROUP_V1_CPU_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+CGROUP_V1_CPU_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
+
+class Sink(Protocol):
+    """Destination of a streamed command output (file, upload, throttle, ...)."""
+
+    def write(self, data: bytes, /) -> int:
+        """Write data, returning the number of bytes written."""
+        ...
+
+
 
 @dataclass
 class ProcessResult:
@@ -25,6 +69,12 @@ class ProcessResult:
     stdout: str
     stderr: str
     success: bool
+    checksum_sha256: str = ""
+    checksum_tree: dict | None = None  # Custom format: tree hash of the dump file
+    size_bytes: int = 0
+    chunks_total: int = 0  # Chunked format: chunks in the manifest
+    chunks_new: int = 0  # Chunked format: chunks not already in the store
+    stored_bytes: int = 0  # Chunked format: compressed bytes of new chunks
 
     @classmethod
     def from_completed(cls, result: subprocess.CompletedProcess[str]) -> "ProcessResult":
@@ -37,14 +87,384 @@ class ProcessResult:
         )
 
 
+@dataclass
+class ProgressEvent:
+    """One object processed by pg_dump or pg_restore, parsed from -v output."""
+
+    tool: str  # "pg_dump" or "pg_restore"
+    action: str  # e.g. "dump_table_data", "restore_table_data", "create_index"
+    target: str  # Object name as printed by the tool (e.g. "public.users")
+    started_at: datetime
+    duration_seconds: float
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON logging."""
+        return {
+            "tool": self.tool,
+            "action": self.action,
+            "target": self.target,
+            "started_at": self.started_at.isoformat(),
+            "duration_seconds": round(self.duration_seconds, 3),
+        }
+
+
+ProgressCallback = Callable[[ProgressEvent], None]
+
+# Verbose messages that start a new object, e.g.
+#   pg_dump: dumping contents of table "public.action_logs"
+#   pg_restore: processing data for table "public.users"
+#   pg_restore: creating INDEX "public.idx_users_email"
+PROGRESS_PATTERNS = [
+    (re.compile(r'^dumping contents of table "?(?P<target>[^"]+)"?$'), "dump_table_data"),
+    (re.compile(r'^processing data for table "?(?P<target>[^"]+)"?$'), "restore_table_data"),
+    (re.compile(r'^creating (?P<kind>[A-Z][A-Z ]*?) "?(?P<target>[^"]+)"?$'), "create"),
+    (re.compile(r"^reading (?P<target>.+)$"), "read_catalog"),
+]
+
+# Progress events of these actions are logged at INFO, all others at DEBUG
+DATA_ACTIONS = ("dump_table_data", "restore_table_data")
+
+
+class ProgressTracker:
+    """
+    Turns pg_dump/pg_restore -v stderr lines into timed progress events.
+
+    Both tools print a line when they start an object and work on one
+    object at a time, so an object is finished when the next one starts
+    (or the process exits). Each finished object is reported once, with
+    its duration, to the callback and to the log.
+    """
+
+    def __init__(self, tool: str, callback: ProgressCallback | None = None) -> None:
+        """
+        Initialize progress tracker.
+
+        Args:
+            tool: "pg_dump" or "pg_restore"
+            callback: Optional callable receiving every finished object
+        """
+        self.tool = tool
+        self.callback = callback
+        self.events: list[ProgressEvent] = []
+        self._prefix = re.compile(rf"^{re.escape(tool)}: (?:info: )?")
+        self._current: tuple[str, str, datetime, float] | None = None
+
+    def feed(self, line: str) -> bool:
+        """
+        Process one stderr line.
+
+        Returns:
+            True if the line started a tracked object
+        """
+        message = self._prefix.sub("", line.strip(), count=1)
+        for pattern, action in PROGRESS_PATTERNS:
+            match = pattern.match(message)
+            if match:
+                if action == "create":
+                    action = "create_" + match.group("kind").lower().replace(" ", "_")
+                self._finish_current()
+                self._current = (action, match.group("target"), datetime.now(UTC), time.monotonic())
+                return True
+        return False
+
+    def finish(self) -> None:
+        """Report the last object (call when the process has exited)."""
+        self._finish_current()
+
+    def _finish_current(self) -> None:
+        """Report the current object as finished."""
+        if self._current is None:
+            return
+        action, target, started_at, started = self._current
+        self._current = None
+        event = ProgressEvent(
+            tool=self.tool,
+            action=action,
+            target=target,
+            started_at=started_at,
+            duration_seconds=time.monotonic() - started,
+        )
+        self.events.append(event)
+
+        level = logging.INFO if action in DATA_ACTIONS else logging.DEBUG
+        logger.log(
+            level,
+            f"{self.tool}: {action} {target} ({event.duration_seconds:.2f}s)",
+            extra={"progress": event.to_dict()},
+        )
+        if self.callback:
+            try:
+                self.callback(event)
+            except Exception as e:
+                logger.warning(f"Progress callback failed: {e}")
+
+
+class OutputTail:
+    """
+    Bounded buffer of the last lines of a child process's output.
+
+    Verbose pg_dump/pg_restore output grows with the number of schema
+    objects; keeping all of it until the process exits can take hundreds
+    of MB. Only the tail is needed for error messages.
+    """
+
+    def __init__(self, max_bytes: int = OUTPUT_TAIL_BYTES) -> None:
+        """
+        Initialize output tail.
+
+        Args:
+            max_bytes: Maximum number of characters kept
+        """
+        self.max_bytes = max_bytes
+        self.dropped_lines = 0
+        self._lines: deque[str] = deque()
+        self._size = 0
+
+    def append(self, line: str) -> None:
+        """Add a line, dropping the oldest lines beyond max_bytes."""
+        line = line[-self.max_bytes:]
+        self._lines.append(line)
+        self._size += len(line)
+        while self._size > self.max_bytes:
+            self._size -= len(self._lines.popleft())
+            self.dropped_lines += 1
+
+    def text(self) -> str:
+        """Get the kept output, noting how many earlier lines were dropped."""
+        kept = "".join(self._lines)
+        if self.dropped_lines:
+            return f"[... {self.dropped_lines} earlier lines omitted]\n{kept}"
+        return kept
+
+
+def run_process(
+    cmd: list[str],
+    env: dict[str, str] | None = None,
+    sinks: list[Sink] | None = None,
+    filter_cmd: list[str] | None = None,
+    source_cmd: list[str] | None = None,
+    progress: ProgressTracker | None = None,
+    stdin_chunks: Iterable[bytes] | None = None,
+    cancel: threading.Event | None = None,
+) -> subprocess.CompletedProcess[str]:
+    """
+    Run a command on an asyncio event loop, streaming its output.
+
+    stderr of every process is read line by line while it runs: lines of
+    the command are fed to the progress tracker, all other lines are
+    forwarded to the logger, and only the last OUTPUT_TAIL_BYTES of each
+    process are kept for the result. stdout is copied to the sinks (or
+    captured).
+    The command can be fed by a source process (e.g., a decompressor) and
+    its output piped through a filter process (e.g., a compressor); the
+    processes are connected by OS pipes, so data does not pass through
+    Python on the way between them.
+
+    Sink writes run on a worker thread, so a sink that blocks (slow disk,
+    network) does not stop stderr from being read; it backpressures the
+    command through the pipe instead. stdin_chunks are pulled on a worker
+    thread too (e.g., from a network download) and written to the stdin
+    of the first process; if that process exits without reading them
+    all, the rest is left unread.
+
+    Args:
+        cmd: Command to execute
+        env: Environment for the command (None = inherit)
+        sinks: Sinks receiving stdout (an empty list
+            discards it); stdout is captured and returned as text if None
+        filter_cmd: Optional filter that the command's stdout is piped
+            through before reaching the sinks
+        source_cmd: Optional command whose stdout becomes the command's stdin
+        progress: Optional tracker receiving the command's stderr lines
+        stdin_chunks: Optional bytes fed to the stdin of the source command
+            (or of the command if there is none)
+        cancel: Optional event; once set (e.g., from another thread), all
+            processes are terminated and the command fails
+
+    Returns:
+        CompletedProcess with the command's return code (or, if it
+        succeeded, the first failing filter/source return code) and the
+        stderr tails of the command and filter
+    """
+    return asyncio.run(
+        _run_process_async(cmd, env, sinks, filter_cmd, source_cmd, progress, stdin_chunks, cancel)
+    )
+
+
+async def _run_process_async(
+    cmd: list[str],
+    env: dict[str, str] | None,
+    sinks: list[Sink] | None,
+    filter_cmd: list[str] | None,
+    source_cmd: list[str] | None,
+    progress: ProgressTracker | None,
+    stdin_chunks: Iterable[bytes] | None = None,
+    cancel: threading.Event | None = None,
+) -> subprocess.CompletedProcess[str]:
+    """Async implementation of run_process()."""
+    pipe = asyncio.subprocess.PIPE
+    procs: list[asyncio.subprocess.Process] = []
+    source = main = None
+    last = None
+    open_fds: list[int] = []
+    first_stdin: Any = pipe if stdin_chunks is not None else None
+
+    try:
+        stdin = first_stdin
+        if source_cmd:
+            read_fd, write_fd = os.pipe()
+            open_fds += [read_fd, write_fd]
+            source = await asyncio.create_subprocess_exec(
+                *source_cmd, stdin=first_stdin, stdout=write_fd, stderr=pipe
+            )
+            procs.append(source)
+            stdin = read_fd
+
+        stdout: Any = pipe
+        if filter_cmd:
+            filter_read, filter_write = os.pipe()
+            open_fds += [filter_read, filter_write]
+            stdout = filter_write
+
+        main = await asyncio.create_subprocess_exec(
+            *cmd, env=env, stdin=stdin, stdout=stdout, stderr=pipe, limit=STREAM_CHUNK_SIZE
+        )
+        procs.append(main)
+        last = main
+
+        if filter_cmd:
+            last = await asyncio.create_subprocess_exec(
+                *filter_cmd, stdin=filter_read, stdout=pipe, stderr=pipe, limit=STREAM_CHUNK_SIZE
+            )
+            procs.append(last)
+    except BaseException:
+        for proc in procs:
+            proc.kill()
+            await proc.wait()
+        raise
+    finally:
+        # The children own the pipe ends now; a producer gets SIGPIPE if its consumer dies
+        for fd in open_fds:
+            os.close(fd)
+
+    async def read_lines(
+        stream: asyncio.StreamReader,
+        tail: OutputTail,
+        tracker: ProgressTracker | None = None,
+    ) -> None:
+        while True:
+            try:
+                raw = await stream.readline()
+            except ValueError:
+                # Line longer than the stream limit; the reader has discarded it
+                tail.append("[line too long, omitted]\n")
+                continue
+            if not raw:
+                break
+            line = raw.decode("utf-8", errors="replace")
+            tail.append(line)
+            if tracker and tracker.feed(line):
+                continue
+            level = logging.WARNING if WARNING_LINE.match(line) else logging.DEBUG
+            logger.log(level, line.rstrip())
+
+    async def feed_stdin(writer: asyncio.StreamWriter, chunks: Iterable[bytes]) -> None:
+        iterator = iter(chunks)
+        try:
+            while (chunk := await asyncio.to_thread(next, iterator, None)) is not None:
+                writer.write(chunk)
+                await writer.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            # The consumer exited without reading everything
+            pass
+        finally:
+            writer.close()
+
+    async def terminate_on_cancel(event: threading.Event) -> None:
+        while not event.is_set():
+            await asyncio.sleep(CANCEL_POLL_INTERVAL)
+        logger.info(f"Terminating {cmd[0]} (cancelled)")
+        for proc in procs:
+            if proc.returncode is None:
+                proc.terminate()
+
+    async def copy_stdout(stream: asyncio.StreamReader, chunks: list[bytes]) -> None:
+        while chunk := await stream.read(STREAM_CHUNK_SIZE):
+            if sinks is None:
+                chunks.append(chunk)
+            else:
+                await asyncio.to_thread(_write_to_sinks, sinks, chunk)
+
+    main_stderr = OutputTail()
+    filter_stderr = OutputTail()
+    source_stderr = OutputTail()
+    stdout_chunks: list[bytes] = []
+
+    tasks = [
+        read_lines(main.stderr, main_stderr, progress),  # type: ignore[arg-type]
+        copy_stdout(last.stdout, stdout_chunks),  # type: ignore[arg-type]
+    ]
+    if source:
+        tasks.append(read_lines(source.stderr, source_stderr))  # type: ignore[arg-type]
+    if stdin_chunks is not None:
+        first = source or main
+        tasks.append(feed_stdin(first.stdin, stdin_chunks))  # type: ignore[arg-type]
+    if last is not main:
+        tasks.append(read_lines(last.stderr, filter_stderr))  # type: ignore[arg-type]
+
+    watcher = asyncio.create_task(terminate_on_cancel(cancel)) if cancel else None
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for proc in procs:
+            if proc.returncode is None:
+                proc.kill()
+        raise
+    finally:
+        for proc in procs:
+            await proc.wait()
+        if watcher:
+            watcher.cancel()
+        if progress:
+            progress.finish()
+
+    stderr = main_stderr.text()
+    returncode = main.returncode or 0
+    if last is not main:
+        stderr += filter_stderr.text()
+        returncode = returncode or last.returncode or 0
+    if source and returncode == 0 and source.returncode:
+        returncode = source.returncode
+        stderr = f"{source_cmd[0]} failed: {source_stderr.text()}"  # type: ignore[index]
+
+    stdout_text = b"".join(stdout_chunks).decode("utf-8", errors="replace")
+    return subprocess.CompletedProcess(cmd, returncode, stdout_text, stderr)
+
+
+def _write_to_sinks(sinks: list[Sink], chunk: bytes) -> None:
+    """Write one chunk to every sink (runs on a worker thread)."""
+    for sink in sinks:
+        sink.write(chunk)
+
+
 def run_pg_dump(
     config: PostgresConfig,
     output_path: Path,
     compression_level: int = 9,
     verbose: bool = False,
+    backup_format: str = "custom",
+    jobs: int = 1,
+    extra_sinks: list[Sink] | None = None,
+    compression: CompressionSpec | None = None,
+    snapshot: str | None = None,
+    dump_args: list[str] | None = None,
+    on_progress: ProgressCallback | None = None,
+    throttle: Throttle | None = None,
+    large_objects: bool = True,
+    cancel: threading.Event | None = None,
 ) -> ProcessResult:
     """
-    Execute pg_dump to create a custom-format backup.
+    Execute pg_dump to create a custom- or directory-format backup.
 
     Uses exact same options as current bash script:
     -Fc: Custom format (supports parallel restore)
@@ -52,14 +472,53 @@ def run_pg_dump(
     -b: Include large objects
     -v: Verbose output
 
+    Directory format (-Fd) writes one file per table and is the only
+    format pg_dump can produce in parallel (-j N), so compression of
+    large databases is spread over N cores.
+
+    Custom format is streamed through pg_dump's stdout into the output
+    file via a hashing tee, so the SHA-256 and size of the dump are known
+    as soon as pg_dump exits, without re-reading the file.
+
+    With zstd or lz4 compression, pg_dump compresses natively
+    (--compress=METHOD:LEVEL) if the client supports it; with an older
+    client, custom-format output is produced with -Z0 and piped through a
+    multithreaded external compressor before the tee (see
+    CompressionSpec.uses_external_stage()).
+
+    Chunked format streams an uncompressed custom-format dump into the
+    chunk store next to the output directory and writes a manifest to
+    output_path; only chunks not already stored are written.
+
     Args:
         config: PostgreSQL configuration
-        output_path: Path where backup will be written
-        compression_level: Compression level (0-9, default 9)
+        output_path: Path where backup will be written (a directory for -Fd,
+            the manifest for chunked format)
+        compression_level: gzip compression level (0-9, default 9)
         verbose: Enable verbose output
+        backup_format: "custom" (single .dump file), "directory" or "chunked"
+        jobs: Number of parallel dump jobs (directory format only)
+        extra_sinks: Additional sinks receiving the dump stream alongside
+            the output file, e.g. a cloud upload (custom format only)
+        compression: Compression codec settings (defaults to gzip at
+            compression_level)
+        snapshot: Exported snapshot to dump from (pg_dump --snapshot); the
+            exporting transaction must stay open until pg_dump has started
+        dump_args: Additional pg_dump arguments selecting what to dump
+            (e.g., --section=data -t TABLE for one shard of a sharded backup)
+        on_progress: Optional callable receiving a ProgressEvent per dumped
+            object (requires verbose=True)
+        throttle: Optional nice/ionice priority and stream rate limit; the
+            rate limit applies to the streamed formats (custom, chunked)
+        large_objects: Pass -b; without it pg_dump only includes large
+            objects when no -t/-n selection is given
+        cancel: Optional event that terminates pg_dump once set (the dump
+            then fails with BackupError)
 
     Returns:
-        ProcessResult with execution details
+        ProcessResult with execution details (including checksum_sha256
+        and size_bytes of the dump stream for custom and chunked format,
+        and checksum_tree of the dump file for custom format)
 
     Raises:
         BackupError: If pg_dump fails
@@ -71,50 +530,187 @@ def run_pg_dump(
         "PGUSER": config.pg_user,
     }
 
+    if compression is None:
+        compression = CompressionSpec(method="gzip", level=compression_level)
+
+    if backup_format == "directory":
+        format_args = ["-Fd", "-j", str(max(jobs, 1))]  # Directory format, parallel
+    else:
+        format_args = ["-Fc"]  # Custom format
+
+    compression_args = compression.pg_dump_args(backup_format)
+    filter_cmd = None
+    chunked = backup_format == "chunked"
+    if compression.uses_external_stage(backup_format):
+        filter_cmd = compression.compressor_cmd()
+
     cmd = [
         "pg_dump",
-        "-Fc",  # Custom format
-        f"-Z{compression_level}",  # Compression
-        "-b",  # Include large objects
+        *format_args,
+        *compression_args,  # Compression
+        *(["-b"] if large_objects else []),  # Include large objects
         "-h", config.pg_host,
         "-p", str(config.pg_port),
         "-U", config.pg_user,
         "-d", config.pg_database,
-        "-f", str(output_path),
     ]
 
+    if snapshot:
+        cmd.append(f"--snapshot={snapshot}")
+
+    if dump_args:
+        cmd.extend(dump_args)
+
     if verbose:
         cmd.append("-v")
 
     logger.info(f"Starting pg_dump for database: {config.pg_database}")
-    logger.debug(f"Command: pg_dump -Fc -Z{compression_level} -b -h {config.pg_host} ...")
+    logger.debug(
+        f"Command: pg_dump {' '.join(format_args + compression_args)}"
+        f"{' -b' if large_objects else ''} -h {config.pg_host} ..."
+        + (f" | {' '.join(filter_cmd)}" if filter_cmd else "")
+    )
+
+    progress = ProgressTracker("pg_dump", on_progress)
+    if throttle:
+        cmd = throttle.wrap_command(cmd)
 
     try:
-        result = subprocess.run(
-            cmd,
-            env=env,
-            check=True,
-            capture_output=True,
-            text=True,
-        )
+        if backup_format == "directory":
+            # Parallel workers write the files themselves, nothing to stream
+            result = run_process(
+                [*cmd, "-f", str(output_path)], env, progress=progress, cancel=cancel
+            )
+            result.check_returncode()
+            logger.info(f"pg_dump completed successfully: {output_path}")
+            return ProcessResult.from_completed(result)
+
+        try:
+            if chunked:
+                store = chunk_store_for(output_path)
+                store.compression_level = compression.chunk_level
+                sink: Any = ChunkingWriter(output_path, store)
+            else:
+                sink = open(output_path, "wb")
+            with sink:
+                writer = HashingWriter(sink, tree=not chunked)
+                result = run_process(
+                    cmd,
+                    env,
+                    # The throttle blocks before the data reaches the other sinks
+                    sinks=[*([throttle] if throttle else []), writer, *(extra_sinks or [])],
+                    filter_cmd=filter_cmd,
+                    progress=progress,
+                    cancel=cancel,
+                )
+                # Checked inside the context so a failed dump writes no manifest
+                result.check_returncode()
+        except BaseException:
+            # Never leave a truncated .dump behind for sync/retention to pick up
+            output_path.unlink(missing_ok=True)
+            raise
+
         logger.info(f"pg_dump completed successfully: {output_path}")
-        return ProcessResult.from_completed(result)
+        process_result = ProcessResult.from_completed(result)
+        process_result.checksum_sha256 = writer.hexdigest()
+        process_result.size_bytes = writer.bytes_written
+        if not chunked:
+            process_result.checksum_tree = writer.tree_hash().to_dict()  # type: ignore[union-attr]
+        if chunked:
+            process_result.chunks_total = sink.chunk_count
+            process_result.chunks_new = sink.new_chunks
+            process_result.stored_bytes = sink.new_bytes_stored
+        return process_result
     except subprocess.CalledProcessError as e:
         error_msg = f"pg_dump failed with return code {e.returncode}"
         if e.stderr:
             error_msg += f": {e.stderr}"
         logger.error(error_msg)
         raise BackupError(error_msg) from e
-    except FileNotFoundError:
-        error_msg = "pg_dump command not found. Please ensure postgresql-client is installed."
+    except FileNotFoundError as e:
+        if filter_cmd and e.filename == filter_cmd[0]:
+            error_msg = (
+                f"{filter_cmd[0]} command not found. "
+                f"Please install it to use {compression.method} compression."
+            )
+        elif e.filename in ("nice", "ionice"):
+            error_msg = f"{e.filename} command not found. Please install it or disable throttling."
+        else:
+            error_msg = "pg_dump command not found. Please ensure postgresql-client is installed."
         logger.error(error_msg)
         raise BackupError(error_msg) from None
 
 
+def available_cpus() -> int:
+    """
+    Number of CPUs this process can actually use.
+
+    The smallest of the scheduler affinity mask and the cgroup CPU quota
+    (cgroup v2 cpu.max or v1 cpu.cfs_quota_us), rounded up: inside a
+    container limited to 2 CPUs on a 16-core host this returns 2, where
+    os.cpu_count() would return 16.
+
+    Returns:
+        CPU count (at least 1)
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cpus = os.cpu_count() or 1
+
+    quota = period = None
+    try:
+        quota, period = Path(CGROUP_V2_CPU_MAX).read_text().split()[:2]
+    except (OSError, ValueError):
+        try:
+            quota = Path(CGROUP_V1_CPU_QUOTA).read_text().strip()
+            period = Path(CGROUP_V1_CPU_PERIOD).read_text().strip()
+        except OSError:
+            pass
+
+    try:
+        if quota not in (None, "max", "-1") and int(period) > 0:  # type: ignore[arg-type]
+            cpus = min(cpus, -(-int(quota) // int(period)))  # type: ignore[arg-type]
+    except ValueError:
+        pass
+    return max(1, cpus)
+
+
+def restore_parallelism(backup_path: Path, jobs: int, codec: str | None = None) -> int:
+    """
+    Number of pg_restore jobs usable for an archive.
+
+    pg_restore -j needs random access to the archive, so it works for
+    custom-format files and directory-format backups but not for dumps
+    fed through stdin (external zstd/lz4 stage, chunked manifests).
+
+    Args:
+        backup_path: Path to the archive
+        jobs: Requested number of jobs
+        codec: External codec of the archive; detected from the file if None
+
+    Returns:
+        Effective number of jobs (1 for streamed archives)
+    """
+    if jobs <= 1:
+        return 1
+    codec = codec or detect_external_codec(backup_path)
+    if codec:
+        logger.info(f"{codec} archives are streamed to pg_restore, restoring with 1 job")
+        return 1
+    return jobs
+
+
 def run_pg_restore(
     config: PostgresConfig,
     backup_path: Path,
     verbose: bool = False,
+    codec: str | None = None,
+    restore_args: list[str] | None = None,
+    on_progress: ProgressCallback | None = None,
+    jobs: int = 1,
+    source: Iterable[bytes] | None = None,
+    options: dict[str, str] | None = None,
 ) -> ProcessResult:
     """
     Execute pg_restore to restore from a custom-format backup.
@@ -125,10 +721,27 @@ def run_pg_restore(
     --no-tablespaces: Skip tablespace settings (avoids compatibility issues)
     -v: Verbose output
 
+    Dumps compressed by an external zstd/lz4 stage are decompressed on the
+    fly and fed to pg_restore through stdin; chunked backups are
+    reassembled from their manifest the same way. Such streams are always
+    restored with one job (see restore_parallelism()).
+
     Args:
         config: PostgreSQL configuration
         backup_path: Path to backup file (.dump)
         verbose: Enable verbose output
+        codec: External codec ("zstd"/"lz4"/"chunked"); detected from the
+            file if None
+        restore_args: Additional pg_restore arguments (e.g., --section=data)
+        on_progress: Optional callable receiving a ProgressEvent per restored
+            object (requires verbose=True); with jobs > 1 objects are
+            restored concurrently, so their durations are approximate
+        jobs: Parallel pg_restore jobs (-j)
+        source: Archive bytes to feed to pg_restore instead of reading
+            backup_path, which then only names the archive in logs (e.g.,
+            a download stream); codec must be given if they are compressed
+        options: Session settings of pg_restore's connections (PGOPTIONS),
+            e.g. {"synchronous_commit": "off"}
 
     Returns:
         ProcessResult with execution details
@@ -142,6 +755,8 @@ def run_pg_restore(
         "PGPORT": str(config.pg_port),
         "PGUSER": config.pg_user,
     }
+    if options:
+        env["PGOPTIONS"] = " ".join(f"-c {name}={value}" for name, value in options.items())
 
     cmd = [
         "pg_restore",
@@ -153,23 +768,47 @@ def run_pg_restore(
         "--no-privileges",
         "--no-tablespaces",
         "--use-set-session-authorization",
-        str(backup_path),
     ]
 
+    if restore_args:
+        cmd.extend(restore_args)
+
     if verbose:
         cmd.append("-v")
 
-    logger.info(f"Starting pg_restore from: {backup_path}")
+    if source is None:
+        codec = codec or detect_external_codec(backup_path)
+        jobs = restore_parallelism(backup_path, jobs, codec)
+    else:
+        jobs = 1
+    if jobs > 1:
+        cmd.extend(["-j", str(jobs)])
+
+    logger.info(f"Starting pg_restore from: {backup_path}" + (f" ({jobs} jobs)" if jobs > 1 else ""))
     logger.debug(f"Command: pg_restore -h {config.pg_host} ...")
 
     try:
-        result = subprocess.run(
-            cmd,
-            env=env,
-            check=False,  # Don't raise exception on non-zero exit
-            capture_output=True,
-            text=True,
-        )
+        progress = ProgressTracker("pg_restore", on_progress)
+        if source is not None:
+            if codec:
+                logger.info(f"Decompressing {codec} stream into pg_restore")
+            result = run_process(
+                cmd,
+                env,
+                source_cmd=decompressor_cmd(codec) if codec else None,
+                progress=progress,
+                stdin_chunks=source,
+            )
+        elif codec:
+            logger.info(f"Decompressing {codec} stream into pg_restore")
+            result = run_process(
+                cmd,
+                env,
+                source_cmd=[*decompressor_cmd(codec), str(backup_path)],
+                progress=progress,
+            )
+        else:
+            result = run_process([*cmd, str(backup_path)], env, progress=progress)
         # pg_restore returns exit code 1 if there were errors, but it may have succeeded
         # Check stderr for critical errors vs warnings (e.g., "errors ignored on restore")
         if result.returncode != 0:
@@ -185,12 +824,19 @@ def run_pg_restore(
                 raise RestoreError(error_msg) from None
         logger.info("pg_restore completed successfully")
         return ProcessResult.from_completed(result)
-    except FileNotFoundError:
-        error_msg = "pg_restore command not found. Please ensure postgresql-client is installed."
+    except FileNotFoundError as e:
+        error_msg = _command_not_found_message(e, "pg_restore")
         logger.error(error_msg)
         raise RestoreError(error_msg) from None
 
 
+def _command_not_found_message(error: FileNotFoundError, command: str) -> str:
+    """Build the error message for a missing pg_* or decompressor binary."""
+    if error.filename in ("zstd", "lz4"):
+        return f"{error.filename} command not found. Please install it to restore this backup."
+    return f"{command} command not found. Please ensure postgresql-client is installed."
+
+
 def run_psql(
     config: PostgresConfig,
     query: str,
@@ -246,21 +892,108 @@ def run_psql(
         raise BackupError(error_msg) from e
 
 
-def check_pg_ready(config: PostgresConfig, timeout: int = 60) -> bool:
+def verify_backup_format(
+    backup_path: Path,
+    codec: str | None = None,
+    index: dict[str, Any] | None = None,
+) -> bool:
     """
-    Check if PostgreSQL is ready to accept connections.
+    Verify backup file format by reading its header and TOC.
+
+    Works for both custom-format files and directory-format backups.
+    Externally compressed (zstd/lz4) dumps are decompressed and chunked
+    backups reassembled on the fly.
 
-    Uses pg_isready to test connectivity.
+    The header and TOC are parsed in Python (see utils.toc), without
+    forking pg_restore; with a TOC index they are also compared with the
+    index. Archives the Python reader cannot parse are checked with
+    pg_restore --list instead.
 
     Args:
-        config: PostgreSQL configuration
-        timeout: Maximum time to wait in seconds
+        backup_path: Path to backup file or directory
+        codec: External codec ("zstd"/"lz4"/"chunked"); detected from the
+            file if None
+        index: Optional TOC index of the backup (see utils.toc)
 
     Returns:
-        True if PostgreSQL is ready, False otherwise
+        True if backup format is valid
+
+    Raises:
+        RestoreError: If verification fails
     """
-    import time
+    codec = codec or detect_external_codec(backup_path)
+
+    try:
+        _, entries = read_archive(backup_path, codec, scan_data=False)
+    except (ArchiveFormatError, ChunkStoreError, OSError) as e:
+        if index is not None or not isinstance(e, ArchiveFormatError):
+            error_msg = f"Backup format verification failed: {e}"
+            logger.error(error_msg)
+            raise RestoreError(error_msg) from e
+        logger.debug(f"TOC reader failed ({e}), verifying with pg_restore --list")
+    else:
+        if index is not None and [e.dump_id for e in entries] != [e["id"] for e in index_entries(index)]:
+            error_msg = f"Backup format verification failed: TOC of {backup_path} does not match its index"
+            logger.error(error_msg)
+            raise RestoreError(error_msg)
+        logger.debug(f"Backup format verified ({len(entries)} TOC entries): {backup_path}")
+        return True
 
+    cmd = ["pg_restore", "-l"]
+
+    try:
+        # Only the exit status matters; the listing itself is discarded
+        if codec:
+            result = run_process(cmd, sinks=[], source_cmd=[*decompressor_cmd(codec), str(backup_path)])
+        else:
+            result = run_process([*cmd, str(backup_path)], sinks=[])
+        result.check_returncode()
+        logger.debug(f"Backup format verified: {backup_path}")
+        return True
+    except subprocess.CalledProcessError as e:
+        error_msg = f"Backup format verification failed: {e.stderr}"
+        logger.error(error_msg)
+        raise RestoreError(error_msg) from e
+    except FileNotFoundError as e:
+        error_msg = _command_not_found_message(e, "pg_restore")
+        logger.error(error_msg)
+        raise RestoreError(error_msg) from None
+
+
+def run_pg_basebackup(
+    config: PostgresConfig,
+    output_dir: Path,
+    compression_level: int = 3,
+    server_compression: bool = True,
+    verbose: bool = False,
+    throttle: Throttle | None = None,
+) -> ProcessResult:
+    """
+    Execute pg_basebackup to create a physical, tar-format base backup.
+
+    -Ft: Tar format (base.tar plus one tar per tablespace)
+    -X stream: Stream the WAL needed for consistency into pg_wal.tar
+    --compress: zstd, on the server (PostgreSQL 15+) or on the client
+
+    Server-side compression keeps the network transfer small and moves the
+    compression work off the backup container. Requires a user with the
+    REPLICATION attribute and a matching pg_hba.conf replication entry.
+
+    Args:
+        config: PostgreSQL configuration
+        output_dir: Directory to create (must not exist or be empty)
+        compression_level: zstd compression level (1-19)
+        server_compression: Compress on the server instead of the client
+        verbose: Enable verbose output
+        throttle: Optional nice/ionice priority; its rate limit is passed
+            to the server as --max-rate
+
+    Returns:
+        ProcessResult with execution details
+
+    Raises:
+        BackupError: If pg_basebackup fails
+    """
     env = {
         "PGPASSWORD": config.pg_password,
         "PGHOST": config.pg_host,
@@ -268,65 +1001,169 @@ def check_pg_ready(config: PostgresConfig, timeout: int = 60) -> bool:
         "PGUSER": config.pg_user,
     }
 
+    location = "server" if server_compression else "client"
+    compress_arg = f"--compress={location}-zstd:{compression_level}"
+
     cmd = [
-        "pg_isready",
+        "pg_basebackup",
         "-h", config.pg_host,
         "-p", str(config.pg_port),
         "-U", config.pg_user,
-        "-d", config.pg_database,
+        "-D", str(output_dir),
+        "-Ft",  # Tar format
+        "-X", "stream",  # Include WAL required to make the backup consistent
+        compress_arg,
+        "--no-password",
     ]
 
-    start = time.time()
-    while time.time() - start < timeout:
-        try:
-            result = subprocess.run(
-                cmd,
-                env=env,
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            # pg_isready returns 0 if accepting connections
-            if result.returncode == 0:
-                logger.info("PostgreSQL is ready")
-                return True
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-        time.sleep(2)
+    if verbose:
+        cmd.append("-v")
+
+    if throttle:
+        if throttle.limits_rate:
+            # pg_basebackup accepts 32 kB/s to 1 GB/s
+            max_rate_kb = min(max(throttle.rate // 1024, 32), 1024**2)
+            cmd.append(f"--max-rate={max_rate_kb}k")
+        cmd = throttle.wrap_command(cmd)
+
+    logger.info(f"Starting pg_basebackup from {config.pg_host}:{config.pg_port}")
+    logger.debug(f"Command: pg_basebackup -Ft -X stream {compress_arg} -D {output_dir} ...")
 
-    logger.warning(f"PostgreSQL not ready after {timeout}s")
-    return False
+    try:
+        result = run_process(cmd, env)
+        result.check_returncode()
+        logger.info(f"pg_basebackup completed successfully: {output_dir}")
+        return ProcessResult.from_completed(result)
+    except subprocess.CalledProcessError as e:
+        error_msg = f"pg_basebackup failed with return code {e.returncode}"
+        if e.stderr:
+            error_msg += f": {e.stderr}"
+        logger.error(error_msg)
+        raise BackupError(error_msg) from e
+    except FileNotFoundError as e:
+        if e.filename in ("nice", "ionice"):
+            error_msg = f"{e.filename} command not found. Please install it or disable throttling."
+        else:
+            error_msg = "pg_basebackup command not found. Please ensure postgresql-client is installed."
+        logger.error(error_msg)
+        raise BackupError(error_msg) from None
 
 
-def verify_backup_format(backup_path: Path) -> bool:
+def extract_tar_archive(archive: Path, destination: Path) -> None:
     """
-    Verify backup file format using pg_restore --list.
+    Extract a (possibly zstd, lz4 or gzip compressed) tar archive.
 
     Args:
-        backup_path: Path to backup file
+        archive: Path to .tar, .tar.zst, .tar.lz4 or .tar.gz file
+        destination: Directory to extract into (created if missing)
+
+    Raises:
+        RestoreError: If extraction fails
+    """
+    suffix_args = {
+        ".zst": ["-I", "zstd"],
+        ".lz4": ["-I", "lz4"],
+        ".gz": ["-z"],
+    }
+    cmd = [
+        "tar",
+        "-x",
+        *suffix_args.get(archive.suffix, []),
+        "-f", str(archive),
+        "-C", str(destination),
+    ]
+
+    destination.mkdir(parents=True, exist_ok=True)
+    logger.info(f"Extracting {archive.name} into {destination}")
+
+    try:
+        subprocess.run(cmd, check=True, capture_output=True, text=True)
+    except subprocess.CalledProcessError as e:
+        error_msg = f"Failed to extract {archive}: {e.stderr}"
+        logger.error(error_msg)
+        raise RestoreError(error_msg) from e
+    except FileNotFoundError as e:
+        error_msg = f"{e.filename or 'tar'} command not found. Please install it to restore this backup."
+        logger.error(error_msg)
+        raise RestoreError(error_msg) from None
+
+
+def _pg_server_command(name: str, pg_bin_dir: Path | None) -> str:
+    """Resolve a server binary (pg_ctl, ...) from pg_bin_dir or PATH."""
+    return str(pg_bin_dir / name) if pg_bin_dir else name
+
+
+def start_postgres_server(
+    data_dir: Path,
+    port: int,
+    pg_bin_dir: Path | None = None,
+    timeout: int = 600,
+) -> ProcessResult:
+    """
+    Start a PostgreSQL server on a restored data directory with pg_ctl.
+
+    The server listens on localhost only and waits until crash recovery
+    (replaying the WAL shipped with the base backup) has finished.
+
+    Args:
+        data_dir: Data directory
+        port: TCP port to listen on
+        pg_bin_dir: Directory containing pg_ctl/postgres (default: PATH)
+        timeout: Seconds to wait for startup
 
     Returns:
-        True if backup format is valid
+        ProcessResult with execution details
 
     Raises:
-        RestoreError: If verification fails
+        RestoreError: If the server fails to start
     """
-    cmd = ["pg_restore", "-l", str(backup_path)]
+    log_file = data_dir / "restore_server.log"
+    options = f"-p {port} -c listen_addresses=localhost -c unix_socket_directories=/tmp"
+    cmd = [
+        _pg_server_command("pg_ctl", pg_bin_dir),
+        "-D", str(data_dir),
+        "-o", options,
+        "-l", str(log_file),
+        "-w",
+        "-t", str(timeout),
+        "start",
+    ]
+
+    logger.info(f"Starting PostgreSQL on port {port} from {data_dir}")
 
     try:
-        subprocess.run(
-            cmd,
-            check=True,
-            capture_output=True,
-            text=True,
-        )
-        logger.debug(f"Backup format verified: {backup_path}")
-        return True
+        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        return ProcessResult.from_completed(result)
     except subprocess.CalledProcessError as e:
-        error_msg = f"Backup format verification failed: {e.stderr}"
+        error_msg = f"pg_ctl start failed: {e.stderr or e.stdout} (see {log_file})"
         logger.error(error_msg)
         raise RestoreError(error_msg) from e
     except FileNotFoundError:
-        error_msg = "pg_restore command not found. Please ensure postgresql-client is installed."
+        error_msg = (
+            "pg_ctl command not found. Physical restores need the PostgreSQL server "
+            "binaries of the backup's major version (see --pg-bin-dir)."
+        )
         logger.error(error_msg)
         raise RestoreError(error_msg) from None
+
+
+def stop_postgres_server(data_dir: Path, pg_bin_dir: Path | None = None) -> bool:
+    """
+    Stop a server started by start_postgres_server (fast shutdown).
+
+    Args:
+        data_dir: Data directory
+        pg_bin_dir: Directory containing pg_ctl (default: PATH)
+
+    Returns:
+        True if the server was stopped
+    """
+    cmd = [_pg_server_command("pg_ctl", pg_bin_dir), "-D", str(data_dir), "-m", "fast", "-w", "stop"]
+
+    try:
+        subprocess.run(cmd, check=True, capture_output=True, text=True)
+        logger.info(f"Stopped PostgreSQL for {data_dir}")
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        logger.warning(f"Failed to stop PostgreSQL for {data_dir}: {e}")
+        return False
@@ -0,0 +1,113 @@
+"""
+Throttling of dump processes.
+
+Lowers the CPU and I/O priority of pg_dump (nice/ionice) and caps the rate
+of its output stream with a token bucket. A capped stream backpressures
+pg_dump through the pipe, which in turn slows the server-side COPY, so the
+limit also applies to the reads a dump causes on the database server.
+"""
+
+import logging
+import threading
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# ionice scheduling classes (see ionice(1)); best-effort runs at its lowest priority
+IONICE_CLASSES = {
+    "best-effort": ["-c", "2", "-n", "7"],
+    "idle": ["-c", "3"],
+}
+
+
+class Throttle:
+    """
+    Process priority and byte-rate limit for one backup.
+
+    Used as a sink in front of the dump's other sinks: write() blocks as
+    long as needed to keep the stream under the rate limit. It is
+    thread-safe, so concurrent dumps (e.g., shards of a sharded backup)
+    can share one limit.
+    """
+
+    def __init__(
+        self,
+        nice: int = 0,
+        ionice_class: str | None = None,
+        rate_bytes_per_second: int = 0,
+    ) -> None:
+        """
+        Initialize throttle.
+
+        Args:
+            nice: Niceness added to the child process (0-19, 0 = unchanged)
+            ionice_class: "best-effort", "idle" or None (unchanged)
+            rate_bytes_per_second: Stream rate limit (0 = unlimited)
+        """
+        if ionice_class is not None and ionice_class not in IONICE_CLASSES:
+            raise ValueError(f"Invalid ionice class: {ionice_class}")
+
+        self.nice = nice
+        self.ionice_class = ionice_class
+        self.rate = rate_bytes_per_second
+        # Allow bursts of up to one second of data
+        self._capacity = float(rate_bytes_per_second)
+        self._tokens = self._capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+        self.bytes_written = 0
+        self.throttled_seconds = 0.0
+
+    @property
+    def limits_rate(self) -> bool:
+        """Whether a byte-rate limit is set."""
+        return self.rate > 0
+
+    def wrap_command(self, cmd: list[str]) -> list[str]:
+        """
+        Prefix a command with ionice and nice as configured.
+
+        Args:
+            cmd: Command to run
+
+        Returns:
+            Command list (unchanged if no priority is configured)
+        """
+        prefix: list[str] = []
+        if self.ionice_class:
+            prefix += ["ionice", *IONICE_CLASSES[self.ionice_class]]
+        if self.nice:
+            prefix += ["nice", "-n", str(self.nice)]
+        return [*prefix, *cmd]
+
+    def write(self, data: bytes) -> int:
+        """
+        Account for data, blocking while the stream is over the rate limit.
+
+        The bucket may go into debt for a large write; the writer then
+        sleeps until the debt is paid off.
+        """
+        with self._lock:
+            self.bytes_written += len(data)
+            if not self.limits_rate:
+                return len(data)
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= len(data)
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.throttled_seconds += wait
+
+        if wait:
+            time.sleep(wait)
+        return len(data)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert settings and statistics to a dictionary for JSON metadata."""
+        return {
+            "nice": self.nice,
+            "ionice_class": self.ionice_class,
+            "rate_limit_bytes_per_second": self.rate,
+            "throttled_seconds": round(self.throttled_seconds, 2),
+        }
@@ -0,0 +1,726 @@
+"""
+pg_dump archive TOC reader and TOC index sidecar.
+
+Parses the header and table of contents of custom- and directory-format
+archives in pure Python (the format of pg_backup_archiver.c) and locates
+each entry's data block. The result is saved as a compact index next to
+the backup's .json, so verification, restore planning and listing tools
+do not have to run pg_restore --list over the whole archive again.
+
+The index (<backup>.toc.json):
+
+    {
+      "version": 1,
+      "archive": {"format": "custom", "version": "1.15.0", ...},
+      "columns": ["id", "type", "section", "schema", "name", "offset", "length", "deps"],
+      "entries": [[215, "TABLE DATA", "data", "public", "users", 10534, 81920, [214]], ...]
+    }
+
+offset is the position of the entry's data block in the (uncompressed)
+archive stream and length its size, i.e. the data as compressed by
+pg_dump. Directory-format entries have the data file's name as offset
+and its size as length; entries without data have null for both.
+"""
+
+import json
+import logging
+import subprocess
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any
+
+from .chunking import iter_manifest_data
+from .compression import CHUNKED_CODEC, decompressor_cmd, detect_external_codec
+from .exceptions import ArchiveFormatError
+
+logger = logging.getLogger(__name__)
+
+TOC_INDEX_SUFFIX = ".toc.json"
+TOC_INDEX_VERSION = 1
+TOC_INDEX_COLUMNS = ["id", "type", "section", "schema", "name", "offset", "length", "deps"]
+
+ARCHIVE_MAGIC = b"PGDMP"
+
+# Archive format codes
+ARCHIVE_FORMATS = {1: "custom", 3: "tar", 4: "null", 5: "directory"}
+
+# Compression algorithms (archive version 1.15+)
+COMPRESSION_ALGORITHMS = {0: "none", 1: "gzip", 2: "lz4", 3: "zstd"}
+
+# TOC entry sections
+SECTIONS = {1: "none", 2: "pre-data", 3: "data", 4: "post-data"}
+
+# Entry types a selective restore matches by relation name
+RELATION_TYPES = {
+    "TABLE",
+    "TABLE DATA",
+    "VIEW",
+    "SEQUENCE",
+    "SEQUENCE SET",
+    "MATERIALIZED VIEW",
+    "MATERIALIZED VIEW DATA",
+    "FOREIGN TABLE",
+}
+
+# Entry types a selective restore includes when they depend on a selected
+# entry (a SEQUENCE depending on a table is an identity column's sequence)
+DEPENDENT_TYPES = {
+    "TABLE DATA",
+    "SEQUENCE",
+    "SEQUENCE OWNED BY",
+    "SEQUENCE SET",
+    "MATERIALIZED VIEW DATA",
+    "DEFAULT",
+    "INDEX",
+    "INDEX ATTACH",
+    "CONSTRAINT",
+    "CHECK CONSTRAINT",
+    "TRIGGER",
+    "RULE",
+    "POLICY",
+    "ROW SECURITY",
+    "STATISTICS",
+    "COMMENT",
+    "SECURITY LABEL",
+    "ACL",
+}
+
+# Entry types a selective restore includes only when everything they depend
+# on is selected: a foreign key needs both its table and the referenced key
+FULLY_DEPENDENT_TYPES = {"FK CONSTRAINT"}
+
+# Data block types of custom-format archives
+BLOCK_DATA = 1
+BLOCK_BLOBS = 3
+
+# Data offset states of custom-format TOC entries
+OFFSET_NO_DATA = 3
+
+# Read size when skipping data on non-seekable streams
+SKIP_CHUNK_SIZE = 1024 * 1024
+
+
+def _version(major: int, minor: int, rev: int = 0) -> int:
+    """Encode an archive version like MAKE_ARCHIVE_VERSION."""
+    return (major << 16) | (minor << 8) | rev
+
+
+@dataclass
+class ArchiveHeader:
+    """Header of a pg_dump archive."""
+
+    version: int
+    int_size: int
+    off_size: int
+    format: str
+    compression: str
+    created: str = ""  # Dump start, local time of the dumping host (ISO 8601)
+    database: str = ""
+    server_version: str = ""
+    dump_version: str = ""
+
+    @property
+    def version_str(self) -> str:
+        """Archive version as "major.minor.rev"."""
+        return f"{self.version >> 16}.{(self.version >> 8) & 0xFF}.{self.version & 0xFF}"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for the TOC index."""
+        return {
+            "format": self.format,
+            "version": self.version_str,
+            "compression": self.compression,
+            "created": self.created,
+            "database": self.database,
+            "server_version": self.server_version,
+            "dump_version": self.dump_version,
+        }
+
+
+@dataclass
+class TocEntry:
+    """One entry of an archive's table of contents."""
+
+    dump_id: int
+    had_dumper: bool
+    desc: str
+    section: str
+    tag: str
+    namespace: str
+    owner: str
+    dependencies: list[int] = field(default_factory=list)
+    data_file: str | None = None  # Directory format
+    offset: int | str | None = None
+    length: int | None = None
+
+    def to_row(self) -> list[Any]:
+        """Convert to a TOC index row (see TOC_INDEX_COLUMNS)."""
+        return [
+            self.dump_id,
+            self.desc,
+            self.section,
+            self.namespace,
+            self.tag,
+            self.offset,
+            self.length,
+            self.dependencies,
+        ]
+
+
+class ArchiveReader:
+    """
+    Sequential reader of the archive format's primitive types.
+
+    Tracks the stream position so data block offsets can be recorded
+    without a seekable stream.
+    """
+
+    def __init__(self, stream: IO[bytes]) -> None:
+        """
+        Initialize reader.
+
+        Args:
+            stream: Binary stream positioned at the start of the archive
+        """
+        self.stream = stream
+        self.position = 0
+        self.int_size = 4
+        self.off_size = 8
+        self.version = 0
+        try:
+            self._seekable = stream.seekable()
+        except (AttributeError, OSError):
+            self._seekable = False
+
+    def read(self, n: int) -> bytes:
+        """Read exactly n bytes."""
+        data = self.stream.read(n)
+        while len(data) < n:
+            more = self.stream.read(n - len(data))
+            if not more:
+                raise ArchiveFormatError(f"Unexpected end of archive at byte {self.position + len(data)}")
+            data += more
+        self.position += n
+        return data
+
+    def skip(self, n: int) -> None:
+        """Skip n bytes (seeking if the stream allows it)."""
+        if self._seekable:
+            self.stream.seek(n, 1)
+            self.position += n
+            return
+        while n:
+            step = min(n, SKIP_CHUNK_SIZE)
+            self.read(step)
+            n -= step
+
+    def read_byte(self) -> int:
+        """Read one unsigned byte."""
+        return self.read(1)[0]
+
+    def read_int(self) -> int:
+        """Read a sign byte followed by an int_size little-endian magnitude (ReadInt)."""
+        raw = self.read(1 + self.int_size)
+        value = int.from_bytes(raw[1:], "little")
+        return -value if raw[0] else value
+
+    def read_str(self) -> str | None:
+        """Read a length-prefixed string; None for a NULL string (ReadStr)."""
+        length = self.read_int()
+        if length < 0:
+            return None
+        return self.read(length).decode("utf-8", errors="replace")
+
+    def read_offset(self) -> tuple[int, int]:
+        """Read a data offset (flag byte + off_size bytes) as (state, offset)."""
+        state = self.read_byte()
+        return state, int.from_bytes(self.read(self.off_size), "little")
+
+    def read_header(self) -> ArchiveHeader:
+        """
+        Read the archive header (ReadHead).
+
+        Raises:
+            ArchiveFormatError: If the stream is not a pg_dump archive
+        """
+        if self.read(5) != ARCHIVE_MAGIC:
+            raise ArchiveFormatError("Not a pg_dump archive (missing PGDMP magic)")
+
+        major, minor = self.read_byte(), self.read_byte()
+        rev = self.read_byte() if major > 1 or (major == 1 and minor > 0) else 0
+        self.version = _version(major, minor, rev)
+        if self.version < _version(1, 12):
+            raise ArchiveFormatError(f"Unsupported archive version {major}.{minor}.{rev}")
+
+        self.int_size = self.read_byte()
+        self.off_size = self.read_byte()
+        format_code = self.read_byte()
+
+        if self.version >= _version(1, 15):
+            compression = COMPRESSION_ALGORITHMS.get(self.read_byte(), "unknown")
+        else:
+            compression = "gzip" if self.read_int() != 0 else "none"
+
+        # Creation date as a struct tm: sec, min, hour, mday, mon (0-11), year - 1900, isdst
+        sec, minute, hour, mday, mon, year, _ = (self.read_int() for _ in range(7))
+        try:
+            created = datetime(year + 1900, mon + 1, mday, hour, minute, sec).isoformat()
+        except ValueError:
+            created = ""
+
+        return ArchiveHeader(
+            version=self.version,
+            int_size=self.int_size,
+            off_size=self.off_size,
+            format=ARCHIVE_FORMATS.get(format_code, f"unknown ({format_code})"),
+            compression=compression,
+            created=created,
+            database=self.read_str() or "",
+            server_version=self.read_str() or "",
+            dump_version=self.read_str() or "",
+        )
+
+    def read_toc(self, archive_format: str) -> list[TocEntry]:
+        """
+        Read the table of contents (ReadToc).
+
+        Args:
+            archive_format: "custom" or "directory" (decides the
+                format-specific part of each entry)
+
+        Returns:
+            Entries in archive order
+        """
+        entries = []
+        for _ in range(self.read_int()):
+            dump_id = self.read_int()
+            had_dumper = bool(self.read_int())
+            self.read_str()  # Catalog tableoid
+            self.read_str()  # Catalog oid
+            tag = self.read_str() or ""
+            desc = self.read_str() or ""
+            section = SECTIONS.get(self.read_int(), "none")
+            self.read_str()  # Definition
+            self.read_str()  # Drop statement
+            self.read_str()  # COPY statement
+            namespace = self.read_str() or ""
+            self.read_str()  # Tablespace
+            if self.version >= _version(1, 14):
+                self.read_str()  # Table access method
+            if self.version >= _version(1, 16):
+                self.read_int()  # relkind
+            owner = self.read_str() or ""
+            self.read_str()  # WITH OIDS flag
+
+            dependencies = []
+            while (dep := self.read_str()) is not None:
+                dependencies.append(int(dep))
+
+            entry = TocEntry(
+                dump_id=dump_id,
+                had_dumper=had_dumper,
+                desc=desc,
+                section=section,
+                tag=tag,
+                namespace=namespace,
+                owner=owner,
+                dependencies=dependencies,
+            )
+            if archive_format == "custom":
+                state, offset = self.read_offset()
+                if state == OFFSET_NO_DATA:
+                    entry.had_dumper = False
+            elif archive_format == "directory":
+                entry.data_file = self.read_str() or None
+            entries.append(entry)
+        return entries
+
+    def scan_data_blocks(self) -> Iterator[tuple[int, int, int]]:
+        """
+        Walk the data blocks that follow the TOC of a custom-format archive.
+
+        Yields:
+            (dump_id, offset, length) of every data block
+        """
+        while True:
+            start = self.position
+            kind = self.stream.read(1)
+            if not kind:
+                return
+            self.position += 1
+            dump_id = self.read_int()
+            if kind[0] == BLOCK_DATA:
+                self._skip_chunks()
+            elif kind[0] == BLOCK_BLOBS:
+                while self.read_int() != 0:  # Large object oid, 0 ends the block
+                    self._skip_chunks()
+            else:
+                raise ArchiveFormatError(f"Unknown data block type {kind[0]} at byte {start}")
+            yield dump_id, start, self.position - start
+
+    def _skip_chunks(self) -> None:
+        """Skip length-prefixed data chunks up to the terminating zero length."""
+        while (length := self.read_int()) != 0:
+            self.skip(length)
+
+
+class _IteratorStream:
+    """Minimal read()-only stream over an iterator of byte chunks."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._buffer = b""
+        self._pos = 0
+
+    def read(self, n: int) -> bytes:
+        # Serve small reads from the current chunk without copying the rest of it
+        if self._pos + n > len(self._buffer):
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+            while len(self._buffer) < n:
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    break
+                self._buffer += chunk
+        data = self._buffer[self._pos:self._pos + n]
+        self._pos += len(data)
+        return data
+
+    def seekable(self) -> bool:
+        return False
+
+
+def _read_custom(stream: IO[bytes], scan_data: bool) -> tuple[ArchiveHeader, list[TocEntry]]:
+    """Read header and TOC of a custom-format stream, locating the data blocks."""
+    reader = ArchiveReader(stream)
+    header = reader.read_header()
+    if header.format != "custom":
+        raise ArchiveFormatError(f"Expected a custom-format archive, got {header.format}")
+    entries = reader.read_toc("custom")
+
+    if scan_data:
+        by_id = {entry.dump_id: entry for entry in entries}
+        for dump_id, offset, length in reader.scan_data_blocks():
+            if dump_id in by_id:
+                by_id[dump_id].offset = offset
+                by_id[dump_id].length = length
+    return header, entries
+
+
+@contextmanager
+def _open_archive(backup_path: Path, codec: str | None) -> Iterator[IO[bytes]]:
+    """
+    Open the archive stream of a custom-format backup.
+
+    Externally compressed dumps are read through their decompressor
+    (stopped early if the caller reads only the beginning) and chunked
+    backups reassembled from the chunk store.
+    """
+    codec = codec or detect_external_codec(backup_path)
+    if codec == CHUNKED_CODEC:
+        yield _IteratorStream(iter_manifest_data(backup_path))  # type: ignore[misc]
+        return
+
+    if codec:
+        proc = subprocess.Popen(
+            [*decompressor_cmd(codec), str(backup_path)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            yield proc.stdout  # type: ignore[misc]
+        finally:
+            proc.stdout.close()  # type: ignore[union-attr]
+            proc.kill()
+            proc.wait()
+        return
+
+    with open(backup_path, "rb") as f:
+        yield f
+
+
+def read_archive_header(backup_path: Path, codec: str | None = None) -> ArchiveHeader:
+    """
+    Read only the header of a custom- or directory-format backup.
+
+    Reads a few hundred bytes, so it is cheap enough to run for every
+    backup in a listing.
+
+    Args:
+        backup_path: .dump file, .manifest or directory-format .dir
+        codec: External codec ("zstd"/"lz4"/"chunked"); detected if None
+
+    Returns:
+        ArchiveHeader (version, format, compression, dump time, versions)
+
+    Raises:
+        ArchiveFormatError: If the file is not a pg_dump archive
+    """
+    if backup_path.is_dir():
+        toc_path = backup_path / "toc.dat"
+        if not toc_path.is_file():
+            raise ArchiveFormatError(f"No toc.dat in {backup_path}")
+        with open(toc_path, "rb") as f:
+            return ArchiveReader(f).read_header()
+
+    with _open_archive(backup_path, codec) as stream:
+        return ArchiveReader(stream).read_header()
+
+
+def read_archive(
+    backup_path: Path,
+    codec: str | None = None,
+    scan_data: bool = True,
+) -> tuple[ArchiveHeader, list[TocEntry]]:
+    """
+    Read the header and TOC of a custom- or directory-format backup.
+
+    Args:
+        backup_path: .dump file, .manifest or directory-format .dir
+        codec: External codec ("zstd"/"lz4"/"chunked"); detected if None
+        scan_data: Also locate every entry's data block (reads the whole
+            archive; only the chunk headers if the file can be seeked)
+
+    Returns:
+        Tuple of (header, entries)
+
+    Raises:
+        ArchiveFormatError: If the archive cannot be parsed
+    """
+    if backup_path.is_dir():
+        toc_path = backup_path / "toc.dat"
+        if not toc_path.is_file():
+            raise ArchiveFormatError(f"No toc.dat in {backup_path}")
+        with open(toc_path, "rb") as f:
+            reader = ArchiveReader(f)
+            header = reader.read_header()
+            entries = reader.read_toc("directory")
+        for entry in entries:
+            if entry.data_file and (backup_path / entry.data_file).is_file():
+                entry.offset = entry.data_file
+                entry.length = (backup_path / entry.data_file).stat().st_size
+        return header, entries
+
+    with _open_archive(backup_path, codec) as stream:
+        return _read_custom(stream, scan_data)
+
+
+def toc_index_path(backup_path: Path) -> Path:
+    """Get the TOC index sidecar path of a backup (next to its .json)."""
+    return backup_path.with_suffix(TOC_INDEX_SUFFIX)
+
+
+def build_toc_index(backup_path: Path, codec: str | None = None) -> dict[str, Any]:
+    """
+    Build the TOC index of a backup archive.
+
+    Args:
+        backup_path: .dump file, .manifest or directory-format .dir
+        codec: External codec; detected if None
+
+    Returns:
+        TOC index dictionary
+
+    Raises:
+        ArchiveFormatError: If the archive cannot be parsed
+    """
+    header, entries = read_archive(backup_path, codec)
+    return {
+        "version": TOC_INDEX_VERSION,
+        "archive": header.to_dict(),
+        "columns": TOC_INDEX_COLUMNS,
+        "entries": [entry.to_row() for entry in entries],
+    }
+
+
+def save_toc_index(index_path: Path, index: dict[str, Any]) -> None:
+    """
+    Save a TOC index as compact JSON (one line, no indentation).
+
+    Args:
+        index_path: Sidecar path
+        index: Index from build_toc_index()
+    """
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, separators=(",", ":"))
+    tmp_path.replace(index_path)
+    logger.debug(f"TOC index saved to: {index_path}")
+
+
+def load_toc_index(backup_path: Path) -> dict[str, Any] | None:
+    """
+    Load the TOC index sidecar of a backup.
+
+    Args:
+        backup_path: Backup path (the sidecar is looked up next to it)
+
+    Returns:
+        Index dictionary, or None if there is no usable sidecar
+    """
+    index_path = toc_index_path(backup_path)
+    if not index_path.is_file():
+        return None
+    try:
+        with open(index_path) as f:
+            index: dict[str, Any] = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable TOC index {index_path}: {e}")
+        return None
+    if index.get("version") != TOC_INDEX_VERSION:
+        logger.warning(f"Ignoring TOC index {index_path} of unsupported version {index.get('version')}")
+        return None
+    return index
+
+
+def index_entries(index: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Expand the rows of a TOC index into dictionaries.
+
+    Sharded backups' indexes hold one index per shard under "shards";
+    their entries get a "file" key.
+
+    Args:
+        index: Index from build_toc_index() or load_toc_index()
+
+    Returns:
+        One dictionary per TOC entry, keyed by TOC_INDEX_COLUMNS
+    """
+    if "shards" in index:
+        return [
+            {**entry, "file": filename}
+            for filename, shard_index in index["shards"].items()
+            for entry in index_entries(shard_index)
+        ]
+    columns = index["columns"]
+    return [dict(zip(columns, row)) for row in index["entries"]]
+
+
+def format_toc_listing(index: dict[str, Any]) -> list[str]:
+    """
+    Format a TOC index like pg_restore --list.
+
+    The lines can be edited and passed to pg_restore -L, which only reads
+    the dump id before the semicolon.
+
+    Args:
+        index: TOC index (not sharded)
+
+    Returns:
+        One line per TOC entry
+    """
+    return format_restore_list(index_entries(index)).splitlines()
+
+
+def _entry_section(entry: dict[str, Any], by_id: dict[int, dict[str, Any]]) -> str:
+    """
+    Section of a TOC entry for filtering.
+
+    Comments, ACLs and security labels are stored with section "none";
+    they belong to the section of the object they are attached to.
+    """
+    seen: set[int] = set()
+    while entry["section"] == "none" and entry["deps"] and entry["id"] not in seen:
+        seen.add(entry["id"])
+        parent = by_id.get(entry["deps"][0])
+        if parent is None:
+            break
+        entry = parent
+    return entry["section"] if entry["section"] != "none" else "pre-data"
+
+
+def _matches_relation(entry: dict[str, Any], name: str) -> bool:
+    """Check whether an entry is the relation (or its data) named "schema.name" or "name"."""
+    if entry["type"] not in RELATION_TYPES:
+        return False
+    schema, _, relation = name.rpartition(".")
+    return entry["name"] == relation and (not schema or entry["schema"] == schema)
+
+
+def select_toc_entries(
+    entries: list[dict[str, Any]],
+    tables: list[str] | None = None,
+    schemas: list[str] | None = None,
+    sections: list[str] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Select the TOC entries a selective restore needs, with their dependents.
+
+    Tables (also views, sequences and materialized views) are matched by
+    "schema.name" or by name in any schema; schemas select every object
+    in them. Objects that depend on a selected object and only make sense
+    with it are added automatically: its data, indexes, constraints,
+    triggers, defaults, comments and ACLs, plus sequences used by its
+    column defaults or identity columns. A foreign key is only added when
+    the referencing and the referenced table are both selected, since
+    pg_restore could not create it otherwise. Without tables and schemas,
+    all entries are selected. The section filter applies last.
+
+    Args:
+        entries: TOC entries (from index_entries())
+        tables: Relation names to restore
+        schemas: Schema names to restore
+        sections: Sections to restore ("pre-data", "data", "post-data");
+            all if empty
+
+    Returns:
+        Selected entries, in archive order
+    """
+    by_id = {entry["id"]: entry for entry in entries}
+
+    if tables or schemas:
+        selected = {
+            entry["id"]
+            for entry in entries
+            if any(_matches_relation(entry, name) for name in tables or [])
+            or entry["schema"] in (schemas or [])
+            or (entry["type"] == "SCHEMA" and entry["name"] in (schemas or []))
+        }
+    else:
+        selected = set(by_id)
+
+    # Pull in dependents (and sequences behind column defaults) until nothing changes
+    changed = True
+    while changed:
+        changed = False
+        for entry in entries:
+            if entry["id"] in selected:
+                if entry["type"] == "DEFAULT":
+                    for dep in entry["deps"]:
+                        if dep not in selected and by_id.get(dep, {}).get("type") == "SEQUENCE":
+                            selected.add(dep)
+                            changed = True
+                continue
+            if entry["type"] in FULLY_DEPENDENT_TYPES:
+                deps = [dep for dep in entry["deps"] if dep in by_id]
+                wanted = bool(deps) and selected.issuperset(deps)
+            else:
+                wanted = entry["type"] in DEPENDENT_TYPES and bool(selected.intersection(entry["deps"]))
+            if wanted:
+                selected.add(entry["id"])
+                changed = True
+
+    return [
+        entry
+        for entry in entries
+        if entry["id"] in selected
+        and (not sections or _entry_section(entry, by_id) in sections)
+    ]
+
+
+def format_restore_list(entries: list[dict[str, Any]]) -> str:
+    """
+    Format TOC entries as a pg_restore -L list file.
+
+    Args:
+        entries: Entries to restore, in archive order
+
+    Returns:
+        List file content
+    """
+    return "".join(
+        f"{e['id']}; {e['type']} {e['schema'] or '-'} {e['name']}\n" for e in entries
+    )
@@ -0,0 +1,124 @@
+"""Tests for logical backup creation with a streamed cloud copy."""
+
+from contextlib import nullcontext
+
+import pytest
+
+from backup_postgres.cloud.gcs_storage import UploadResult
+from backup_postgres.config.settings import PostgresConfig
+from backup_postgres.core import backup
+from backup_postgres.core.backup import BackupManager
+from backup_postgres.core.models import MigrationInfo, TableCounts
+from backup_postgres.core.routing import BackupSource
+from backup_postgres.utils.subprocess import ProcessResult
+
+
+class FakeUpload:
+    def __init__(self, key):
+        self.key = key
+        self.data = b""
+        self.closed = False
+        self.aborted = False
+
+    def write(self, data):
+        self.data += data
+        return len(data)
+
+    def close(self):
+        self.closed = True
+        return UploadResult(success=True, key=self.key, size_bytes=len(self.data))
+
+    def abort(self):
+        self.aborted = True
+
+
+class FakeCloud:
+    def __init__(self):
+        self.uploads = []
+        self.files = []
+
+    def backup_key(self, backup_type, filename):
+        return f"root/{backup_type}/{filename}"
+
+    def open_stream_upload(self, key):
+        self.uploads.append(FakeUpload(key))
+        return self.uploads[-1]
+
+    def upload_file(self, path, key):
+        self.files.append(key)
+        return UploadResult(success=True, key=key, size_bytes=path.stat().st_size)
+
+    def upload_toc_index(self, backup_path, key):
+        pass
+
+
+class FakeRegistry:
+    def __init__(self):
+        self.marked = []
+
+    def mark_uploaded(self, backup_type, filename, checksum, key):
+        self.marked.append(key)
+
+
+def fake_pg_dump(config, output_path, extra_sinks=None, **kwargs):
+    output_path.write_bytes(b"PGDMP dump")
+    for sink in extra_sinks or []:
+        sink.write(b"PGDMP dump")
+    return ProcessResult(returncode=0, stdout="", stderr="", success=True, size_bytes=10)
+
+
+@pytest.fixture
+def cloud():
+    return FakeCloud()
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch, cloud):
+    config = PostgresConfig(POSTGRES_USER="u", POSTGRES_PASSWORD="p", POSTGRES_DB="app")
+    manager = BackupManager(config, tmp_path, cloud_manager=cloud, registry=FakeRegistry())
+    monkeypatch.setattr(backup, "select_backup_source", lambda config: BackupSource(config))
+    monkeypatch.setattr(backup, "run_pg_dump", fake_pg_dump)
+    monkeypatch.setattr(manager, "_dump_snapshot", lambda: nullcontext("snap"))
+    monkeypatch.setattr(manager, "_get_migration_info", lambda: MigrationInfo(version=3, dirty=False))
+    monkeypatch.setattr(manager, "_get_table_counts", lambda: TableCounts())
+    monkeypatch.setattr(manager, "_get_catalog_fingerprint", lambda: "")
+    monkeypatch.setattr(manager, "_get_wal_lsn", lambda: None)
+    monkeypatch.setattr(manager, "_save_toc_index", lambda path: None)
+    return manager
+
+
+def test_streamed_upload_is_finalized_under_backup_key(manager, cloud):
+    result = manager.create_backup("daily")
+
+    assert result.success
+    upload = cloud.uploads[0]
+    assert upload.closed and not upload.aborted
+    assert upload.key == f"root/daily/{result.backup_path.name}"
+    assert cloud.files == [f"root/daily/{result.metadata_path.name}"]
+    assert manager.registry.marked == [upload.key]
+
+
+def test_streamed_upload_is_aborted_when_metadata_fails(manager, cloud, monkeypatch):
+    def failing_save(path, metadata):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(backup, "save_metadata", failing_save)
+
+    result = manager.create_backup("daily")
+
+    assert not result.success
+    upload = cloud.uploads[0]
+    assert upload.aborted and not upload.closed
+    assert manager.registry.marked == []
+
+
+def test_streamed_upload_is_aborted_when_dump_fails(manager, cloud, monkeypatch):
+    def failing_dump(config, output_path, **kwargs):
+        raise backup.BackupError("pg_dump failed with return code 1")
+
+    monkeypatch.setattr(backup, "run_pg_dump", failing_dump)
+
+    result = manager.create_backup("daily")
+
+    assert not result.success
+    assert cloud.uploads[0].aborted
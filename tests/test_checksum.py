@@ -0,0 +1,183 @@
+"""Tests for tree hashes and streaming checksum verification."""
+
+import hashlib
+import io
+
+import pytest
+
+from backup_postgres.utils.checksum import (
+    HashingWriter,
+    StreamVerifier,
+    TreeHash,
+    TreeHasher,
+    calculate_tree_hash,
+    find_corrupted_ranges,
+    verify_checksum,
+)
+from backup_postgres.utils.exceptions import ChecksumError
+
+CHUNK = 1024
+DATA = bytes(range(256)) * 10  # 2560 bytes: chunks of 1024, 1024 and 512
+
+
+def tree_of(data: bytes, chunk_size: int = CHUNK) -> TreeHash:
+    hasher = TreeHasher(chunk_size)
+    hasher.update(data)
+    return hasher.result()
+
+
+def pieces(data: bytes, size: int = 300) -> list[bytes]:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.fixture
+def dump(tmp_path):
+    path = tmp_path / "db.dump"
+    path.write_bytes(DATA)
+    return path
+
+
+def test_tree_hash_chunks_and_root():
+    tree = tree_of(DATA)
+
+    assert tree.size == len(DATA)
+    assert tree.chunks == [
+        hashlib.sha256(DATA[start:start + CHUNK]).hexdigest() for start in (0, 1024, 2048)
+    ]
+    assert tree.root == hashlib.sha256(b"".join(bytes.fromhex(c) for c in tree.chunks)).hexdigest()
+
+
+def test_tree_hash_is_independent_of_write_sizes():
+    hasher = TreeHasher(CHUNK)
+    for piece in pieces(DATA, 7):
+        hasher.update(piece)
+
+    assert hasher.result() == tree_of(DATA)
+
+
+def test_chunk_range_ends_at_file_size():
+    tree = tree_of(DATA)
+
+    assert [tree.chunk_range(i) for i in range(3)] == [(0, 1024), (1024, 2048), (2048, 2560)]
+
+
+def test_calculate_tree_hash_matches_streamed_tree(dump):
+    assert calculate_tree_hash(dump, chunk_size=CHUNK, max_workers=2) == tree_of(DATA)
+
+
+def test_tree_hash_dict_round_trip():
+    tree = tree_of(DATA)
+
+    data = tree.to_dict()
+
+    assert data["algorithm"] == "sha256"
+    assert data["root"] == tree.root
+    assert TreeHash.from_dict(data) == tree
+
+
+@pytest.mark.parametrize(
+    ("change", "message"),
+    [
+        ({"chunk_size": None}, "Invalid checksum tree"),
+        ({"chunk_size": 0}, "chunk count does not match size"),
+        ({"size": len(DATA) + CHUNK}, "chunk count does not match size"),
+        ({"root": "0" * 64}, "root does not match chunks"),
+    ],
+)
+def test_malformed_tree_hash_is_rejected(change, message):
+    with pytest.raises(ValueError, match=message):
+        TreeHash.from_dict({**tree_of(DATA).to_dict(), **change})
+
+
+def test_find_corrupted_ranges_merges_adjacent_chunks(dump):
+    tree = tree_of(DATA)
+    corrupted = bytearray(DATA)
+    corrupted[1500] ^= 0xFF
+    corrupted[2100] ^= 0xFF
+    dump.write_bytes(bytes(corrupted))
+
+    assert find_corrupted_ranges(dump, tree) == [(1024, 2560)]
+
+
+def test_find_corrupted_ranges_reports_truncation_and_extra_bytes(dump):
+    tree = tree_of(DATA)
+
+    dump.write_bytes(DATA[:2000])
+    assert find_corrupted_ranges(dump, tree) == [(1024, 2560)]
+
+    dump.write_bytes(DATA + b"extra")
+    assert find_corrupted_ranges(dump, tree) == [(2560, 2565)]
+
+
+def test_verify_checksum_uses_tree_and_falls_back_to_sha256(dump):
+    sha256 = hashlib.sha256(DATA).hexdigest()
+    tree = tree_of(DATA).to_dict()
+
+    assert verify_checksum(dump, sha256, tree)
+    assert verify_checksum(dump, sha256, {**tree, "chunks": []})
+
+    dump.write_bytes(DATA[:-1] + b"\x00")
+    assert not verify_checksum(dump, sha256, tree)
+
+
+def test_stream_verifier_accepts_matching_stream():
+    sha256 = hashlib.sha256(DATA).hexdigest()
+    verifier = StreamVerifier(sha256.upper(), tree_of(DATA))
+
+    assert b"".join(verifier.wrap(pieces(DATA))) == DATA
+    assert verifier.finish() == sha256
+    assert verifier.bytes_seen == len(DATA)
+
+
+def test_stream_verifier_stops_at_first_corrupted_chunk():
+    corrupted = bytearray(DATA)
+    corrupted[10] ^= 0xFF
+    verifier = StreamVerifier(tree=tree_of(DATA))
+    passed = []
+
+    with pytest.raises(ChecksumError, match="Bytes 0-1024 do not match"):
+        for piece in verifier.wrap(pieces(bytes(corrupted))):
+            passed.append(piece)
+
+    # The chunk is checked as soon as the 1024th byte has been hashed
+    assert sum(map(len, passed)) < 2 * CHUNK
+
+
+def test_stream_verifier_reports_last_chunk_range_up_to_size():
+    corrupted = DATA[:-1] + b"\x00"
+    verifier = StreamVerifier(tree=tree_of(DATA))
+    verifier.update(corrupted)
+
+    with pytest.raises(ChecksumError, match="Bytes 2048-2560 do not match"):
+        verifier.finish()
+
+
+def test_stream_verifier_rejects_wrong_size():
+    verifier = StreamVerifier(tree=tree_of(DATA))
+    verifier.update(DATA[:2048])
+
+    with pytest.raises(ChecksumError, match="Stream has 2048 bytes, expected 2560"):
+        verifier.finish()
+
+
+def test_stream_verifier_without_tree_checks_sha256_only():
+    verifier = StreamVerifier("0" * 64)
+    verifier.update(DATA)
+
+    with pytest.raises(ChecksumError, match="Checksum mismatch"):
+        verifier.finish()
+
+
+def test_hashing_writer_passes_data_through(tmp_path):
+    path = tmp_path / "out"
+    with open(path, "wb") as f:
+        writer = HashingWriter(f)
+        for piece in pieces(DATA):
+            writer.write(piece)
+    untreed = HashingWriter(io.BytesIO(), tree=False)
+
+    assert path.read_bytes() == DATA
+    assert writer.hexdigest() == hashlib.sha256(DATA).hexdigest()
+    assert writer.bytes_written == len(DATA)
+    assert writer.tree_hash().size == len(DATA)
+    assert untreed.tree_hash() is None
@@ -0,0 +1,186 @@
+"""Tests for content-defined chunking, the chunk store and chunk garbage collection."""
+
+import io
+import os
+import random
+import time
+
+import pytest
+
+from backup_postgres.config.settings import BackupConfig
+from backup_postgres.core.retention import RetentionPolicy
+from backup_postgres.utils.chunking import (
+    CHUNK_DIR_NAME,
+    GC_GRACE_SECONDS,
+    MAX_CHUNK_SIZE,
+    MIN_CHUNK_SIZE,
+    ChunkingWriter,
+    ChunkStore,
+    read_manifest,
+    reassemble,
+    referenced_chunks,
+)
+from backup_postgres.utils.exceptions import ChunkStoreError
+
+
+def copy_rows(count: int, seed: int = 0) -> list[bytes]:
+    """COPY-style rows of roughly 100 bytes."""
+    rng = random.Random(seed)
+    return [
+        f"{i}\t{rng.getrandbits(64):x}\t{'x' * rng.randint(40, 120)}\n".encode()
+        for i in range(count)
+    ]
+
+
+def write_chunked(manifest_path, store, data: bytes, piece: int = 65536) -> ChunkingWriter:
+    """Feed data to a ChunkingWriter in pieces, as the dump pipeline does."""
+    with ChunkingWriter(manifest_path, store) as writer:
+        for offset in range(0, len(data), piece):
+            writer.write(data[offset:offset + piece])
+    return writer
+
+
+def age(path, seconds: float) -> None:
+    """Set a file's mtime to the given number of seconds ago."""
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ChunkStore(tmp_path / CHUNK_DIR_NAME)
+
+
+def test_reassemble_returns_original_stream(tmp_path, store):
+    data = b"".join(copy_rows(60_000))
+    manifest_path = tmp_path / "daily" / "db.manifest"
+
+    writer = write_chunked(manifest_path, store, data)
+
+    output = io.BytesIO()
+    assert reassemble(manifest_path, output, store) == len(data)
+    assert output.getvalue() == data
+    assert writer.size_bytes == len(data)
+    assert read_manifest(manifest_path)["size_bytes"] == len(data)
+
+
+def test_chunks_respect_size_bounds_and_end_on_lines(tmp_path, store):
+    data = b"".join(copy_rows(60_000))
+    manifest_path = tmp_path / "db.manifest"
+
+    write_chunked(manifest_path, store, data)
+
+    chunks = read_manifest(manifest_path)["chunks"]
+    assert len(chunks) > 1
+    for chunk_hash, length in chunks[:-1]:
+        assert MIN_CHUNK_SIZE <= length <= MAX_CHUNK_SIZE
+        assert store.get(chunk_hash).endswith(b"\n")
+
+
+def test_chunk_without_newlines_is_capped_at_max_size(tmp_path, store):
+    data = b"x" * (MAX_CHUNK_SIZE + 1000)
+    manifest_path = tmp_path / "db.manifest"
+
+    write_chunked(manifest_path, store, data)
+
+    lengths = [length for _, length in read_manifest(manifest_path)["chunks"]]
+    assert lengths == [MAX_CHUNK_SIZE, 1000]
+
+
+def test_inserted_row_only_rewrites_nearby_chunks(tmp_path, store):
+    rows = copy_rows(60_000)
+    first = write_chunked(tmp_path / "a.manifest", store, b"".join(rows))
+
+    rows.insert(30_000, b"30000\tinserted\trow\n")
+    second = write_chunked(tmp_path / "b.manifest", store, b"".join(rows))
+
+    assert first.chunk_count > 3
+    assert first.new_chunks == first.chunk_count
+    assert 1 <= second.new_chunks <= 2
+
+
+def test_identical_dump_stores_no_new_chunks(tmp_path, store):
+    data = b"".join(copy_rows(20_000))
+    write_chunked(tmp_path / "a.manifest", store, data)
+
+    second = write_chunked(tmp_path / "b.manifest", store, data)
+
+    assert second.new_chunks == 0
+    assert second.new_bytes_stored == 0
+
+
+def test_failed_dump_writes_no_manifest(tmp_path, store):
+    manifest_path = tmp_path / "db.manifest"
+
+    with pytest.raises(RuntimeError):
+        with ChunkingWriter(manifest_path, store) as writer:
+            writer.write(b"partial\n")
+            raise RuntimeError("pg_dump failed")
+
+    assert not manifest_path.exists()
+
+
+def test_corrupt_chunk_is_detected(store):
+    data = b"row\n" * 1000
+    chunk_hash = "0" * 64
+    store.put(chunk_hash, data)
+
+    with pytest.raises(ChunkStoreError, match="checksum mismatch"):
+        store.get(chunk_hash)
+
+
+def test_missing_chunk_is_reported(store):
+    with pytest.raises(ChunkStoreError, match="not found"):
+        store.get("ab" * 32)
+
+
+def test_unsupported_manifest_version_is_rejected(tmp_path):
+    manifest_path = tmp_path / "db.manifest"
+    manifest_path.write_text('{"version": 99, "chunks": []}')
+
+    with pytest.raises(ChunkStoreError, match="Unsupported manifest version"):
+        read_manifest(manifest_path)
+
+
+def test_garbage_collection_removes_only_old_unreferenced_chunks(tmp_path, store):
+    write_chunked(tmp_path / "kept.manifest", store, b"".join(copy_rows(20_000, seed=1)))
+    write_chunked(tmp_path / "gone.manifest", store, b"".join(copy_rows(20_000, seed=2)))
+    kept = referenced_chunks([tmp_path / "kept.manifest"])
+    gone = referenced_chunks([tmp_path / "gone.manifest"]) - kept
+    young = referenced_chunks([tmp_path / "gone.manifest"]).pop()
+    for chunk_hash in store.all_hashes():
+        age(store.path_for(chunk_hash), GC_GRACE_SECONDS + 60)
+    age(store.path_for(young), 60)
+
+    removed = store.collect_garbage(kept)
+
+    assert removed == len(gone - {young})
+    assert set(store.all_hashes()) == kept | {young}
+
+
+def test_retention_keeps_chunks_of_all_backup_types(tmp_path):
+    config = BackupConfig(BACKUP_DIR=tmp_path)
+    store = ChunkStore(tmp_path / CHUNK_DIR_NAME)
+    write_chunked(config.manual_dir / "manual.manifest", store, b"".join(copy_rows(5_000, seed=1)))
+    write_chunked(config.weekly_dir / "weekly.manifest", store, b"".join(copy_rows(5_000, seed=2)))
+    write_chunked(tmp_path / "deleted.manifest", store, b"".join(copy_rows(5_000, seed=3)))
+    live = referenced_chunks([config.manual_dir / "manual.manifest", config.weekly_dir / "weekly.manifest"])
+    for chunk_hash in store.all_hashes():
+        age(store.path_for(chunk_hash), GC_GRACE_SECONDS + 60)
+
+    RetentionPolicy(config).collect_chunk_garbage()
+
+    assert set(store.all_hashes()) == live
+
+
+def test_retention_skips_garbage_collection_on_unreadable_manifest(tmp_path):
+    config = BackupConfig(BACKUP_DIR=tmp_path)
+    store = ChunkStore(tmp_path / CHUNK_DIR_NAME)
+    write_chunked(tmp_path / "deleted.manifest", store, b"".join(copy_rows(5_000)))
+    for chunk_hash in store.all_hashes():
+        age(store.path_for(chunk_hash), GC_GRACE_SECONDS + 60)
+    config.daily_dir.mkdir(parents=True)
+    (config.daily_dir / "broken.manifest").write_text("not json")
+
+    assert RetentionPolicy(config).collect_chunk_garbage() == 0
+    assert list(store.all_hashes())
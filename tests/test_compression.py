@@ -0,0 +1,89 @@
+"""Tests for the choice between pg_dump's own and external compression."""
+
+import subprocess
+
+import pytest
+
+from backup_postgres.utils import compression
+from backup_postgres.utils.compression import CompressionSpec
+
+
+@pytest.fixture
+def pg_dump_version(monkeypatch):
+    def set_version(version):
+        monkeypatch.setattr(compression, "pg_dump_major_version", lambda: version)
+
+    return set_version
+
+
+@pytest.mark.parametrize("method", ["zstd", "lz4"])
+def test_pg16_client_compresses_custom_format_natively(pg_dump_version, method):
+    pg_dump_version(16)
+    spec = CompressionSpec(method, 3)
+
+    assert not spec.uses_external_stage("custom")
+    assert spec.pg_dump_args("custom") == [f"--compress={method}:3"]
+    assert spec.to_dict("custom")["stage"] == "pg_dump"
+
+
+@pytest.mark.parametrize("version", [15, None])
+def test_older_or_missing_client_falls_back_to_external_stage(pg_dump_version, version):
+    pg_dump_version(version)
+    spec = CompressionSpec("zstd", 3, threads=4)
+
+    assert spec.uses_external_stage("custom")
+    assert spec.pg_dump_args("custom") == ["-Z0"]
+    assert spec.compressor_cmd() == ["zstd", "-q", "-c", "-3", "-T4"]
+    assert spec.to_dict("custom")["stage"] == "external"
+
+
+def test_directory_and_chunked_formats_never_use_external_stage(pg_dump_version):
+    pg_dump_version(15)
+    spec = CompressionSpec("zstd", 3)
+
+    assert spec.pg_dump_args("directory") == ["--compress=zstd:3"]
+    assert spec.pg_dump_args("chunked") == ["-Z0"]
+    assert not spec.uses_external_stage("directory")
+
+
+def test_gzip_and_none_do_not_query_client_version(monkeypatch):
+    def fail():
+        raise AssertionError("pg_dump version queried")
+
+    monkeypatch.setattr(compression, "pg_dump_major_version", fail)
+
+    assert CompressionSpec("gzip", 6).pg_dump_args("custom") == ["-Z6"]
+    assert CompressionSpec("none", 0).pg_dump_args("custom") == ["-Z0"]
+
+
+@pytest.mark.parametrize(
+    ("output", "version"),
+    [
+        ("pg_dump (PostgreSQL) 16.2 (Debian 16.2-1.pgdg120+2)\n", 16),
+        ("pg_dump (PostgreSQL) 15.6\n", 15),
+        ("unexpected\n", None),
+    ],
+)
+def test_pg_dump_major_version_parses_client_output(monkeypatch, output, version):
+    def fake_run(cmd, **kwargs):
+        return subprocess.CompletedProcess(cmd, 0, stdout=output, stderr="")
+
+    compression.pg_dump_major_version.cache_clear()
+    monkeypatch.setattr(compression.subprocess, "run", fake_run)
+    try:
+        assert compression.pg_dump_major_version() == version
+    finally:
+        compression.pg_dump_major_version.cache_clear()
+
+
+def test_pg_dump_major_version_without_client(monkeypatch):
+    def missing(cmd, **kwargs):
+        raise FileNotFoundError(cmd[0])
+
+    compression.pg_dump_major_version.cache_clear()
+    monkeypatch.setattr(compression.subprocess, "run", missing)
+    try:
+        assert compression.pg_dump_major_version() is None
+        assert not compression.native_codecs_supported()
+    finally:
+        compression.pg_dump_major_version.cache_clear()
@@ -0,0 +1,82 @@
+"""Tests for the data checks run after a restore."""
+
+import pytest
+from psycopg import errors
+
+from backup_postgres.config.settings import PostgresConfig
+from backup_postgres.core import restore
+from backup_postgres.core.restore import RestoreManager
+from backup_postgres.utils.exceptions import DatabaseError
+
+
+class FakeSession:
+    def __init__(self, config, database=None, application_name=""):
+        self.database = database
+
+    def execute(self, query, params=None):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(restore, "DatabaseSession", FakeSession)
+    config = PostgresConfig(POSTGRES_USER="u", POSTGRES_PASSWORD="p", POSTGRES_DB="app")
+    return RestoreManager(config, validation_workers=2)
+
+
+@pytest.fixture
+def row_counts(manager, monkeypatch):
+    def set_counts(counts):
+        monkeypatch.setattr(manager, "_count_rows", lambda session, table: counts[table])
+
+    return set_counts
+
+
+def test_full_validation_counts_all_tables_and_checks_orphans(manager, row_counts, monkeypatch):
+    monkeypatch.setattr(manager, "_query_orphans", lambda session: 0)
+    row_counts({"users": 3, "scans": 0})
+    metadata = {"table_counts": {"users": 3, "scans": 5}}
+
+    counts, orphans = manager._run_data_checks(metadata, "exact")
+
+    assert not counts.passed
+    assert "scans: expected 5, got 0" in counts.details
+    assert orphans.check_name == "Orphaned Records"
+
+
+def test_selective_validation_counts_only_restored_tables(manager, row_counts, monkeypatch):
+    def no_orphan_scan(session):
+        raise AssertionError("orphan check ran")
+
+    monkeypatch.setattr(manager, "_query_orphans", no_orphan_scan)
+    row_counts({"users": 3, "scans": 0})
+    metadata = {"table_counts": {"users": 3, "scans": 5}}
+
+    results = manager._run_data_checks(metadata, "exact", restored_tables={"users"})
+
+    assert [(r.check_name, r.passed) for r in results] == [("Row Counts Match", True)]
+
+
+def test_selective_validation_without_counted_tables_runs_no_data_checks(manager, row_counts):
+    row_counts({})
+    metadata = {"table_counts": {"users": 3}}
+
+    assert manager._run_data_checks(metadata, "exact", restored_tables={"audit_log"}) == []
+
+
+def test_row_count_check_reports_missing_and_timed_out_counts(manager):
+    timeout = DatabaseError("canceled")
+    timeout.__cause__ = errors.QueryCanceled()
+    actual = {"users": 3, "scans": timeout, "events": DatabaseError("no such table")}
+
+    result = manager._check_row_counts(
+        {"users": 3, "scans": 5, "events": 1, "audit_log": 2}, actual
+    )
+
+    assert not result.passed
+    assert "scans: count timed out" in result.details
+    assert "audit_log: expected 2, got no count" in result.details
+    assert "events" not in result.details
@@ -0,0 +1,43 @@
+"""Tests for configuration parsing."""
+
+import pytest
+from pydantic import ValidationError
+
+from backup_postgres.config.settings import PostgresConfig
+
+
+def postgres_config(**env) -> PostgresConfig:
+    return PostgresConfig(POSTGRES_USER="u", POSTGRES_PASSWORD="p", POSTGRES_DB="d", **env)
+
+
+def test_replica_hosts_default_to_postgres_port():
+    config = postgres_config(POSTGRES_PORT=6432, POSTGRES_REPLICA_HOSTS="replica-1, replica-2:5433")
+
+    assert config.replica_hosts == [("replica-1", 6432), ("replica-2", 5433)]
+
+
+def test_replica_hosts_empty_entries_are_ignored():
+    assert postgres_config(POSTGRES_REPLICA_HOSTS="").replica_hosts == []
+    assert postgres_config(POSTGRES_REPLICA_HOSTS=" a ,, b ,").replica_hosts == [("a", 5432), ("b", 5432)]
+
+
+def test_replica_hosts_accept_ipv6_addresses():
+    config = postgres_config(POSTGRES_REPLICA_HOSTS="[fd00::1]:5433,[fd00::2],fd00::3")
+
+    assert config.replica_hosts == [("fd00::1", 5433), ("fd00::2", 5432), ("fd00::3", 5432)]
+
+
+@pytest.mark.parametrize(
+    ("value", "message"),
+    [
+        ("replica-1:abc", "port must be a number"),
+        ("replica-1:70000", "port must be a number"),
+        ("replica-1:", "port must be a number"),
+        (":5433", "empty host name"),
+        ("[fd00::1", r"expected \[address\]"),
+        ("[fd00::1]5433", r"expected \[address\]"),
+    ],
+)
+def test_invalid_replica_hosts_fail_validation(value, message):
+    with pytest.raises(ValidationError, match=message):
+        postgres_config(POSTGRES_REPLICA_HOSTS=value)
@@ -0,0 +1,133 @@
+"""Tests for sharded backup planning and dumping."""
+
+import threading
+import time
+
+import pytest
+
+from backup_postgres.config.settings import PostgresConfig
+from backup_postgres.core import sharding
+from backup_postgres.core.sharding import (
+    DATA_FILE,
+    SCHEMA_FILE,
+    dump_shards,
+    plan_shards,
+    shard_workers,
+)
+from backup_postgres.utils.compression import CompressionSpec
+from backup_postgres.utils.exceptions import BackupError
+from backup_postgres.utils.subprocess import ProcessResult
+
+GB = 1024**3
+
+
+@pytest.fixture
+def config():
+    return PostgresConfig(POSTGRES_USER="user", POSTGRES_PASSWORD="secret", POSTGRES_DB="app")
+
+
+def by_file(shards):
+    return {shard.filename: shard for shard in shards}
+
+
+def test_large_tables_get_their_own_shard():
+    shards = by_file(plan_shards({"events": 5 * GB, "users": 2 * GB, "tags": 10}, GB))
+
+    assert set(shards) == {SCHEMA_FILE, DATA_FILE, "data_events.dump", "data_users.dump"}
+    assert shards["data_events.dump"].dump_args == ["--section=data", "-t", 'public."events"']
+    assert shards["data_events.dump"].table == "events"
+    assert shards[DATA_FILE].estimated_bytes == 10
+
+
+def test_shared_data_shard_excludes_large_tables():
+    shards = by_file(plan_shards({"events": 5 * GB, "tags": 10}, GB))
+
+    assert shards[DATA_FILE].dump_args == ["--section=data", "-T", 'public."events"']
+    assert shards[SCHEMA_FILE].dump_args == ["--section=pre-data", "--section=post-data"]
+
+
+def test_shards_are_ordered_largest_first():
+    shards = plan_shards({"a": 2 * GB, "b": 7 * GB, "c": 3 * GB, "small": 100}, GB)
+
+    sizes = [shard.estimated_bytes for shard in shards]
+    assert sizes == sorted(sizes, reverse=True)
+    assert shards[0].table == "b"
+
+
+def test_no_table_above_threshold_gives_schema_and_data_only():
+    shards = plan_shards({"users": 100, "tags": 10}, GB)
+
+    assert {shard.filename for shard in shards} == {SCHEMA_FILE, DATA_FILE}
+
+
+def test_table_names_are_quoted_and_sanitized():
+    shards = by_file(plan_shards({'odd "name"/x': 2 * GB}, GB))
+
+    shard = shards['data_odd__name__x.dump']
+    assert shard.dump_args[-1] == 'public."odd ""name""/x"'
+
+
+def test_only_shared_data_shard_includes_large_objects():
+    shards = plan_shards({"events": 5 * GB, "users": 2 * GB, "tags": 10}, GB)
+
+    assert [s.filename for s in shards if s.large_objects] == [DATA_FILE]
+
+
+def test_workers_limited_by_largest_shard():
+    shards = plan_shards({"huge": 10 * GB, "a": GB, "b": GB}, GB)
+
+    # 12 GB total cannot finish faster than the 10 GB shard: 2 workers suffice
+    assert shard_workers(shards, max_workers=8) == 2
+
+
+def test_workers_limited_by_configured_maximum():
+    shards = plan_shards({f"t{i}": GB for i in range(10)}, GB)
+
+    assert shard_workers(shards, max_workers=4) == 4
+
+
+def test_dump_shards_passes_large_objects_only_for_shared_data(tmp_path, config, monkeypatch):
+    calls = {}
+
+    def fake_pg_dump(config, output_path, large_objects=True, **kwargs):
+        calls[output_path.name] = large_objects
+        output_path.write_bytes(b"PGDMP")
+        return ProcessResult(returncode=0, stdout="", stderr="", success=True, size_bytes=5)
+
+    monkeypatch.setattr(sharding, "run_pg_dump", fake_pg_dump)
+    shards = plan_shards({"events": 5 * GB, "tags": 10}, GB)
+
+    dump_shards(config, tmp_path / "b.dir", shards, "snap", CompressionSpec("gzip", 6), 4)
+
+    assert calls == {SCHEMA_FILE: False, DATA_FILE: True, "data_events.dump": False}
+
+
+def test_failed_shard_cancels_running_and_queued_shards(tmp_path, config, monkeypatch):
+    started = []
+    cancelled = []
+    running = threading.Event()
+
+    def fake_pg_dump(config, output_path, cancel=None, **kwargs):
+        started.append(output_path.name)
+        if output_path.name == "data_events.dump":
+            running.wait(timeout=10)
+            raise BackupError("pg_dump failed with return code 1")
+        # A long-running shard: only ends when it is cancelled
+        running.set()
+        if not cancel.wait(timeout=10):
+            raise AssertionError("running shard was not cancelled")
+        cancelled.append(output_path.name)
+        raise BackupError("pg_dump failed with return code -15")
+
+    monkeypatch.setattr(sharding, "run_pg_dump", fake_pg_dump)
+    # Two workers: events and users run, schema.dump and data.dump are queued
+    shards = plan_shards({"events": 5 * GB, "users": 4 * GB}, GB)
+    begin = time.monotonic()
+
+    with pytest.raises(BackupError, match="return code 1"):
+        dump_shards(config, tmp_path / "b.dir", shards, "snap", CompressionSpec("gzip", 6), 4)
+
+    assert time.monotonic() - begin < 5
+    assert cancelled == ["data_users.dump"]
+    assert sorted(started) == ["data_events.dump", "data_users.dump"]
+    assert not (tmp_path / "b.dir").exists()
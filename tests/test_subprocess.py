@@ -0,0 +1,150 @@
+"""Tests for the child process runner."""
+
+import threading
+import time
+
+from backup_postgres.utils.subprocess import (
+    OUTPUT_TAIL_BYTES,
+    STREAM_CHUNK_SIZE,
+    OutputTail,
+    ProgressTracker,
+    run_process,
+)
+
+
+def test_cancel_event_terminates_running_command():
+    cancel = threading.Event()
+    timer = threading.Timer(0.3, cancel.set)
+    timer.start()
+    started = time.monotonic()
+
+    result = run_process(["sleep", "30"], cancel=cancel)
+
+    assert time.monotonic() - started < 5
+    assert result.returncode != 0
+
+
+def test_cancel_event_terminates_whole_pipeline():
+    cancel = threading.Event()
+    cancel.set()
+
+    result = run_process(["sleep", "30"], source_cmd=["sleep", "30"], filter_cmd=["cat"], cancel=cancel)
+
+    assert result.returncode != 0
+
+
+def test_progress_events_for_dump_and_restore_lines():
+    events = []
+    tracker = ProgressTracker("pg_dump", events.append)
+
+    assert tracker.feed('pg_dump: dumping contents of table "public.users"\n')
+    assert tracker.feed("pg_dump: info: dumping contents of table public.orders\n")
+    tracker.finish()
+
+    assert [(e.tool, e.action, e.target) for e in events] == [
+        ("pg_dump", "dump_table_data", "public.users"),
+        ("pg_dump", "dump_table_data", "public.orders"),
+    ]
+
+
+def test_progress_create_lines_map_to_object_kind():
+    tracker = ProgressTracker("pg_restore")
+
+    tracker.feed('pg_restore: creating INDEX "public.idx_users_email"')
+    tracker.feed('pg_restore: creating FK CONSTRAINT "public.orders orders_user_id_fkey"')
+    tracker.feed('pg_restore: processing data for table "public.users"')
+    tracker.finish()
+
+    assert [(e.action, e.target) for e in tracker.events] == [
+        ("create_index", "public.idx_users_email"),
+        ("create_fk_constraint", "public.orders orders_user_id_fkey"),
+        ("restore_table_data", "public.users"),
+    ]
+
+
+def test_progress_ignores_other_tools_and_untracked_lines():
+    tracker = ProgressTracker("pg_restore")
+
+    assert not tracker.feed("pg_restore: connecting to database for restore")
+    assert not tracker.feed('pg_dump: dumping contents of table "public.users"')
+    assert not tracker.feed("pg_restore: warning: errors ignored on restore: 1")
+    tracker.finish()
+
+    assert tracker.events == []
+
+
+def test_progress_event_reported_when_next_object_starts():
+    events = []
+    tracker = ProgressTracker("pg_dump", events.append)
+
+    tracker.feed('pg_dump: dumping contents of table "public.a"')
+    assert events == []
+    time.sleep(0.05)
+    tracker.feed('pg_dump: dumping contents of table "public.b"')
+
+    assert [e.target for e in events] == ["public.a"]
+    assert events[0].duration_seconds >= 0.05
+
+
+def test_failing_progress_callback_does_not_stop_tracking():
+    def callback(event):
+        raise RuntimeError("callback failed")
+
+    tracker = ProgressTracker("pg_dump", callback)
+    tracker.feed('pg_dump: dumping contents of table "public.a"')
+    tracker.finish()
+
+    assert [e.target for e in tracker.events] == ["public.a"]
+
+
+def test_run_process_feeds_verbose_stderr_to_tracker():
+    tracker = ProgressTracker("pg_dump")
+    script = 'echo \'pg_dump: dumping contents of table "public.users"\' >&2; echo data'
+
+    result = run_process(["sh", "-c", script], progress=tracker)
+
+    assert result.returncode == 0
+    assert result.stdout == "data\n"
+    assert [e.target for e in tracker.events] == ["public.users"]
+
+
+def test_output_tail_keeps_everything_under_the_limit():
+    tail = OutputTail(max_bytes=100)
+    tail.append("first\n")
+    tail.append("second\n")
+
+    assert tail.text() == "first\nsecond\n"
+    assert tail.dropped_lines == 0
+
+
+def test_output_tail_drops_oldest_lines_beyond_the_limit():
+    tail = OutputTail(max_bytes=21)
+    for i in range(10):
+        tail.append(f"line {i}\n")
+
+    assert tail.dropped_lines == 7
+    assert tail.text() == "[... 7 earlier lines omitted]\nline 7\nline 8\nline 9\n"
+
+
+def test_output_tail_keeps_end_of_overlong_line():
+    tail = OutputTail(max_bytes=10)
+    tail.append("earlier\n")
+    tail.append("x" * 50 + "the end\n")
+
+    assert tail.dropped_lines == 1
+    assert tail.text().endswith("\n" + "xx" + "the end\n")
+    assert len(tail.text().split("\n", 1)[1]) == 10
+
+
+def test_run_process_stderr_is_bounded_and_skips_overlong_lines():
+    script = (
+        f"head -c {STREAM_CHUNK_SIZE * 2} /dev/zero | tr '\\0' x >&2; echo >&2; "
+        "for i in $(seq 20000); do echo \"pg_dump: line $i\" >&2; done; exit 1"
+    )
+
+    result = run_process(["sh", "-c", script])
+
+    assert result.returncode == 1
+    assert len(result.stderr) < OUTPUT_TAIL_BYTES + 100
+    assert result.stderr.startswith("[... ")
+    assert result.stderr.endswith("pg_dump: line 20000\n")
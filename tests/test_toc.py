@@ -0,0 +1,325 @@
+"""Tests for the pg_dump archive TOC reader and the TOC index."""
+
+import io
+import shutil
+import subprocess
+
+import pytest
+
+from backup_postgres.utils.chunking import CHUNK_DIR_NAME, ChunkingWriter, ChunkStore
+from backup_postgres.utils.exceptions import ArchiveFormatError
+from backup_postgres.utils.toc import (
+    ArchiveReader,
+    build_toc_index,
+    format_restore_list,
+    format_toc_listing,
+    index_entries,
+    load_toc_index,
+    read_archive,
+    read_archive_header,
+    save_toc_index,
+    select_toc_entries,
+    toc_index_path,
+)
+
+# (dump_id, desc, section code, namespace, tag, deps, data chunks or None)
+ENTRIES = [
+    (213, "SCHEMA", 2, "", "app", [], None),
+    (214, "TABLE", 2, "app", "users", [213], None),
+    (215, "TABLE DATA", 3, "app", "users", [214], [b"1\talice\n", b"2\tbob\n"]),
+    (216, "INDEX", 4, "app", "users_name_idx", [214], None),
+]
+
+
+def pg_int(value: int) -> bytes:
+    """Sign byte + 4-byte little-endian magnitude (WriteInt)."""
+    return bytes([value < 0]) + abs(value).to_bytes(4, "little")
+
+
+def pg_str(value: str | None) -> bytes:
+    """Length-prefixed string, -1 for NULL (WriteStr)."""
+    if value is None:
+        return pg_int(-1)
+    data = value.encode()
+    return pg_int(len(data)) + data
+
+
+def pg_header(format_code: int, minor: int = 15) -> bytes:
+    header = b"PGDMP" + bytes([1, minor, 0, 4, 8, format_code])
+    header += bytes([0]) if minor >= 15 else pg_int(0)
+    # 2024-03-05 14:30:15 as a struct tm
+    header += b"".join(pg_int(v) for v in (15, 30, 14, 5, 2, 124, 0))
+    return header + pg_str("appdb") + pg_str("16.2") + pg_str("16.2")
+
+
+def pg_toc(archive_format: str, minor: int = 15) -> bytes:
+    toc = pg_int(len(ENTRIES))
+    for dump_id, desc, section, namespace, tag, deps, chunks in ENTRIES:
+        toc += pg_int(dump_id) + pg_int(chunks is not None)
+        toc += pg_str("0") + pg_str("0") + pg_str(tag) + pg_str(desc) + pg_int(section)
+        toc += pg_str("") + pg_str("") + pg_str(None) + pg_str(namespace) + pg_str("")
+        if minor >= 14:
+            toc += pg_str("heap" if desc == "TABLE" else None)
+        if minor >= 16:
+            toc += pg_int(ord("r") if desc == "TABLE" else 0)
+        toc += pg_str("postgres") + pg_str("false")
+        toc += b"".join(pg_str(str(dep)) for dep in deps) + pg_str(None)
+        if archive_format == "custom":
+            # Offset not yet known (pg_dump writes K_OFFSET_POS_NOT_SET to non-seekable output)
+            toc += bytes([1 if chunks is not None else 3]) + bytes(8)
+        else:
+            toc += pg_str(f"{dump_id}.dat" if chunks is not None else None)
+    return toc
+
+
+def custom_archive(minor: int = 15) -> bytes:
+    archive = pg_header(1, minor) + pg_toc("custom", minor)
+    for dump_id, *_, chunks in ENTRIES:
+        if chunks is not None:
+            archive += bytes([1]) + pg_int(dump_id)
+            archive += b"".join(pg_int(len(chunk)) + chunk for chunk in chunks) + pg_int(0)
+    return archive
+
+
+class NonSeekable(io.BytesIO):
+    def seekable(self) -> bool:
+        return False
+
+
+@pytest.fixture
+def custom_dump(tmp_path):
+    path = tmp_path / "app.dump"
+    path.write_bytes(custom_archive())
+    return path
+
+
+@pytest.mark.parametrize("minor", [14, 15, 16])
+def test_read_header_and_toc_of_supported_versions(tmp_path, minor):
+    path = tmp_path / "app.dump"
+    path.write_bytes(custom_archive(minor))
+
+    header, entries = read_archive(path)
+
+    assert header.version_str == f"1.{minor}.0"
+    assert [(e.dump_id, e.desc, e.namespace, e.tag) for e in entries] == [
+        (213, "SCHEMA", "", "app"),
+        (214, "TABLE", "app", "users"),
+        (215, "TABLE DATA", "app", "users"),
+        (216, "INDEX", "app", "users_name_idx"),
+    ]
+    assert [e.section for e in entries] == ["pre-data", "pre-data", "data", "post-data"]
+    assert entries[3].dependencies == [214]
+
+
+def test_read_archive_header(custom_dump):
+    header = read_archive_header(custom_dump)
+
+    assert header.to_dict() == {
+        "format": "custom",
+        "version": "1.15.0",
+        "compression": "none",
+        "created": "2024-03-05T14:30:15",
+        "database": "appdb",
+        "server_version": "16.2",
+        "dump_version": "16.2",
+    }
+
+
+def test_data_blocks_are_located(custom_dump):
+    raw = custom_dump.read_bytes()
+
+    _, entries = read_archive(custom_dump)
+
+    data = next(e for e in entries if e.dump_id == 215)
+    # Block type, dump id, two length-prefixed chunks and the zero terminator
+    assert data.length == 1 + 5 + (5 + 8) + (5 + 6) + 5
+    assert data.offset + data.length == len(raw)
+    assert raw[data.offset] == 1
+    assert all(e.offset is None for e in entries if e.dump_id != 215)
+    assert not entries[1].had_dumper
+
+
+def test_data_blocks_are_located_on_non_seekable_stream(custom_dump):
+    _, seekable_entries = read_archive(custom_dump)
+    reader = ArchiveReader(NonSeekable(custom_dump.read_bytes()))
+    reader.read_header()
+    reader.read_toc("custom")
+
+    blocks = list(reader.scan_data_blocks())
+
+    data = next(e for e in seekable_entries if e.dump_id == 215)
+    assert blocks == [(215, data.offset, data.length)]
+
+
+def test_scan_data_false_reads_toc_only(custom_dump):
+    _, entries = read_archive(custom_dump, scan_data=False)
+
+    assert all(e.offset is None for e in entries)
+
+
+def test_directory_format_uses_data_files(tmp_path):
+    backup = tmp_path / "app.dir"
+    backup.mkdir()
+    (backup / "toc.dat").write_bytes(pg_header(5) + pg_toc("directory"))
+    (backup / "215.dat").write_bytes(b"x" * 42)
+
+    header, entries = read_archive(backup)
+
+    assert header.format == "directory"
+    assert read_archive_header(backup).format == "directory"
+    data = next(e for e in entries if e.dump_id == 215)
+    assert (data.data_file, data.offset, data.length) == ("215.dat", "215.dat", 42)
+
+
+@pytest.mark.skipif(shutil.which("zstd") is None, reason="zstd not installed")
+def test_externally_compressed_archive_is_read_through_decompressor(tmp_path, custom_dump):
+    _, plain_entries = read_archive(custom_dump)
+    subprocess.run(["zstd", "-q", str(custom_dump), "-o", str(tmp_path / "app.dump.zst")], check=True)
+
+    header, entries = read_archive(tmp_path / "app.dump.zst")
+
+    assert header.database == "appdb"
+    assert [e.to_row() for e in entries] == [e.to_row() for e in plain_entries]
+
+
+def test_chunked_backup_is_read_from_chunk_store(tmp_path, custom_dump):
+    _, plain_entries = read_archive(custom_dump)
+    manifest_path = tmp_path / "daily" / "app.manifest"
+    with ChunkingWriter(manifest_path, ChunkStore(tmp_path / CHUNK_DIR_NAME)) as writer:
+        writer.write(custom_dump.read_bytes())
+
+    _, entries = read_archive(manifest_path)
+
+    assert [e.to_row() for e in entries] == [e.to_row() for e in plain_entries]
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    [
+        (b"PK\x03\x04 not a dump", "missing PGDMP magic"),
+        (b"PGDMP" + bytes([1, 11, 0]), "Unsupported archive version 1.11.0"),
+        (custom_archive()[:40], "Unexpected end of archive"),
+    ],
+)
+def test_invalid_archives_are_rejected(tmp_path, data, message):
+    path = tmp_path / "bad.dump"
+    path.write_bytes(data)
+
+    with pytest.raises(ArchiveFormatError, match=message):
+        read_archive(path)
+
+
+def test_directory_without_toc_is_rejected(tmp_path):
+    with pytest.raises(ArchiveFormatError, match="No toc.dat"):
+        read_archive_header(tmp_path)
+
+
+def test_toc_index_round_trip(custom_dump):
+    index = build_toc_index(custom_dump)
+    save_toc_index(toc_index_path(custom_dump), index)
+
+    loaded = load_toc_index(custom_dump)
+
+    assert toc_index_path(custom_dump).name == "app.toc.json"
+    assert loaded == index
+    users_data = index_entries(loaded)[2]
+    assert users_data["type"] == "TABLE DATA"
+    assert (users_data["schema"], users_data["name"], users_data["deps"]) == ("app", "users", [214])
+
+
+def test_unusable_toc_index_is_ignored(custom_dump):
+    assert load_toc_index(custom_dump) is None
+
+    toc_index_path(custom_dump).write_text('{"version": 99}')
+    assert load_toc_index(custom_dump) is None
+
+    toc_index_path(custom_dump).write_text("not json")
+    assert load_toc_index(custom_dump) is None
+
+
+def test_index_entries_of_sharded_backup_name_their_file(custom_dump):
+    shard_index = build_toc_index(custom_dump)
+    index = {"version": 1, "shards": {"schema.dump": shard_index, "data.dump": shard_index}}
+
+    entries = index_entries(index)
+
+    assert len(entries) == 2 * len(ENTRIES)
+    assert {e["file"] for e in entries} == {"schema.dump", "data.dump"}
+
+
+def toc_entry(dump_id, desc, section, schema, name, deps=()):
+    return {"id": dump_id, "type": desc, "section": section, "schema": schema, "name": name,
+            "offset": None, "length": None, "deps": list(deps)}
+
+
+# Two schemas; orders.user_id references users (the FK depends on orders and users_pkey)
+SELECTABLE = [
+    toc_entry(1, "SCHEMA", "pre-data", "", "reporting"),
+    toc_entry(10, "TABLE", "pre-data", "public", "users"),
+    toc_entry(11, "TABLE", "pre-data", "public", "orders"),
+    toc_entry(12, "SEQUENCE", "pre-data", "public", "users_id_seq"),
+    toc_entry(13, "SEQUENCE OWNED BY", "pre-data", "public", "users_id_seq", [12, 10]),
+    toc_entry(14, "DEFAULT", "pre-data", "public", "users id", [10, 12]),
+    toc_entry(15, "TABLE", "pre-data", "reporting", "users", [1]),
+    toc_entry(16, "COMMENT", "none", "public", "TABLE users", [10]),
+    toc_entry(20, "TABLE DATA", "data", "public", "users", [10]),
+    toc_entry(21, "TABLE DATA", "data", "public", "orders", [11]),
+    toc_entry(22, "SEQUENCE SET", "data", "public", "users_id_seq", [12]),
+    toc_entry(23, "TABLE DATA", "data", "reporting", "users", [15]),
+    toc_entry(30, "CONSTRAINT", "post-data", "public", "users users_pkey", [10]),
+    toc_entry(31, "INDEX", "post-data", "public", "orders_user_idx", [11]),
+    toc_entry(32, "FK CONSTRAINT", "post-data", "public", "orders orders_user_id_fkey", [11, 30]),
+]
+
+
+def selected_ids(**filters):
+    return [entry["id"] for entry in select_toc_entries(SELECTABLE, **filters)]
+
+
+def test_table_is_selected_with_its_dependents():
+    assert selected_ids(tables=["public.users"]) == [10, 12, 13, 14, 16, 20, 22, 30]
+
+
+def test_unqualified_table_name_matches_every_schema():
+    assert selected_ids(tables=["users"]) == [10, 12, 13, 14, 15, 16, 20, 22, 23, 30]
+
+
+def test_foreign_key_needs_both_tables_selected():
+    assert 32 not in selected_ids(tables=["public.orders"])
+    assert 32 not in selected_ids(tables=["public.users"])
+    assert 32 in selected_ids(tables=["public.orders", "public.users"])
+
+
+def test_schema_selects_its_objects():
+    assert selected_ids(schemas=["reporting"]) == [1, 15, 23]
+
+
+def test_section_filter_applies_after_dependents():
+    assert selected_ids(tables=["public.users"], sections=["data"]) == [20, 22]
+    # Comments and ACLs belong to the section of the object they describe
+    assert selected_ids(tables=["public.users"], sections=["pre-data"]) == [10, 12, 13, 14, 16]
+
+
+def test_no_filters_select_everything():
+    assert selected_ids() == [entry["id"] for entry in SELECTABLE]
+    assert selected_ids(sections=["post-data"]) == [30, 31, 32]
+
+
+def test_format_restore_list():
+    entries = select_toc_entries(SELECTABLE, schemas=["reporting"])
+
+    assert format_restore_list(entries) == (
+        "1; SCHEMA - reporting\n"
+        "15; TABLE reporting users\n"
+        "23; TABLE DATA reporting users\n"
+    )
+    assert format_restore_list([]) == ""
+
+
+def test_format_toc_listing_lists_every_entry(custom_dump):
+    assert format_toc_listing(build_toc_index(custom_dump)) == [
+        "213; SCHEMA - app",
+        "214; TABLE app users",
+        "215; TABLE DATA app users",
+        "216; INDEX app users_name_idx",
+    ]
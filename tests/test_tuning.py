@@ -0,0 +1,80 @@
+"""Tests for applying and reverting restore profiles."""
+
+import pytest
+
+from backup_postgres.core.tuning import RestoreProfile, apply_profile
+from backup_postgres.utils.exceptions import DatabaseError
+
+PROFILE = RestoreProfile(
+    name="test",
+    system_settings={"max_wal_size": "16GB", "autovacuum": "off"},
+    session_settings={"synchronous_commit": "off"},
+)
+
+
+class FakeSession:
+    """Records executed statements; ALTER SYSTEM SET of fail_on raises."""
+
+    connection = None
+
+    def __init__(self, auto_conf=None, fail_on=None):
+        self.auto_conf = auto_conf or {}
+        self.fail_on = fail_on
+        self.statements = []
+
+    def fetch_all(self, query, params=None):
+        (names,) = params
+        return [(name, value) for name, value in self.auto_conf.items() if name in names]
+
+    def execute(self, query, params=None):
+        statement = query if isinstance(query, str) else query.as_string(self.connection)
+        if self.fail_on and statement.startswith(f'ALTER SYSTEM SET "{self.fail_on}"'):
+            raise DatabaseError("permission denied")
+        self.statements.append(statement)
+
+
+def test_profile_is_reverted_when_the_restore_fails():
+    session = FakeSession()
+
+    with pytest.raises(RuntimeError), apply_profile(session, PROFILE) as options:
+        assert options == {"synchronous_commit": "off"}
+        raise RuntimeError("pg_restore failed")
+
+    assert session.statements == [
+        "ALTER SYSTEM SET \"max_wal_size\" = '16GB'",
+        "ALTER SYSTEM SET \"autovacuum\" = 'off'",
+        "SELECT pg_reload_conf()",
+        'ALTER SYSTEM RESET "max_wal_size"',
+        'ALTER SYSTEM RESET "autovacuum"',
+        "SELECT pg_reload_conf()",
+    ]
+
+
+def test_previous_auto_conf_value_is_restored_instead_of_reset():
+    session = FakeSession(auto_conf={"max_wal_size": "4GB"})
+
+    with apply_profile(session, PROFILE):
+        pass
+
+    assert session.statements[-3:] == [
+        "ALTER SYSTEM SET \"max_wal_size\" = '4GB'",
+        'ALTER SYSTEM RESET "autovacuum"',
+        "SELECT pg_reload_conf()",
+    ]
+
+
+def test_settings_applied_before_a_failure_are_reverted():
+    session = FakeSession(fail_on="autovacuum")
+
+    with apply_profile(session, PROFILE) as options:
+        # Only the server settings are dropped
+        assert options == {"synchronous_commit": "off"}
+        reverted = list(session.statements)
+
+    assert reverted == [
+        "ALTER SYSTEM SET \"max_wal_size\" = '16GB'",
+        'ALTER SYSTEM RESET "max_wal_size"',
+        "SELECT pg_reload_conf()",
+    ]
+    # Nothing left to revert on exit
+    assert session.statements == reverted